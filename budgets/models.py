@@ -1,5 +1,9 @@
 import logging
 from django.db import models
+from django.db.models.functions import (
+    Abs,
+    Coalesce,
+)
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import (
@@ -14,6 +18,44 @@ from categories.models import Category
 logger = logging.getLogger('budgets')
 
 
+class BudgetQuerySet(models.QuerySet):
+    """QuerySet бюджетов с план-факт расчётами на стороне БД."""
+
+    def with_stats(self):
+        """
+        Добавляет потраченную за период бюджета сумму одним подзапросом.
+
+        Свойства `spent_amount`, `remaining_amount`, `spent_percentage`,
+        `daily_budget_remaining` и др. берут значение из аннотации
+        и не делают отдельный запрос на каждый бюджет.
+        """
+        from transactions.models import Transaction
+
+        spent = Transaction.objects.filter(
+            user=models.OuterRef('user'),
+            category=models.OuterRef('category'),
+            date__gte=models.OuterRef('start_date'),
+            date__lte=models.OuterRef('end_date'),
+            amount__lt=0,  # Только расходы (отрицательные суммы)
+        ).order_by().values(
+            'category',
+        ).annotate(
+            total=models.Sum('amount'),
+        ).values(
+            'total',
+        )
+
+        return self.annotate(
+            annotated_spent_amount=Abs(
+                Coalesce(
+                    models.Subquery(spent),
+                    models.Value(Decimal('0.00')),
+                    output_field=models.DecimalField(max_digits=12, decimal_places=2),
+                ),
+            ),
+        )
+
+
 class Budget(TimestampedModel):
     """
     Модель бюджета с план-факт анализом.
@@ -52,6 +94,8 @@ class Budget(TimestampedModel):
     end_date = models.DateField('Дата окончания')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='budgets', verbose_name='Пользователь')
     is_active = models.BooleanField('Активен', default=True)
+
+    objects = BudgetQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Бюджет'
@@ -82,6 +126,11 @@ class Budget(TimestampedModel):
         Returns:
             Decimal: Общая сумма трат по категории за период бюджета
         """
+        # Уже посчитано в Budget.objects.with_stats()
+        annotated = getattr(self, 'annotated_spent_amount', None)
+        if annotated is not None:
+            return annotated
+
         from transactions.models import Transaction
         
         # Учитываем только расходы (отрицательные суммы)
@@ -492,3 +492,45 @@ class BudgetModelTestCase(TestCase):
         self.assertEqual(user2_budgets.count(), 1)
         self.assertEqual(user1_budgets.first().amount, Decimal('10000.00'))
         self.assertEqual(user2_budgets.first().amount, Decimal('20000.00'))
+        
+    def test_with_stats_matches_properties(self):
+        """Test with_stats() annotation gives the same numbers without extra queries."""
+        budget = Budget.objects.create(
+            category=self.expense_category,
+            amount=Decimal('10000.00'),
+            start_date=date.today() - timedelta(days=5),
+            end_date=date.today() + timedelta(days=25),
+            user=self.user,
+        )
+        empty_category = Category.objects.create(
+            name='Транспорт',
+            type=Category.EXPENSE,
+            user=self.user,
+        )
+        Budget.objects.create(
+            category=empty_category,
+            amount=Decimal('3000.00'),
+            start_date=date.today() - timedelta(days=5),
+            end_date=date.today() + timedelta(days=25),
+            user=self.user,
+        )
+        for amount, days_ago in (('-2000.00', 3), ('-1500.00', 0), ('-700.00', 30)):
+            Transaction.objects.create(
+                amount=Decimal(amount),
+                category=self.expense_category,
+                date=date.today() - timedelta(days=days_ago),
+                user=self.user,
+            )
+        
+        with self.assertNumQueries(1):
+            budgets = {
+                b.category_id: b
+                for b in Budget.objects.filter(user=self.user).with_stats()
+            }
+            annotated = budgets[self.expense_category.id]
+            self.assertEqual(annotated.spent_amount, Decimal('3500.00'))
+            self.assertEqual(annotated.remaining_amount, Decimal('6500.00'))
+            self.assertEqual(annotated.spent_percentage, 35.0)
+            self.assertEqual(budgets[empty_category.id].spent_amount, Decimal('0.00'))
+        
+        self.assertEqual(annotated.spent_amount, budget.spent_amount)
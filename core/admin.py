@@ -1,3 +1,32 @@
 from django.contrib import admin
 
 # Register your models here.
+
+
+class ChangeListOnlyMixin:
+    """
+    Сужает SELECT на странице списка объектов до колонок `changelist_only`.
+
+    Большие TEXT/JSON колонки, которые не выводятся в `list_display`,
+    не читаются из БД. Форма редактирования по-прежнему загружает объект
+    целиком. Для FK из `list_display` задавайте явный `list_select_related`:
+    `select_related()` без аргументов несовместим с `only()`.
+    """
+
+    changelist_only: tuple[str, ...] = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.changelist_only and self._is_changelist_request(request):
+            queryset = self.narrow_changelist_queryset(queryset)
+        return queryset
+
+    def narrow_changelist_queryset(self, queryset):
+        return queryset.only(*self.changelist_only)
+
+    def _is_changelist_request(self, request) -> bool:
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return False
+        opts = self.model._meta
+        return match.url_name == f'{opts.app_label}_{opts.model_name}_changelist'
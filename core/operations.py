@@ -0,0 +1,131 @@
+"""
+Операции миграций, общие для всех приложений.
+"""
+
+from django.contrib.postgres.indexes import PostgresIndex
+from django.db import NotSupportedError
+from django.db.migrations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndex):
+    """
+    AddIndex, который на PostgreSQL строит индекс через
+    `CREATE INDEX CONCURRENTLY` — без блокировки записи в таблицу на живой БД.
+
+    - Миграция с этой операцией должна быть `atomic = False`
+      (CONCURRENTLY нельзя выполнять внутри транзакции).
+    - Если индекс с таким именем уже есть (например, создан более ранней
+      версией миграции), операция ничего не делает.
+    - На остальных СУБД (SQLite в тестах) ведёт себя как обычный AddIndex;
+      Postgres-специфичные индексы (GIN и т.п.) там пропускаются.
+    """
+
+    def describe(self):
+        return (
+            f"Concurrently create index {self.index.name} "
+            f"on field(s) {', '.join(self.index.fields)} of model {self.model_name}"
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            if not isinstance(self.index, PostgresIndex):
+                schema_editor.add_index(model, self.index)
+            return
+
+        self._ensure_not_in_transaction(schema_editor)
+        if self._index_exists(schema_editor, model):
+            return
+        schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        connection = schema_editor.connection
+        if connection.vendor != 'postgresql':
+            if not isinstance(self.index, PostgresIndex):
+                schema_editor.remove_index(model, self.index)
+            return
+
+        self._ensure_not_in_transaction(schema_editor)
+        schema_editor.remove_index(model, self.index, concurrently=True)
+
+    def _ensure_not_in_transaction(self, schema_editor) -> None:
+        if schema_editor.connection.in_atomic_block:
+            raise NotSupportedError(
+                "CREATE/DROP INDEX CONCURRENTLY нельзя выполнять в транзакции. "
+                "Укажите atomic = False в миграции."
+            )
+
+    def _index_exists(self, schema_editor, model) -> bool:
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                model._meta.db_table,
+            )
+        return self.index.name in constraints
+
+
+class AlterColumnStorageIfPostgres(Operation):
+    """
+    `ALTER TABLE ... ALTER COLUMN ... SET STORAGE ...` на PostgreSQL.
+
+    Меняет только стратегию хранения (MAIN — держать значение в строке
+    таблицы, сжимая его, и выносить в TOAST лишь в крайнем случае).
+    Схему моделей не трогает; действует на новые и обновлённые строки.
+    На остальных СУБД ничего не делает.
+    """
+
+    reduces_to_sql = False
+    reversible = True
+
+    def __init__(self, model_name, name, storage, previous_storage='EXTENDED'):
+        self.model_name = model_name
+        self.name = name
+        self.storage = storage
+        self.previous_storage = previous_storage
+
+    def deconstruct(self):
+        kwargs = {
+            'model_name': self.model_name,
+            'name': self.name,
+            'storage': self.storage,
+        }
+        if self.previous_storage != 'EXTENDED':
+            kwargs['previous_storage'] = self.previous_storage
+        return self.__class__.__qualname__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._set_storage(app_label, schema_editor, to_state, self.storage)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._set_storage(app_label, schema_editor, to_state, self.previous_storage)
+
+    def describe(self):
+        return f"Set storage {self.storage} for {self.model_name}.{self.name}"
+
+    def _set_storage(self, app_label, schema_editor, state, storage) -> None:
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        quote_name = schema_editor.quote_name
+        column = model._meta.get_field(self.name).column
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(model._meta.db_table)} "
+            f"ALTER COLUMN {quote_name(column)} SET STORAGE {storage}"
+        )
@@ -1,3 +1,129 @@
+import gzip
+import json
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from categories.models import Category
+from goals.models import (
+    Goal,
+    GoalLedgerEntry,
+)
+from telegram_bot.models import (
+    BotMessage,
+    TelegramUser,
+)
+from transactions.models import Transaction
+
+
+class AddIndexConcurrentlyIfPostgresTests(TestCase):
+    """На SQLite (тесты) операция должна создавать обычный индекс."""
+
+    def _index_names(self, table: str) -> set:
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, table))
+
+    def test_botmessage_index_created(self):
+        self.assertIn(
+            'botmsg_tgu_created_desc',
+            self._index_names('telegram_bot_botmessage'),
+        )
+
+    def test_goal_ledger_index_created(self):
+        self.assertIn(
+            'goals_goall_goal_id_b2f0f5_idx',
+            self._index_names('goals_goalledgerentry'),
+        )
+
+
+class ApiInfoTests(TestCase):
+    def test_api_info_is_public_json(self):
+        response = self.client.get('/api/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = json.loads(response.content)
+        self.assertEqual(data['name'], 'FinHub API')
+        self.assertEqual(data['endpoints']['v1'], 'http://testserver/api/v1/')
+
+    def test_api_info_gzip(self):
+        response = self.client.get('/api/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        data = json.loads(gzip.decompress(response.content))
+        self.assertEqual(data['endpoints']['docs'], 'http://testserver/api/docs/')
+
+    def test_api_info_respects_gzip_quality(self):
+        cases = {
+            'gzip;q=0': False,
+            'gzip; q=0.0, deflate': False,
+            '*;q=0.5': True,
+            'deflate, *;q=0': False,
+            'identity, gzip;q=0.8': True,
+        }
+        for accept_encoding, gzipped in cases.items():
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get('/api/', HTTP_ACCEPT_ENCODING=accept_encoding)
+
+                self.assertEqual(response.has_header('Content-Encoding'), gzipped)
+
+
+class ChangeListOnlyMixinTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.admin_user)
+
+        user = User.objects.create_user('tg_1')
+        telegram_user = TelegramUser.objects.create(user=user, telegram_id=1, username='u1')
+        BotMessage.objects.create(
+            telegram_user=telegram_user,
+            message_type='incoming',
+            text='x' * 500,
+        )
+
+        category = Category.objects.create(name='Еда', type='expense', user=user)
+        transaction = Transaction.objects.create(
+            amount=Decimal('100'),
+            category=category,
+            date=timezone.now().date(),
+            user=user,
+        )
+        goal = Goal.objects.create(user=user, title='Отпуск', target_amount=Decimal('1000'))
+        GoalLedgerEntry.objects.create(
+            goal=goal,
+            amount=Decimal('-100'),
+            entry_type=GoalLedgerEntry.SPEND,
+            comment='c' * 500,
+            linked_transaction=transaction,
+        )
+
+    def test_botmessage_changelist(self):
+        response = self.client.get(reverse('admin:telegram_bot_botmessage_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        obj = response.context['cl'].result_list[0]
+        self.assertIn('text', obj.get_deferred_fields())
+        self.assertContains(response, 'x' * 80)
+        self.assertNotContains(response, 'x' * 81)
+
+    def test_goal_ledger_changelist(self):
+        response = self.client.get(reverse('admin:goals_goalledgerentry_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        obj = response.context['cl'].result_list[0]
+        self.assertIn('comment', obj.get_deferred_fields())
+        self.assertContains(response, 'Отпуск')
+
+    def test_change_form_loads_full_object(self):
+        message = BotMessage.objects.get()
+        response = self.client.get(
+            reverse('admin:telegram_bot_botmessage_change', args=[message.pk]),
+        )
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'x' * 500)
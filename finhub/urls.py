@@ -4,48 +4,52 @@ URL configuration for finhub project.
 The `urlpatterns` list routes URLs to views. For more information please see:
     https://docs.djangoproject.com/en/4.2/topics/http/urls/
 """
+import gzip
+import json
+from functools import lru_cache
+
 from django.contrib import admin
+from django.http import HttpResponse
 from django.urls import (
     path,
     include,
 )
-from rest_framework.response import Response
-from rest_framework.decorators import api_view
-from rest_framework import status
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
 
 
-@api_view(['GET'])
-def api_info(request):
-    """API information endpoint."""
-    base_url = request.build_absolute_uri('/api/')
-    
-    return Response({
+# Плейсхолдер базового URL: подставляется в готовые байты по запросу.
+_API_BASE_PLACEHOLDER = '__API_BASE__'
+
+# Ответ статический, поэтому сериализуем его один раз при импорте.
+_API_INFO_JSON = json.dumps(
+    {
         'name': 'FinHub API',
         'version': '1.0.0',
         'description': 'Personal Finance Management API with comprehensive budgeting and transaction tracking',
         'supported_versions': ['v1'],
         'current_version': 'v1',
         'endpoints': {
-            'v1': f'{base_url}v1/',
-            'auth': f'{base_url}v1/auth/',
-            'docs': f'{base_url}docs/',
-            'redoc': f'{base_url}redoc/',
-            'schema': f'{base_url}schema/',
+            'v1': f'{_API_BASE_PLACEHOLDER}v1/',
+            'auth': f'{_API_BASE_PLACEHOLDER}v1/auth/',
+            'docs': f'{_API_BASE_PLACEHOLDER}docs/',
+            'redoc': f'{_API_BASE_PLACEHOLDER}redoc/',
+            'schema': f'{_API_BASE_PLACEHOLDER}schema/',
         },
         'documentation': {
-            'swagger_ui': f'{base_url}docs/',
-            'redoc': f'{base_url}redoc/',
-            'openapi_schema': f'{base_url}schema/',
+            'swagger_ui': f'{_API_BASE_PLACEHOLDER}docs/',
+            'redoc': f'{_API_BASE_PLACEHOLDER}redoc/',
+            'openapi_schema': f'{_API_BASE_PLACEHOLDER}schema/',
             'interactive': True,
         },
         'authentication': {
             'types': ['Token Authentication', 'Session Authentication'],
-            'token_endpoint': f'{base_url}v1/auth/token/login/',
-            'token_logout': f'{base_url}v1/auth/token/logout/',
+            'token_endpoint': f'{_API_BASE_PLACEHOLDER}v1/auth/token/login/',
+            'token_logout': f'{_API_BASE_PLACEHOLDER}v1/auth/token/logout/',
         },
         'features': [
             'Categories Management',
-            'Transaction Tracking', 
+            'Transaction Tracking',
             'Budget Planning',
             'Financial Analytics',
             'Rate Limiting',
@@ -53,7 +57,61 @@ def api_info(request):
         ],
         'status': 'stable',
         'last_updated': '2024-12-28',
-    })
+    },
+    ensure_ascii=False,
+    separators=(',', ':'),
+).encode('utf-8')
+
+
+@lru_cache(maxsize=8)
+def _render_api_info(base_url: str) -> tuple[bytes, bytes]:
+    """Возвращает (json, gzip(json)) для конкретного базового URL."""
+    escaped_base = json.dumps(base_url, ensure_ascii=False)[1:-1]
+    body = _API_INFO_JSON.replace(
+        _API_BASE_PLACEHOLDER.encode('utf-8'),
+        escaped_base.encode('utf-8'),
+    )
+    return body, gzip.compress(body)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Разрешает ли Accept-Encoding gzip (явно или через `*`) с q > 0.
+
+    Подстрочная проверка (и re_accepts_gzip из GZipMiddleware) считает
+    `gzip;q=0` согласием, хотя это явный отказ.
+    """
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    if 'gzip' in qualities:
+        return qualities['gzip'] > 0
+    return qualities.get('*', 0) > 0
+
+
+@require_GET
+def api_info(request):
+    """API information endpoint (без DRF: ответ статический и публичный)."""
+    body, gzipped_body = _render_api_info(request.build_absolute_uri('/api/'))
+
+    if _accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        response = HttpResponse(gzipped_body, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(body, content_type='application/json')
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
 
 
 urlpatterns = [
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from core.admin import ChangeListOnlyMixin
+
 from goals.models import (
     Goal,
     GoalLedgerEntry,
@@ -29,7 +31,7 @@ class GoalAdmin(admin.ModelAdmin):
 
 
 @admin.register(GoalLedgerEntry)
-class GoalLedgerEntryAdmin(admin.ModelAdmin):
+class GoalLedgerEntryAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = (
         'id',
         'goal',
@@ -38,6 +40,25 @@ class GoalLedgerEntryAdmin(admin.ModelAdmin):
         'occurred_at',
         'linked_transaction',
     )
+    list_select_related = (
+        'goal',
+        'linked_transaction__category',
+    )
+    # Только то, что нужно для list_display и __str__ связанных объектов.
+    changelist_only = (
+        'id',
+        'goal',
+        'goal__title',
+        'goal__user',
+        'entry_type',
+        'amount',
+        'occurred_at',
+        'linked_transaction',
+        'linked_transaction__amount',
+        'linked_transaction__date',
+        'linked_transaction__category',
+        'linked_transaction__category__name',
+    )
     list_filter = (
         'entry_type',
         'occurred_at',
@@ -51,10 +51,6 @@ class Migration(migrations.Migration):
                 'ordering': ['-occurred_at', '-id'],
             },
         ),
-        migrations.AddIndex(
-            model_name='goalledgerentry',
-            index=models.Index(fields=['goal', 'occurred_at'], name='goals_goall_goal_id_b2f0f5_idx'),
-        ),
         migrations.AddConstraint(
             model_name='goal',
             constraint=models.UniqueConstraint(fields=('user', 'title'), name='unique_goal_title_per_user'),
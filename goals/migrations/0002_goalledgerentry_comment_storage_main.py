@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from core.operations import AlterColumnStorageIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0001_initial'),
+    ]
+
+    operations = [
+        # Комментарии короткие: держим их в строке таблицы, без TOAST.
+        AlterColumnStorageIfPostgres(
+            model_name='goalledgerentry',
+            name='comment',
+            storage='MAIN',
+        ),
+    ]
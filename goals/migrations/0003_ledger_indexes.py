@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ('goals', '0002_goalledgerentry_comment_storage_main'),
+    ]
+
+    operations = [
+        # Раньше индекс создавался в 0001_initial. На БД, где он уже есть,
+        # операция ничего не делает.
+        AddIndexConcurrentlyIfPostgres(
+            model_name='goalledgerentry',
+            index=models.Index(
+                fields=['goal', 'occurred_at'],
+                name='goals_goall_goal_id_b2f0f5_idx',
+            ),
+        ),
+    ]
@@ -1,4 +1,9 @@
+import json
+
 from django.contrib import admin
+from django.db.models.functions import Substr
+
+from core.admin import ChangeListOnlyMixin
 
 from telegram_bot.models import (
     BotMessage,
@@ -85,13 +90,24 @@ class UserAliasAdmin(admin.ModelAdmin):
 
 
 @admin.register(BotMessage)
-class BotMessageAdmin(admin.ModelAdmin):
+class BotMessageAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
     list_display = [
         "telegram_user",
         "message_type",
         "short_text",
         "created_at",
     ]
+    list_select_related = [
+        "telegram_user",
+    ]
+    changelist_only = (
+        "id",
+        "telegram_user",
+        "telegram_user__username",
+        "telegram_user__telegram_id",
+        "message_type",
+        "created_at",
+    )
     list_filter = [
         "message_type",
         "created_at",
@@ -101,12 +117,44 @@ class BotMessageAdmin(admin.ModelAdmin):
         "telegram_user__telegram_id",
         "text",
     ]
+    search_help_text = (
+        "Поиск по пользователю и тексту. "
+        'JSON-объект (например, {"source": "voice"}) ищет по metadata.'
+    )
     readonly_fields = [
         "created_at",
         "updated_at",
     ]
 
+    def get_search_results(self, request, queryset, search_term):
+        # `metadata__contains` (jsonb @>) обслуживается GIN-индексом.
+        metadata_filter = self._parse_metadata_search(search_term)
+        if metadata_filter is not None:
+            return queryset.filter(metadata__contains=metadata_filter), False
+        return super().get_search_results(request, queryset, search_term)
+
+    @staticmethod
+    def _parse_metadata_search(search_term: str) -> dict | None:
+        search_term = (search_term or "").strip()
+        if not search_term.startswith("{"):
+            return None
+        try:
+            value = json.loads(search_term)
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
+
+    def narrow_changelist_queryset(self, queryset):
+        # Полный `text` в списке не нужен: БД отдаёт только первые 80 символов.
+        return (
+            super()
+            .narrow_changelist_queryset(queryset)
+            .annotate(short_text_value=Substr("text", 1, 80))
+        )
+
     def short_text(self, obj: BotMessage) -> str:
+        if hasattr(obj, "short_text_value"):
+            return obj.short_text_value or ""
         return (obj.text or "")[:80]
 
 
@@ -1,17 +1,23 @@
+import asyncio
 import logging
 from typing import (
-    Dict,
     Any,
     Optional,
-    Tuple,
 )
 from telegram import (
+    CallbackQuery,
+    InlineKeyboardMarkup,
     Update,
     User as TelegramUserModel,
 )
+from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import User
-from django.db import IntegrityError
+from django.db import (
+    IntegrityError,
+    transaction,
+)
 
 from telegram_bot.models import (
     TelegramUser,
@@ -20,42 +26,41 @@ from telegram_bot.models import (
 )
 from telegram_bot.utils.text_parser import TextCommandParser
 from telegram_bot.utils.admin_alerts import notify_admins_about_exception
-from telegram_bot.utils.telegram_resilience import retry_telegram_call
-from categories.default_categories import ensure_default_categories_async
+from telegram_bot.utils.telegram_resilience import (
+    retry_telegram_call,
+    send_or_edit_message,
+)
+from categories.default_categories import ensure_default_categories
 
 logger = logging.getLogger(__name__)
 
+_CHAT_LOCK_KEY = '_chat_lock'
 
-class BaseHandler:
-    """Базовый класс для всех обработчиков команд"""
-    
-    def __init__(self):
-        self.parser = None
+# Фоновые записи BotMessage. Event loop держит на задачи только слабые
+# ссылки, поэтому сильные храним здесь до завершения задачи.
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
 
-    async def get_or_create_telegram_user_with_bootstrap(
-        self,
-        telegram_user: TelegramUserModel,
-    ) -> Tuple[TelegramUser, bool, int]:
-        """
-        Возвращает TelegramUser + флаги инициализации.
 
-        Returns:
-            (tg_user, is_new_user, defaults_created_count)
-        """
-        telegram_id = telegram_user.id
-        django_username = f"tg_{telegram_id}"
+def _bootstrap_telegram_user(
+    telegram_user: TelegramUserModel,
+) -> tuple[TelegramUser, bool, int]:
+    """
+    Создаёт auth.User, TelegramUser, UserState и дефолтные категории
+    в одной транзакции (синхронно, для вызова через sync_to_async).
 
-        # Fast path: TelegramUser exists
-        try:
-            tg_user = await TelegramUser.objects.aget(telegram_id=telegram_id)
-            return tg_user, False, 0
-        except TelegramUser.DoesNotExist:
-            pass
+    Returns:
+        (tg_user, is_new_user, defaults_created_count)
+    """
+    telegram_id = telegram_user.id
+    django_username = f"tg_{telegram_id}"
 
-        # Idempotent bootstrap. Must be resilient to:
-        # - partially created auth.User (username exists) without TelegramUser
-        # - concurrent updates (/start + /help) racing to create the same records
-        django_user, _ = await User.objects.aget_or_create(
+    # Idempotent bootstrap. Must be resilient to:
+    # - partially created auth.User (username exists) without TelegramUser
+    # - concurrent updates (/start + /help) racing to create the same records
+    #   (get_or_create wraps its INSERT in a savepoint, so a lost race
+    #   doesn't abort the outer transaction)
+    with transaction.atomic(savepoint=False):
+        django_user, _ = User.objects.get_or_create(
             username=django_username,
             defaults={
                 "first_name": telegram_user.first_name or "",
@@ -64,7 +69,7 @@ class BaseHandler:
         )
 
         try:
-            tg_user, tg_created = await TelegramUser.objects.aget_or_create(
+            tg_user, tg_created = TelegramUser.objects.select_related('user').get_or_create(
                 telegram_id=telegram_id,
                 defaults={
                     "user": django_user,
@@ -77,20 +82,61 @@ class BaseHandler:
             )
         except IntegrityError:
             # Race: someone created it between our check and create.
-            tg_user = await TelegramUser.objects.aget(telegram_id=telegram_id)
+            tg_user = TelegramUser.objects.select_related('user').get(
+                telegram_id=telegram_id,
+            )
             tg_created = False
 
         # Ensure state exists (idempotent)
-        await UserState.objects.aget_or_create(telegram_user=tg_user)
+        UserState.objects.get_or_create(telegram_user=tg_user)
 
-        # Ensure categories exist (idempotent). Run after TelegramUser exists,
-        # so even if categories fail, user won't get stuck in bootstrap.
+        # Ensure categories exist (idempotent). Own savepoint: even if
+        # categories fail, user won't get stuck in bootstrap.
         try:
-            defaults_created_count = await ensure_default_categories_async(django_user)
+            with transaction.atomic():
+                defaults_created_count = ensure_default_categories(django_user)
         except Exception:
             defaults_created_count = 0
 
-        return tg_user, tg_created, defaults_created_count
+    return tg_user, tg_created, defaults_created_count
+
+
+class BaseHandler:
+    """Базовый класс для всех обработчиков команд"""
+    
+    # Разметка сообщений _send_or_edit_message. Обработчики, переведенные на
+    # HTML, переопределяют атрибут и экранируют пользовательские строки
+    # (html.escape): в legacy Markdown «_» или «*» в названии ломают
+    # разбор, и Telegram отвечает 400.
+    parse_mode = ParseMode.MARKDOWN
+    
+    async def get_or_create_telegram_user_with_bootstrap(
+        self,
+        telegram_user: TelegramUserModel,
+    ) -> tuple[TelegramUser, bool, int]:
+        """
+        Возвращает TelegramUser + флаги инициализации.
+
+        Returns:
+            (tg_user, is_new_user, defaults_created_count)
+        """
+        # Fast path: TelegramUser exists
+        try:
+            # user подгружаем сразу: обработчики читают telegram_user.user
+            # напрямую, без отдельного запроса и sync_to_async
+            tg_user = await TelegramUser.objects.select_related('user').aget(
+                telegram_id=telegram_user.id,
+            )
+            return tg_user, False, 0
+        except TelegramUser.DoesNotExist:
+            pass
+
+        # Cold path: all bootstrap writes in one DB transaction and one
+        # thread hop instead of a commit per acreate/aget_or_create.
+        return await sync_to_async(
+            _bootstrap_telegram_user,
+            thread_sensitive=True,
+        )(telegram_user)
 
     async def get_or_create_telegram_user(
         self,
@@ -99,17 +145,95 @@ class BaseHandler:
         """
         Получает или создает пользователя Telegram
         
+        Связанный Django User всегда уже загружен (select_related или
+        объект из bootstrap), поэтому telegram_user.user / get_user()
+        не делают запроса.
+        
         Args:
             telegram_user: Объект пользователя из Telegram
             
         Returns:
-            Объект TelegramUser
+            Объект TelegramUser с загруженным user
         """
         tg_user, _, _ = await self.get_or_create_telegram_user_with_bootstrap(
             telegram_user
         )
         return tg_user
     
+    async def get_user(self, telegram_user: TelegramUser) -> User:
+        """
+        Возвращает Django User для TelegramUser
+        
+        get_or_create_telegram_user загружает его через select_related('user'),
+        поэтому обычно это чтение уже закэшированного поля; для экземпляров,
+        полученных иначе, — один нативный async-запрос по user_id
+        (без sync_to_async), результат кэшируется на объекте.
+        
+        Args:
+            telegram_user: Объект TelegramUser
+            
+        Returns:
+            Django User
+        """
+        if TelegramUser.user.is_cached(telegram_user):
+            return telegram_user.user
+        user = await User.objects.aget(pk=telegram_user.user_id)
+        telegram_user.user = user
+        return user
+    
+    async def _send_or_edit_message(
+        self,
+        update: Update | CallbackQuery,
+        context: ContextTypes.DEFAULT_TYPE,
+        message: str,
+        keyboard,
+    ) -> None:
+        """
+        Редактирует сообщение callback-запроса или отправляет новое
+        
+        Выбор edit/send делает send_or_edit_message (isinstance по типу
+        апдейта), разметка — self.parse_mode. keyboard — InlineKeyboardMarkup,
+        список рядов кнопок или None.
+        
+        Args:
+            update: Update или CallbackQuery
+            context: Контекст бота
+            message: Текст сообщения
+            keyboard: Клавиатура
+        """
+        if isinstance(keyboard, list):
+            keyboard = InlineKeyboardMarkup(keyboard) if keyboard else None
+        await send_or_edit_message(
+            update,
+            context,
+            text=message,
+            reply_markup=keyboard,
+            parse_mode=self.parse_mode,
+        )
+    
+    @staticmethod
+    def chat_lock(context: ContextTypes.DEFAULT_TYPE) -> asyncio.Lock:
+        """
+        Возвращает asyncio.Lock текущего чата
+        
+        Callback-запросы обрабатываются неблокирующе (block=False), поэтому
+        апдейты одного чата сериализуются этим локом, а разные чаты
+        обрабатываются параллельно. Лок не реентерабельный.
+        
+        Args:
+            context: Контекст бота
+            
+        Returns:
+            Лок чата (новый, если у апдейта нет чата)
+        """
+        chat_data = context.chat_data
+        if chat_data is None:
+            return asyncio.Lock()
+        lock = chat_data.get(_CHAT_LOCK_KEY)
+        if lock is None:
+            lock = chat_data[_CHAT_LOCK_KEY] = asyncio.Lock()
+        return lock
+    
     async def get_user_state(self, telegram_user: TelegramUser) -> UserState:
         """
         Получает состояние пользователя
@@ -130,7 +254,7 @@ class BaseHandler:
         telegram_user: TelegramUser,
         message_type: str,
         text: str,
-        metadata: Optional[Dict[str, Any]] = None,
+        metadata: Optional[dict[str, Any]] = None,
     ) -> None:
         """
         Логирует сообщение для отладки
@@ -151,6 +275,38 @@ class BaseHandler:
         except Exception as e:
             logger.error(f"Ошибка логирования сообщения: {e}")
     
+    def log_message_in_background(
+        self,
+        telegram_user: TelegramUser,
+        message_type: str,
+        text: str,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Запускает log_message отдельной задачей и сразу возвращается
+        
+        Обработчик не ждёт INSERT в BotMessage, а отмена задачи
+        обработчика не обрывает запись. Незавершённые записи дожидается
+        wait_background_tasks() при остановке бота.
+        
+        Args:
+            telegram_user: Пользователь Telegram
+            message_type: Тип сообщения
+            text: Текст сообщения
+            metadata: Дополнительные данные
+        """
+        task = asyncio.create_task(
+            self.log_message(telegram_user, message_type, text, metadata)
+        )
+        _BACKGROUND_TASKS.add(task)
+        task.add_done_callback(_BACKGROUND_TASKS.discard)
+    
+    @staticmethod
+    async def wait_background_tasks() -> None:
+        """Дожидается фоновых записей log_message_in_background."""
+        if _BACKGROUND_TASKS:
+            await asyncio.gather(*_BACKGROUND_TASKS, return_exceptions=True)
+    
     def get_parser(self, user: User) -> TextCommandParser:
         """
         Получает парсер команд для пользователя
@@ -159,17 +315,16 @@ class BaseHandler:
             user: Django User
             
         Returns:
-            Экземпляр парсера команд
+            Экземпляр парсера команд (из per-user TTL-кэша)
         """
-        if not self.parser or self.parser.user != user:
-            self.parser = TextCommandParser(user)
-        return self.parser
+        return TextCommandParser.from_user_cached(user)
     
     async def handle_error(
         self,
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
         error: Exception,
+        where: str = "BaseHandler.handle_error",
     ) -> None:
         """
         Обрабатывает ошибки
@@ -178,14 +333,15 @@ class BaseHandler:
             update: Объект Update
             context: Контекст бота
             error: Исключение
+            where: Где произошла ошибка (для лога и алерта админам)
         """
-        logger.error(f"Ошибка в обработчике: {error}", exc_info=True)
+        logger.error("Ошибка в обработчике %s: %s", where, error, exc_info=True)
 
         try:
             await notify_admins_about_exception(
                 context.bot,
                 error=error,
-                where="BaseHandler.handle_error",
+                where=where,
                 update=update,
             )
         except Exception:
@@ -1,18 +1,127 @@
+import asyncio
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
 from telegram.ext import ContextTypes
-from asgiref.sync import sync_to_async
 
+from budgets.models import Budget
+from categories.models import Category
 from .base import BaseHandler
 from telegram_bot.keyboards.actions import ActionKeyboard
 from telegram_bot.keyboards.navigation import attach_persistent_navigation
+from telegram_bot.utils.screen_caches import BUDGET_SCREENS_CACHE, user_screens
 
 logger = logging.getLogger(__name__)
 
+_BUDGETS_VIEW_SCREEN = 'view'
+
+
+def _money(value) -> str:
+    """
+    Сумма для вывода: `1,234.50`.
+
+    Форматирование float реализовано на C и заметно быстрее Decimal;
+    суммы в БД хранятся с 2 знаками, так что для отображения точности хватает.
+    """
+    return format(float(value), ',.2f')
+
+
+_BUDGET_DETAIL_TEMPLATE = (
+    "📊 **Бюджет: {icon} {name}**\n\n"
+    "💰 **План:** {amount} ₽\n"
+    "💸 **Потрачено:** {spent_amount} ₽\n"
+    "✅ **Остаток:** {remaining_amount} ₽\n"
+    "📈 **Выполнение:** {spent_percent:.1f}% {status_icon}\n"
+    "📅 **Период:** {period}\n"
+    "📆 **Даты:** {start_date} - {end_date}\n"
+    "⏰ **Дней осталось:** {days_remaining}\n"
+    "💡 **Дневной бюджет:** {daily_budget} ₽"
+)
+
+# Шаблоны callback_data для кнопок, которые строятся в циклах
+_BUDGET_DETAIL_CALLBACK = "budget_detail_{}".format
+_BUDGET_ADD_FOR_CATEGORY_CALLBACK = "budget_add_for_category_{}".format
+
+# Статические экраны: собираются один раз при импорте.
+# Клавиатуры остаются объектами PTB, а не готовыми JSON-dict: reply_markup
+# по контракту PTB — ReplyMarkup, а to_dict() пары кнопок несопоставим
+# с сетевым запросом к Telegram.
+_SHOW_BUDGETS_MESSAGE = (
+    "🎯 **Управление бюджетами**\n\n"
+    "Здесь вы можете настроить месячные бюджеты для категорий:\n"
+    "• 📊 Просмотр текущих бюджетов\n"
+    "• ➕ Добавить новый бюджет\n"
+    "• ✏️ Редактировать существующие бюджеты\n"
+    "• 🗑️ Удалить бюджеты\n\n"
+    "Бюджеты помогают контролировать расходы и получать уведомления при превышении."
+)
+_SHOW_BUDGETS_KEYBOARD = attach_persistent_navigation(
+    InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(
+                text="📊 Просмотр бюджетов",
+                callback_data="budgets_view"
+            ),
+        ],
+        [
+            InlineKeyboardButton(
+                text="➕ Добавить бюджет",
+                callback_data="budgets_add"
+            ),
+        ],
+    ]),
+    back_callback=None,
+)
+
+_NO_BUDGETS_MESSAGE = (
+    "📊 **Текущие бюджеты**\n\n"
+    "У вас пока нет установленных бюджетов.\n\n"
+    "Бюджеты помогают контролировать расходы по категориям. "
+    "При превышении бюджета вы получите уведомление."
+)
+_NO_BUDGETS_KEYBOARD = attach_persistent_navigation(
+    InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(
+                text="➕ Добавить бюджет",
+                callback_data="budgets_add"
+            ),
+        ],
+    ]),
+    back_callback="show_budgets",
+)
+
+_NO_EXPENSE_CATEGORIES_MESSAGE = (
+    "❌ **Нет доступных категорий**\n\n"
+    "Для создания бюджета нужны категории расходов. "
+    "Сначала создайте категории в настройках."
+)
+_NO_EXPENSE_CATEGORIES_KEYBOARD = attach_persistent_navigation(
+    InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(
+                text="🔙 Назад",
+                callback_data="show_budgets"
+            ),
+        ],
+    ]),
+    back_callback="show_budgets",
+)
+
 
 class BudgetHandler(BaseHandler):
     """Обработчик управления бюджетами"""
     
+    @staticmethod
+    def _get_cached_screen(user_id: int, key):
+        screens = BUDGET_SCREENS_CACHE.get(user_id)
+        if screens is None:
+            return None
+        return screens.get(key)
+    
+    @staticmethod
+    def _cache_screen(user_id: int, key, message: str, keyboard) -> None:
+        user_screens(BUDGET_SCREENS_CACHE, user_id)[key] = (message, keyboard)
+    
     async def handle_show_budgets(
         self,
         update: Update | CallbackQuery,
@@ -20,37 +129,11 @@ class BudgetHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает главное меню бюджетов"""
-        message = (
-            "🎯 **Управление бюджетами**\n\n"
-            "Здесь вы можете настроить месячные бюджеты для категорий:\n"
-            "• 📊 Просмотр текущих бюджетов\n"
-            "• ➕ Добавить новый бюджет\n"
-            "• ✏️ Редактировать существующие бюджеты\n"
-            "• 🗑️ Удалить бюджеты\n\n"
-            "Бюджеты помогают контролировать расходы и получать уведомления при превышении."
-        )
-        
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton(
-                    text="📊 Просмотр бюджетов",
-                    callback_data="budgets_view"
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="➕ Добавить бюджет",
-                    callback_data="budgets_add"
-                ),
-            ],
-        ])
-        keyboard = attach_persistent_navigation(keyboard, back_callback=None)
-        
         await self._send_or_edit_message(
             update,
             context,
-            message,
-            keyboard,
+            _SHOW_BUDGETS_MESSAGE,
+            _SHOW_BUDGETS_KEYBOARD,
         )
     
     async def handle_budgets_view(
@@ -60,79 +143,73 @@ class BudgetHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает список бюджетов"""
-        from asgiref.sync import sync_to_async
-        from budgets.models import Budget
+        user = telegram_user.user  # загружен через select_related('user')
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        cached = self._get_cached_screen(user.id, _BUDGETS_VIEW_SCREEN)
+        if cached is not None:
+            message, keyboard = cached
+            await self._send_or_edit_message(
+                update,
+                context,
+                message,
+                keyboard,
+            )
+            return
         
-        # Получаем активные бюджеты пользователя
-        budgets = await sync_to_async(list)(
-            Budget.objects.filter(
+        # Получаем активные бюджеты пользователя вместе с потраченными суммами
+        budgets = [
+            budget
+            async for budget in Budget.objects.filter(
                 user=user,
                 is_active=True,
-            ).select_related('category')
-        )
+            ).select_related('category').with_stats()
+        ]
         
         if not budgets:
-            message = (
-                "📊 **Текущие бюджеты**\n\n"
-                "У вас пока нет установленных бюджетов.\n\n"
-                "Бюджеты помогают контролировать расходы по категориям. "
-                "При превышении бюджета вы получите уведомление."
-            )
-            
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton(
-                        text="➕ Добавить бюджет",
-                        callback_data="budgets_add"
-                    ),
-                ],
-            ])
-            keyboard = attach_persistent_navigation(keyboard, back_callback="show_budgets")
+            message = _NO_BUDGETS_MESSAGE
+            keyboard = _NO_BUDGETS_KEYBOARD
         else:
             # Формируем список бюджетов
-            budgets_text = "📊 **Ваши бюджеты:**\n\n"
-            keyboard_buttons = []
+            budgets_parts = ["📊 **Ваши бюджеты:**\n\n"]
             
             for budget in budgets:
-                # Оборачиваем свойства в sync_to_async
-                spent_percent = await sync_to_async(lambda b: b.spent_percentage)(budget)
-                spent_amount = await sync_to_async(lambda b: b.spent_amount)(budget)
-                remaining_amount = await sync_to_async(lambda b: b.remaining_amount)(budget)
+                # Потраченное уже в аннотации: свойства не ходят в БД
+                spent_percent = budget.spent_percentage
+                spent_amount = budget.spent_amount
+                remaining_amount = budget.remaining_amount
                 
                 status_icon = "🟢" if spent_percent < 80 else "🟡" if spent_percent < 100 else "🔴"
                 
-                budgets_text += (
+                budgets_parts.append(
                     f"• {budget.category.icon} {budget.category.name}\n"
-                    f"  {budget.amount:,.2f} ₽ ({spent_percent:.1f}%)\n"
-                    f"  Потрачено: {spent_amount:,.2f} ₽\n"
-                    f"  Остаток: {remaining_amount:,.2f} ₽\n"
+                    f"  {_money(budget.amount)} ₽ ({spent_percent:.1f}%)\n"
+                    f"  Потрачено: {_money(spent_amount)} ₽\n"
+                    f"  Остаток: {_money(remaining_amount)} ₽\n"
                     f"  {status_icon} {budget.get_period_type_display()}\n\n"
                 )
-                
-                # Добавляем кнопку для каждого бюджета
-                keyboard_buttons.append([
-                    InlineKeyboardButton(
-                        text=f"{budget.category.icon} {budget.category.name}",
-                        callback_data=f"budget_detail_{budget.id}"
-                    ),
-                ])
             
-            # Добавляем кнопки управления
-            keyboard_buttons.extend([
+            # Кнопка для каждого бюджета + кнопки управления
+            keyboard_buttons = [
                 [
                     InlineKeyboardButton(
-                        text="➕ Добавить бюджет",
-                        callback_data="budgets_add"
+                        text=f"{budget.category.icon} {budget.category.name}",
+                        callback_data=_BUDGET_DETAIL_CALLBACK(budget.id)
                     ),
-                ],
+                ]
+                for budget in budgets
+            ]
+            keyboard_buttons.append([
+                InlineKeyboardButton(
+                    text="➕ Добавить бюджет",
+                    callback_data="budgets_add"
+                ),
             ])
             
-            message = budgets_text
+            message = "".join(budgets_parts)
             keyboard = InlineKeyboardMarkup(keyboard_buttons)
             keyboard = attach_persistent_navigation(keyboard, back_callback="show_budgets")
         
+        self._cache_screen(user.id, _BUDGETS_VIEW_SCREEN, message, keyboard)
         await self._send_or_edit_message(
             update,
             context,
@@ -148,18 +225,25 @@ class BudgetHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает детали бюджета"""
-        from asgiref.sync import sync_to_async
-        from budgets.models import Budget
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = telegram_user.user
         
-        try:
-            budget = await sync_to_async(Budget.objects.get, thread_sensitive=True)(
-                id=budget_id,
-                user=user,
-                is_active=True,
+        cached = self._get_cached_screen(user.id, budget_id)
+        if cached is not None:
+            message, keyboard = cached
+            await self._send_or_edit_message(
+                update,
+                context,
+                message,
+                keyboard,
             )
-        except Budget.DoesNotExist:
+            return
+        
+        budget = await Budget.objects.select_related('category').with_stats().filter(
+            id=budget_id,
+            user=user,
+            is_active=True,
+        ).afirst()
+        if budget is None:
             await self._send_error_message(
                 update,
                 context,
@@ -167,25 +251,23 @@ class BudgetHandler(BaseHandler):
             )
             return
         
-        # Получаем свойства бюджета
-        spent_percent = await sync_to_async(lambda b: b.spent_percentage)(budget)
-        spent_amount = await sync_to_async(lambda b: b.spent_amount)(budget)
-        remaining_amount = await sync_to_async(lambda b: b.remaining_amount)(budget)
-        days_remaining = await sync_to_async(lambda b: b.days_remaining)(budget)
-        daily_budget = await sync_to_async(lambda b: b.daily_budget_remaining)(budget)
-        
+        # Потраченное уже в аннотации: свойства не ходят в БД
+        spent_percent = budget.spent_percentage
         status_icon = "🟢" if spent_percent < 80 else "🟡" if spent_percent < 100 else "🔴"
         
-        message = (
-            f"📊 **Бюджет: {budget.category.icon} {budget.category.name}**\n\n"
-            f"💰 **План:** {budget.amount:,.2f} ₽\n"
-            f"💸 **Потрачено:** {spent_amount:,.2f} ₽\n"
-            f"✅ **Остаток:** {remaining_amount:,.2f} ₽\n"
-            f"📈 **Выполнение:** {spent_percent:.1f}% {status_icon}\n"
-            f"📅 **Период:** {budget.get_period_type_display()}\n"
-            f"📆 **Даты:** {budget.start_date} - {budget.end_date}\n"
-            f"⏰ **Дней осталось:** {days_remaining}\n"
-            f"💡 **Дневной бюджет:** {daily_budget:,.2f} ₽"
+        message = _BUDGET_DETAIL_TEMPLATE.format(
+            icon=budget.category.icon,
+            name=budget.category.name,
+            amount=_money(budget.amount),
+            spent_amount=_money(budget.spent_amount),
+            remaining_amount=_money(budget.remaining_amount),
+            spent_percent=spent_percent,
+            status_icon=status_icon,
+            period=budget.get_period_type_display(),
+            start_date=budget.start_date,
+            end_date=budget.end_date,
+            days_remaining=budget.days_remaining,
+            daily_budget=_money(budget.daily_budget_remaining),
         )
         
         keyboard = InlineKeyboardMarkup([
@@ -202,6 +284,7 @@ class BudgetHandler(BaseHandler):
         ])
         keyboard = attach_persistent_navigation(keyboard, back_callback="budgets_view")
         
+        self._cache_screen(user.id, budget_id, message, keyboard)
         await self._send_or_edit_message(
             update,
             context,
@@ -216,50 +299,36 @@ class BudgetHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает форму добавления бюджета"""
-        from asgiref.sync import sync_to_async
-        from categories.models import Category
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = telegram_user.user
         
         # Получаем категории расходов пользователя
-        expense_categories = await sync_to_async(list)(
-            Category.objects.filter(
+        expense_categories = [
+            category
+            async for category in Category.objects.filter(
                 user=user,
                 type='expense',
                 is_active=True,
             )
-        )
+        ]
         
         if not expense_categories:
-            message = (
-                "❌ **Нет доступных категорий**\n\n"
-                "Для создания бюджета нужны категории расходов. "
-                "Сначала создайте категории в настройках."
-            )
-            
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Назад",
-                        callback_data="show_budgets"
-                    ),
-                ],
-            ])
-            keyboard = attach_persistent_navigation(keyboard, back_callback="show_budgets")
+            message = _NO_EXPENSE_CATEGORIES_MESSAGE
+            keyboard = _NO_EXPENSE_CATEGORIES_KEYBOARD
         else:
             message = (
                 "➕ **Добавить бюджет**\n\n"
                 "Выберите категорию для создания бюджета:"
             )
             
-            keyboard_buttons = []
-            for category in expense_categories:
-                keyboard_buttons.append([
+            keyboard_buttons = [
+                [
                     InlineKeyboardButton(
                         text=f"{category.icon} {category.name}",
-                        callback_data=f"budget_add_for_category_{category.id}"
+                        callback_data=_BUDGET_ADD_FOR_CATEGORY_CALLBACK(category.id)
                     ),
-                ])
+                ]
+                for category in expense_categories
+            ]
             
             keyboard_buttons.append([
                 InlineKeyboardButton(
@@ -286,19 +355,15 @@ class BudgetHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает форму для ввода суммы бюджета"""
-        from asgiref.sync import sync_to_async
-        from categories.models import Category
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
-        
-        try:
-            category = await sync_to_async(Category.objects.get)(
-                id=category_id,
-                user=user,
-                type='expense',
-                is_active=True,
-            )
-        except Category.DoesNotExist:
+        user = telegram_user.user
+        
+        category = await Category.objects.filter(
+            id=category_id,
+            user=user,
+            type='expense',
+            is_active=True,
+        ).afirst()
+        if category is None:
             await self._send_error_message(
                 update,
                 context,
@@ -343,18 +408,14 @@ class BudgetHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает форму для редактирования бюджета"""
-        from asgiref.sync import sync_to_async
-        from budgets.models import Budget
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
-        
-        try:
-            budget = await sync_to_async(Budget.objects.get, thread_sensitive=True)(
-                id=budget_id,
-                user=user,
-                is_active=True,
-            )
-        except Budget.DoesNotExist:
+        user = telegram_user.user
+        
+        budget = await Budget.objects.select_related('category').filter(
+            id=budget_id,
+            user=user,
+            is_active=True,
+        ).afirst()
+        if budget is None:
             await self._send_error_message(
                 update,
                 context,
@@ -365,14 +426,14 @@ class BudgetHandler(BaseHandler):
         # Сохраняем ID бюджета для редактирования в контексте
         context.user_data['editing_budget_id'] = budget_id
         
-        # Получаем данные категории через sync_to_async
-        category_icon = await sync_to_async(lambda: budget.category.icon)()
-        category_name = await sync_to_async(lambda: budget.category.name)()
+        # category загружена через select_related — это чтение атрибутов
+        category_icon = budget.category.icon
+        category_name = budget.category.name
         
         message = (
             f"✏️ **Редактирование бюджета**\n\n"
             f"💰 **Категория:** {category_icon} {category_name}\n"
-            f"💸 **Текущая сумма:** {budget.amount:,.2f} ₽\n\n"
+            f"💸 **Текущая сумма:** {_money(budget.amount)} ₽\n\n"
             "Введите новую сумму бюджета (в рублях):\n\n"
             "Примеры: 5000, 10000, 15000"
         )
@@ -410,18 +471,14 @@ class BudgetHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает подтверждение удаления бюджета"""
-        from asgiref.sync import sync_to_async
-        from budgets.models import Budget
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
-        
-        try:
-            budget = await sync_to_async(Budget.objects.get)(
-                id=budget_id,
-                user=user,
-                is_active=True,
-            )
-        except Budget.DoesNotExist:
+        user = telegram_user.user
+        
+        budget = await Budget.objects.select_related('category').filter(
+            id=budget_id,
+            user=user,
+            is_active=True,
+        ).afirst()
+        if budget is None:
             await self._send_error_message(
                 update,
                 context,
@@ -429,16 +486,16 @@ class BudgetHandler(BaseHandler):
             )
             return
         
-        # Получаем данные категории через sync_to_async
-        category_icon = await sync_to_async(lambda: budget.category.icon)()
-        category_name = await sync_to_async(lambda: budget.category.name)()
-        period_display = await sync_to_async(lambda: budget.get_period_type_display())()
+        # category загружена через select_related — это чтение атрибутов
+        category_icon = budget.category.icon
+        category_name = budget.category.name
+        period_display = budget.get_period_type_display()
         
         message = (
             f"🗑️ **Удаление бюджета**\n\n"
             f"Вы уверены, что хотите удалить бюджет для категории "
             f"'{category_icon} {category_name}'?\n\n"
-            f"💰 Сумма: {budget.amount:,.2f} ₽\n"
+            f"💰 Сумма: {_money(budget.amount)} ₽\n"
             f"📅 Период: {period_display}\n\n"
             "⚠️ Это действие нельзя отменить."
         )
@@ -460,18 +517,14 @@ class BudgetHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Выполняет удаление бюджета"""
-        from asgiref.sync import sync_to_async
-        from budgets.models import Budget
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
-        
-        try:
-            budget = await sync_to_async(Budget.objects.get)(
-                id=budget_id,
-                user=user,
-                is_active=True,
-            )
-        except Budget.DoesNotExist:
+        user = telegram_user.user
+        
+        budget = await Budget.objects.select_related('category').filter(
+            id=budget_id,
+            user=user,
+            is_active=True,
+        ).afirst()
+        if budget is None:
             await self._send_error_message(
                 update,
                 context,
@@ -479,12 +532,9 @@ class BudgetHandler(BaseHandler):
             )
             return
         
-        # Получаем данные категории до удаления
-        category_icon = await sync_to_async(lambda: budget.category.icon)()
-        category_name = await sync_to_async(lambda: budget.category.name)()
-        
-        # Удаляем бюджет
-        await sync_to_async(budget.delete)()
+        # Получаем данные категории до удаления (загружена через select_related)
+        category_icon = budget.category.icon
+        category_name = budget.category.name
         
         message = (
             f"✅ **Бюджет удален**\n\n"
@@ -507,30 +557,34 @@ class BudgetHandler(BaseHandler):
             ],
         ])
         
-        await self._send_or_edit_message(
-            update,
-            context,
-            message,
-            keyboard,
-        )
-    
-    async def _send_or_edit_message(
-        self,
-        update: Update | CallbackQuery,
-        context: ContextTypes.DEFAULT_TYPE,
-        message: str,
-        keyboard,
-    ) -> None:
-        """Отправляет или редактирует сообщение"""
-        from telegram_bot.utils.telegram_resilience import send_or_edit_message
-
-        await send_or_edit_message(
-            update,
-            context,
-            text=message,
-            reply_markup=keyboard,
-            parse_mode='Markdown',
+        # DELETE и запрос к Telegram идут параллельно: ответ готов заранее,
+        # ждать окончания удаления перед отправкой не нужно.
+        delete_result, send_result = await asyncio.gather(
+            budget.adelete(),
+            self._send_or_edit_message(
+                update,
+                context,
+                message,
+                keyboard,
+            ),
+            return_exceptions=True,
         )
+        if isinstance(delete_result, Exception):
+            # Пользователь уже видит «удален» — исправляем сообщение
+            logger.error(
+                "Не удалось удалить бюджет %s: %s",
+                budget_id,
+                delete_result,
+                exc_info=delete_result,
+            )
+            await self._send_error_message(
+                update,
+                context,
+                "❌ Не удалось удалить бюджет. Попробуйте еще раз."
+            )
+            return
+        if isinstance(send_result, Exception):
+            raise send_result
     
     async def _send_error_message(
         self,
@@ -1,9 +1,11 @@
+import asyncio
 import logging
 from decimal import Decimal
 from datetime import (
     date,
     datetime,
 )
+from functools import lru_cache
 from telegram import (
     Update,
     CallbackQuery,
@@ -11,13 +13,21 @@ from telegram import (
     InlineKeyboardMarkup,
 )
 from telegram.ext import ContextTypes
-from asgiref.sync import sync_to_async
 
 from .base import BaseHandler
+from .budget_handler import BudgetHandler
+from .goals_handler import GoalsHandler
+from .report_handler import ReportHandler
+from .settings_handler import SettingsHandler
 from telegram_bot.keyboards.categories import CategoryKeyboard
 from telegram_bot.keyboards.actions import ActionKeyboard
+from telegram_bot.keyboards.navigation import MAIN_MENU_BUTTON
+from telegram_bot.utils.callback_router import CallbackRouter
 from telegram_bot.services.command_executor import CommandExecutor
-from telegram_bot.utils.telegram_resilience import safe_edit_message_text
+from telegram_bot.utils.telegram_resilience import (
+    safe_answer_callback,
+    safe_edit_message_text,
+)
 from telegram_bot.services.transaction_service import (
     TransactionService,
     SmartSuggestionsService,
@@ -27,6 +37,102 @@ from transactions.models import Transaction
 
 logger = logging.getLogger(__name__)
 
+# Статичные ответы
+_CANCEL_MAIN_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            text="🔙 Отмена",
+            callback_data="main_menu",
+        ),
+    ],
+    [MAIN_MENU_BUTTON],
+])
+_ADD_EXPENSE_TEXT = (
+    "💸 Введите сумму расхода:\n\n"
+    "Примеры:\n• 500 кофе\n• 1500 продукты\n• 2000"
+)
+_ADD_INCOME_TEXT = (
+    "💰 Введите сумму дохода:\n\n"
+    "Примеры:\n• +5000 зарплата\n• +2000 подработка\n• +1000"
+)
+_UNKNOWN_TEXT = "❌ Неизвестная команда"
+_INVALID_DATA_TEXT = "Ошибка: неверные данные кнопки"
+_NO_AMOUNT_TEXT = "❌ Сначала укажите сумму"
+
+# Навигационные маршруты → группа склейки. Кнопки несут абсолютный
+# период/тип, поэтому из серии нажатий важно только последнее: нажатия,
+# которые ещё ждут chat_lock и уже перекрыты более новым, пропускаются.
+_COALESCE_GROUPS = {
+    'report_current': 'report_nav',
+    'report_all': 'report_nav',
+    'report_prev_': 'report_nav',
+    'report_next_': 'report_nav',
+    'goal_view_': 'goal_nav',
+    'goal_history_': 'goal_nav',
+    'category_list_': 'category_list',
+    'page_': 'category_page',
+}
+# chat_data[_COALESCE_KEY]: группа → id последнего callback-а этой группы
+_COALESCE_KEY = '_callback_latest'
+
+# Маршруты, которые никогда не отвечают на callback текстом: их спиннер
+# гасим сразу, параллельно с работой обработчика. Остальные отвечают
+# сами (всплывающие ошибки/подтверждения), а второй answer Telegram
+# отклоняет — поэтому добавлять сюда только «молчаливые» маршруты.
+_EARLY_ACK_ROUTES = frozenset({
+    'main_menu',
+    'show_stats',
+    'show_budgets',
+    'budgets_view',
+    'budget_detail_',
+    'goals_menu',
+    'goals_list',
+    'goal_view_',
+    'goal_history_',
+    'show_report',
+    'report_current',
+    'report_all',
+    'report_prev_',
+    'report_next_',
+    'page_',
+    'delete_transaction_',
+})
+
+# Тип транзакции → (эмодзи, название для подсказок)
+_TYPE_META = {
+    'expense': ("💸", "расход"),
+    'income': ("💰", "доход"),
+}
+
+# edit_<type>_<id>: ключ состояния в user_data и подсказка для ввода
+_TRANSACTION_EDIT_PROMPTS = {
+    'amount': (
+        'editing_transaction_amount',
+        "✏️ Введите новую сумму (например: 5000 или 499.90):",
+    ),
+    'date': (
+        'editing_transaction_date',
+        "📅 Введите новую дату в формате ДД.MM.YYYY\nНапример: 25.12.2024",
+    ),
+    'comment': (
+        'editing_transaction_comment',
+        "💬 Введите комментарий к транзакции:",
+    ),
+}
+
+
+@lru_cache(maxsize=256)
+def _transaction_edit_keyboard(transaction_id: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [
+            InlineKeyboardButton(
+                text="🔙 Отмена",
+                callback_data=f"transaction_actions_{transaction_id}",
+            ),
+            MAIN_MENU_BUTTON,
+        ],
+    ])
+
 
 class CallbackHandler(BaseHandler):
     """Обработчик callback запросов от inline клавиатур"""
@@ -34,363 +140,86 @@ class CallbackHandler(BaseHandler):
     def __init__(self) -> None:
         super().__init__()
         self._command_executor = CommandExecutor()
+        # Разделы бота без состояния: один экземпляр на весь CallbackHandler
+        self._budget_handler = BudgetHandler()
+        self._goals_handler = GoalsHandler()
+        self._report_handler = ReportHandler()
+        self._settings_handler = SettingsHandler()
     
     async def handle_callback_query(
         self,
         update: Update,
         context: ContextTypes.DEFAULT_TYPE,
     ) -> None:
-        """Обрабатывает callback запросы"""
-        try:
-            query = update.callback_query
-            logger.info(f"Получен callback: {query.data}")
-            
-            # Получаем пользователя
-            telegram_user = await self.get_or_create_telegram_user(
-                update.effective_user
-            )
-            
-            # Обрабатываем callback по типу
-            if query.data == 'voice_confirm_yes':
-                await self._handle_voice_confirm(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'voice_cancel':
-                await self._handle_voice_cancel(query, context)
-            elif query.data.startswith('voice_dialog_type_'):
-                await self._handle_voice_dialog_type(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data.startswith('voice_cat_pick_'):
-                await self._handle_voice_cat_pick(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'voice_cat_all':
-                await self._handle_voice_cat_all(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'voice_cat_create':
-                await self._handle_voice_cat_create(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data.startswith('voice_goal_pick_'):
-                await self._handle_voice_goal_pick(
-                    update,
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'add_expense':
-                await self._handle_add_expense(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'add_income':
-                await self._handle_add_income(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'show_stats':
-                await self._handle_show_stats(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'show_budgets':
-                await self._handle_show_budgets(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'budgets_view':
-                await self._handle_budgets_view(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'budgets_add':
-                await self._handle_budgets_add(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'goals_menu':
-                await self._handle_goals_menu(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'goals_list':
-                await self._handle_goals_list(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data == 'goal_create':
-                await self._handle_goal_create_prompt(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data.startswith('goal_view_'):
-                goal_id = int(query.data.split('_')[2])
-                await self._handle_goal_view(
-                    query,
-                    context,
-                    telegram_user,
-                    goal_id,
-                )
-            elif query.data.startswith('goal_history_'):
-                goal_id = int(query.data.split('_')[2])
-                await self._handle_goal_history(
-                    query,
-                    context,
-                    telegram_user,
-                    goal_id,
-                )
-            elif query.data.startswith('goal_deposit_'):
-                goal_id = int(query.data.split('_')[2])
-                await self._handle_goal_deposit_prompt(
-                    query,
-                    context,
-                    telegram_user,
-                    goal_id,
-                )
-            elif query.data.startswith('goal_withdraw_'):
-                goal_id = int(query.data.split('_')[2])
-                await self._handle_goal_withdraw_prompt(
-                    query,
-                    context,
-                    telegram_user,
-                    goal_id,
-                )
-            elif query.data.startswith('goal_quick_deposit_'):
-                parts = query.data.split('_')
-                goal_id = int(parts[3])
-                amount = int(parts[4])
-                await self._handle_goal_quick_deposit(
-                    query,
-                    context,
-                    telegram_user,
-                    goal_id,
-                    amount,
-                )
-            elif query.data in ('switch_to_income', 'switch_to_expense'):
-                # Переключение типа транзакции (расход/доход)
-                await self._handle_type_switch(
-                    query,
-                    context,
-                    telegram_user,
-                )
-            elif query.data.startswith('budget_detail_'):
-                budget_id = int(query.data.split('_')[2])
-                await self._handle_budget_detail(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            elif query.data.startswith('budget_add_for_category_'):
-                category_id = int(query.data.split('_')[4])
-                await self._handle_budget_add_for_category(
-                    query,
-                    context,
-                    telegram_user,
-                    category_id,
-                )
-            elif query.data.startswith('budget_edit_'):
-                budget_id = int(query.data.split('_')[2])
-                await self._handle_budget_edit(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            elif query.data.startswith('budget_delete_'):
-                budget_id = int(query.data.split('_')[2])
-                await self._handle_budget_delete_confirmation(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            elif query.data.startswith('confirm_budget_delete_'):
-                budget_id = int(query.data.split('_')[3])
-                await self._handle_budget_delete_execution(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            elif query.data.startswith('category_budget_'):
-                category_id = int(query.data.split('_')[2])
-                await self._handle_category_budget(
-                    query,
-                    context,
-                    telegram_user,
-                    category_id,
-                )
-            elif query.data == 'settings':
-                logger.info("Вызываем _handle_settings")
-                await self._handle_settings(query, context, telegram_user)
-            elif (
-                query.data.startswith('edit_amount_')
-                or query.data.startswith('edit_date_')
-                or query.data.startswith('edit_comment_')
-            ):
-                # Редактирование транзакции (дата/комментарий)
-                await self._handle_transaction_edit(
-                    query,
-                    context,
-                    telegram_user,
+        """
+        Обрабатывает callback запросы
+        
+        Зарегистрирован с block=False: PTB запускает его отдельной задачей,
+        и медленный обработчик не задерживает апдейты других чатов.
+        Порядок внутри чата сохраняет chat_lock.
+        Навигационные нажатия, перекрытые более новыми, пропускаются
+        (см. _COALESCE_GROUPS).
+        """
+        query = update.callback_query
+        # callback_data разбирается один раз (см. _CALLBACK_ROUTER ниже)
+        match = _CALLBACK_ROUTER.match(query.data or '')
+        group = _COALESCE_GROUPS.get(match.route) if match is not None else None
+        latest = None
+        if group is not None and context.chat_data is not None:
+            latest = context.chat_data.setdefault(_COALESCE_KEY, {})
+            latest[group] = query.id
+
+        async with self.chat_lock(context):
+            if latest is not None and latest.get(group) != query.id:
+                logger.debug("Пропущен перекрытый callback: %s", query.data)
+                await safe_answer_callback(query)
+                return
+            ack = None
+            if match is not None and match.route in _EARLY_ACK_ROUTES:
+                ack = asyncio.ensure_future(safe_answer_callback(query))
+            try:
+                logger.info("Получен callback: %s", query.data)
+                
+                # Получаем пользователя
+                telegram_user = await self.get_or_create_telegram_user(
+                    update.effective_user
                 )
-            elif query.data == "settings_categories":
-                logger.info("Вызываем _handle_settings_categories")
-                await self._handle_settings_categories(query, context, telegram_user)
-            elif query.data == "settings_limits":
-                logger.info("Вызываем _handle_settings_limits")
-                await self._handle_settings_limits(query, context, telegram_user)
-            elif query.data == "limits_view":
-                logger.info("Вызываем _handle_limits_view")
-                await self._handle_limits_view(query, context, telegram_user)
-            elif query.data == "limits_add":
-                logger.info("Вызываем _handle_limits_add")
-                await self._handle_limits_add(query, context, telegram_user)
-            elif query.data == "limits_delete":
-                logger.info("Вызываем _handle_limits_delete")
-                await self._handle_limits_delete(query, context, telegram_user)
-            elif query.data.startswith("limit_delete_"):
-                logger.info(f"Вызываем _handle_limit_delete для {query.data}")
-                await self._handle_limit_delete(query, context, telegram_user)
-            elif query.data.startswith("limit_add_"):
-                logger.info(f"Вызываем _handle_limit_add для {query.data}")
-                await self._handle_limit_add(query, context, telegram_user)
-            elif query.data == "settings_general":
-                logger.info("Вызываем _handle_settings_general")
-                await self._handle_settings_general(query, context, telegram_user)
-            elif query.data == "category_add":
-                logger.info("Вызываем _handle_category_add")
-                await self._handle_category_add(query, context, telegram_user)
-            elif query.data.startswith("category_add_type_"):
-                await self._handle_category_add_type_selection(query, context, telegram_user)
-            elif query.data.startswith("category_list_"):
-                await self._handle_category_list_by_type(query, context, telegram_user)
-            elif query.data == "category_edit":
-                logger.info("Вызываем _handle_category_edit")
-                await self._handle_category_edit(query, context, telegram_user)
-            elif query.data == "category_delete":
-                logger.info("Вызываем _handle_category_delete")
-                await self._handle_category_delete(query, context, telegram_user)
-            elif query.data.startswith("category_edit_"):
-                await self._handle_category_edit_selection(query, context, telegram_user)
-            elif query.data.startswith("category_actions_"):
-                logger.info("Вызываем _handle_category_actions")
-                await self._handle_category_actions(query, context, telegram_user)
-            elif query.data.startswith("category_rename_"):
-                logger.info("Вызываем _handle_category_rename")
-                await self._handle_category_rename(query, context, telegram_user)
-            elif query.data.startswith("category_icon_"):
-                logger.info("Вызываем _handle_category_icon")
-                await self._handle_category_icon(query, context, telegram_user)
-            elif query.data.startswith("category_icon_select_"):
-                logger.info("Вызываем _handle_category_icon_select")
-                await self._handle_category_icon_select(query, context, telegram_user)
-            elif query.data.startswith("category_type_select_"):
-                logger.info("Вызываем _handle_category_type_select")
-                await self._handle_category_type_select(query, context, telegram_user)
-            elif query.data.startswith("category_type_"):
-                logger.info("Вызываем _handle_category_type")
-                await self._handle_category_type(query, context, telegram_user)
-            elif query.data.startswith("category_confirm_"):
-                logger.info("Вызываем _handle_category_confirm")
-                await self._handle_category_confirm(query, context, telegram_user)
-            elif query.data.startswith("category_delete_"):
-                logger.info("Вызываем _handle_category_delete")
-                await self._handle_category_delete(query, context, telegram_user)
-            elif query.data.startswith("category_income_"):
-                await self._handle_category_edit_selection(query, context, telegram_user)
-            elif query.data.startswith("category_expense_"):
-                await self._handle_category_edit_selection(query, context, telegram_user)
-            elif query.data.startswith("category_"):
-                logger.info("Вызываем _handle_category_selection")
-                await self._handle_category_selection(query, context, telegram_user)
-            elif query.data.startswith("transaction_actions_"):
-                try:
-                    transaction_id = int(query.data.replace("transaction_actions_", ""))
-                    user = await sync_to_async(lambda: telegram_user.user)()
-                    transaction = await sync_to_async(lambda: Transaction.objects.get(
-                        id=transaction_id,
-                        user=user
-                    ), thread_sensitive=True)()
-                    await self._send_transaction_confirmation(query, context, transaction)
-                except Exception:
-                    await query.answer("Транзакция не найдена")
-            elif query.data == "main_menu":
-                logger.info("Вызываем _handle_main_menu")
-                await self._handle_main_menu(query, context, telegram_user)
-            elif query.data == "show_report":
-                logger.info("Вызываем _handle_show_report")
-                await self._handle_show_report(query, context, telegram_user)
-            elif query.data == "report_current":
-                logger.info("Вызываем _handle_report_current")
-                await self._handle_report_current(query, context, telegram_user)
-            elif query.data == "report_all":
-                logger.info("Вызываем _handle_report_all")
-                await self._handle_report_all(query, context, telegram_user)
-            elif query.data == "report_export_excel_current":
-                logger.info("Вызываем _handle_report_export_excel_current")
-                await self._handle_report_export_excel_current(query, context, telegram_user)
-            elif query.data.startswith("report_export_excel_"):
-                logger.info("Вызываем _handle_report_export_excel_period")
-                await self._handle_report_export_excel_period(query, context, telegram_user)
-            elif query.data.startswith("report_prev_"):
-                logger.info("Вызываем _handle_report_navigation")
-                await self._handle_report_navigation(query, context, telegram_user)
-            elif query.data.startswith("report_next_"):
-                logger.info("Вызываем _handle_report_navigation")
-                await self._handle_report_navigation(query, context, telegram_user)
-            elif query.data == "report_disabled":
-                await query.answer("Нет доступных отчетов для навигации")
-            else:
-                logger.info("Вызываем _handle_unknown_callback")
-                await self._handle_unknown_callback(query, context)
                 
-        except Exception as e:
-            await self.handle_error(update, context, e)
+                # Обрабатываем callback по маршруту, обработчики
+                # получают уже разобранные аргументы (match.params)
+                if match is None:
+                    logger.debug("Нет маршрута для callback: %s", query.data)
+                    await self._handle_unknown_callback(query, context)
+                elif match.params is None:
+                    logger.debug("Неверные аргументы callback: %s", query.data)
+                    await query.answer(_INVALID_DATA_TEXT)
+                else:
+                    await match.handler(
+                        self, update, query, context, telegram_user, match.params,
+                    )
+                    
+            except Exception as e:
+                # В логе и алерте админам — маршрут, на котором упали
+                where = (
+                    f"CallbackHandler[{match.route}]"
+                    if match is not None
+                    else "CallbackHandler.handle_callback_query"
+                )
+                await self.handle_error(update, context, e, where=where)
+            finally:
+                if ack is not None:
+                    await ack
     
     async def _handle_category_selection(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает выбор категории"""
         try:
-            category_id = int(query.data.split('_')[1])
-        except (ValueError, IndexError):
-            # Если не удается получить ID, значит это не выбор категории
-            await self._handle_unknown_callback(query, context)
-            return
-        
-        try:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category = await Category.objects.aget(
                 id=category_id,
                 user=user,
@@ -441,21 +270,13 @@ class CallbackHandler(BaseHandler):
                 )
                 return
 
-            # Создаем транзакцию
-            user = await sync_to_async(lambda: telegram_user.user)()
+            # Создаем транзакцию и сбрасываем состояние одной DB-транзакцией
             transaction_service = TransactionService(user)
-            transaction = await transaction_service.create_transaction(
-                amount=user_state.current_amount,
-                category=category,
-                transaction_type=category.type,
+            transaction = await transaction_service.create_transaction_from_state(
+                user_state,
+                category,
             )
 
-            # Обновляем состояние
-            user_state.last_transaction_type = category.type
-            user_state.current_amount = None
-            user_state.awaiting_category = False
-            await user_state.asave()
-
             context.user_data.pop(VOICE_CATEGORY_PENDING_KEY, None)
 
             # Отправляем подтверждение
@@ -465,19 +286,17 @@ class CallbackHandler(BaseHandler):
                 transaction,
             )
         else:
-            await safe_edit_message_text(query,
-                text="❌ Сначала укажите сумму",
-            )
+            # Сообщение не меняется — хватит всплывающего ответа на callback
+            await query.answer(_NO_AMOUNT_TEXT, show_alert=True)
     
     async def _handle_type_switch(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        new_type: str,
     ) -> None:
         """Обрабатывает переключение типа транзакции"""
-        new_type = query.data.split('_')[2]  # switch_to_expense -> expense
-        
         # Получаем состояние
         user_state = await self.get_user_state(telegram_user)
         
@@ -488,9 +307,7 @@ class CallbackHandler(BaseHandler):
                 new_type
             )
             
-            transaction_emoji = "💸" if new_type == "expense" else "💰"
-            type_name = "расход" if new_type == "expense" else "доход"
-            
+            transaction_emoji, type_name = _TYPE_META[new_type]
             message = (
                 f"{transaction_emoji} {user_state.current_amount:,.0f}₽ - "
                 f"выбери категорию ({type_name}):"
@@ -501,22 +318,17 @@ class CallbackHandler(BaseHandler):
                 reply_markup=keyboard,
             )
         else:
-            await safe_edit_message_text(query,
-                text="❌ Сначала укажите сумму",
-            )
+            await query.answer(_NO_AMOUNT_TEXT, show_alert=True)
     
     async def _handle_page_navigation(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        transaction_type: str,
+        page: int,
     ) -> None:
         """Обрабатывает навигацию по страницам категорий"""
-        # page_expense_1 -> ['page', 'expense', '1']
-        parts = query.data.split('_')
-        transaction_type = parts[1]
-        page = int(parts[2])
-        
         keyboard_generator = CategoryKeyboard(telegram_user)
         keyboard = await keyboard_generator.get_categories_keyboard(
             transaction_type,
@@ -525,35 +337,6 @@ class CallbackHandler(BaseHandler):
         
         await query.edit_message_reply_markup(reply_markup=keyboard)
     
-    async def _handle_all_categories(
-        self,
-        query: CallbackQuery,
-        context: ContextTypes.DEFAULT_TYPE,
-        telegram_user,
-    ) -> None:
-        """Показывает все категории"""
-        transaction_type = query.data.split('_')[2]
-        
-        keyboard_generator = CategoryKeyboard(telegram_user)
-        keyboard = await keyboard_generator.get_categories_keyboard(
-            transaction_type,
-            page=0,
-        )
-        
-        user_state = await self.get_user_state(telegram_user)
-        transaction_emoji = "💸" if transaction_type == "expense" else "💰"
-        type_name = "расход" if transaction_type == "expense" else "доход"
-        
-        message = (
-            f"{transaction_emoji} {user_state.current_amount:,.0f}₽ - "
-            f"все категории ({type_name}):"
-        )
-        
-        await safe_edit_message_text(query,
-            text=message,
-            reply_markup=keyboard,
-        )
-    
     async def _send_transaction_confirmation(
         self,
         query: CallbackQuery,
@@ -561,8 +344,6 @@ class CallbackHandler(BaseHandler):
         transaction,
     ) -> None:
         """Отправляет подтверждение создания транзакции"""
-        transaction_emoji = "💸" if transaction.category.type == "expense" else "💰"
-        
         message = (
             f"✅ {abs(transaction.amount):,.0f}₽ → "
             f"{transaction.category.icon} {transaction.category.name}\n"
@@ -583,86 +364,29 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        edit_type: str,
+        transaction_id: int,
     ) -> None:
         """Обрабатывает редактирование транзакции"""
         # edit_amount_123 / edit_date_123 / edit_comment_123
-        parts = query.data.split('_')
-        edit_type = parts[1]
-        transaction_id = int(parts[2])
-
-        if edit_type == 'amount':
-            context.user_data['editing_transaction_amount'] = transaction_id
-
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Отмена",
-                        callback_data=f"transaction_actions_{transaction_id}",
-                    ),
-                    InlineKeyboardButton(
-                        text="🏠 Главное меню",
-                        callback_data="main_menu",
-                    ),
-                ],
-            ])
-
-            await safe_edit_message_text(query,
-                text="✏️ Введите новую сумму (например: 5000 или 499.90):",
-                reply_markup=keyboard,
-            )
-        elif edit_type == 'date':
-            # Устанавливаем состояние ожидания ввода даты
-            context.user_data['editing_transaction_date'] = transaction_id
-
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Отмена",
-                        callback_data=f"transaction_actions_{transaction_id}"
-                    ),
-                    InlineKeyboardButton(
-                        text="🏠 Главное меню",
-                        callback_data="main_menu"
-                    ),
-                ],
-            ])
-
-            await safe_edit_message_text(query,
-                text="📅 Введите новую дату в формате ДД.MM.YYYY\nНапример: 25.12.2024",
-                reply_markup=keyboard,
-            )
-        elif edit_type == 'comment':
-            # Устанавливаем состояние ожидания ввода комментария
-            context.user_data['editing_transaction_comment'] = transaction_id
-
-            keyboard = InlineKeyboardMarkup([
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Отмена",
-                        callback_data=f"transaction_actions_{transaction_id}"
-                    ),
-                    InlineKeyboardButton(
-                        text="🏠 Главное меню",
-                        callback_data="main_menu"
-                    ),
-                ],
-            ])
+        state_key, text = _TRANSACTION_EDIT_PROMPTS[edit_type]
+        # Устанавливаем состояние ожидания ввода
+        context.user_data[state_key] = transaction_id
 
-            await safe_edit_message_text(query,
-                text="💬 Введите комментарий к транзакции:",
-                reply_markup=keyboard,
-            )
+        await safe_edit_message_text(query,
+            text=text,
+            reply_markup=_transaction_edit_keyboard(transaction_id),
+        )
     
     async def _handle_transaction_delete(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        transaction_id: int,
     ) -> None:
         """Обрабатывает удаление транзакции"""
-        transaction_id = int(query.data.split('_')[2])
-        
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         transaction_service = TransactionService(user)
         success = await transaction_service.delete_transaction(transaction_id)
         
@@ -671,15 +395,33 @@ class CallbackHandler(BaseHandler):
         else:
             await safe_edit_message_text(query, text="❌ Транзакция не найдена")
     
+    async def _handle_transaction_actions(
+        self,
+        query: CallbackQuery,
+        context: ContextTypes.DEFAULT_TYPE,
+        telegram_user,
+        transaction_id: int,
+    ) -> None:
+        """Показывает карточку транзакции с действиями"""
+        # category нужна карточке — подгружаем тем же запросом
+        transaction = await Transaction.objects.select_related(
+            'category',
+        ).filter(
+            id=transaction_id,
+            user_id=telegram_user.user_id,
+        ).afirst()
+        if transaction is None:
+            await query.answer("Транзакция не найдена")
+            return
+        await self._send_transaction_confirmation(query, context, transaction)
+    
     async def _handle_unknown_callback(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
     ) -> None:
         """Обрабатывает неизвестные callback"""
-        await safe_edit_message_text(query,
-            text="❌ Неизвестная команда",
-        )
+        await safe_edit_message_text(query, text=_UNKNOWN_TEXT)
     
     async def _handle_amount_selection(
         self,
@@ -698,25 +440,10 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Добавить расход'"""
-        message = "💸 Введите сумму расхода:\n\nПримеры:\n• 500 кофе\n• 1500 продукты\n• 2000"
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton(
-                    text="🔙 Отмена",
-                    callback_data="main_menu"
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="🏠 Главное меню",
-                    callback_data="main_menu"
-                ),
-            ],
-        ])
-
-        await safe_edit_message_text(query,text=message, reply_markup=keyboard)
+        await safe_edit_message_text(query,
+            text=_ADD_EXPENSE_TEXT,
+            reply_markup=_CANCEL_MAIN_MENU_KEYBOARD,
+        )
     
     async def _handle_add_income(
         self,
@@ -725,25 +452,10 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Добавить доход'"""
-        message = "💰 Введите сумму дохода:\n\nПримеры:\n• +5000 зарплата\n• +2000 подработка\n• +1000"
-        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-
-        keyboard = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton(
-                    text="🔙 Отмена",
-                    callback_data="main_menu"
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="🏠 Главное меню",
-                    callback_data="main_menu"
-                ),
-            ],
-        ])
-
-        await safe_edit_message_text(query,text=message, reply_markup=keyboard)
+        await safe_edit_message_text(query,
+            text=_ADD_INCOME_TEXT,
+            reply_markup=_CANCEL_MAIN_MENU_KEYBOARD,
+        )
     
     async def _handle_show_stats(
         self,
@@ -754,7 +466,7 @@ class CallbackHandler(BaseHandler):
         """Обрабатывает кнопку 'Статистика'"""
         from telegram_bot.services.transaction_service import TransactionService
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         transaction_service = TransactionService(user)
         stats = await transaction_service.get_today_statistics()
         
@@ -788,10 +500,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Бюджеты'"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        
-        budget_handler = BudgetHandler()
-        await budget_handler.handle_show_budgets(
+        await self._budget_handler.handle_show_budgets(
             query,
             context,
             telegram_user,
@@ -804,10 +513,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Настройки'"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_main_settings(
+        await self._settings_handler.handle_main_settings(
             query,
             context,
             telegram_user,
@@ -820,10 +526,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает раздел 'Категории' в настройках"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_categories_settings(
+        await self._settings_handler.handle_categories_settings(
             query,
             context,
             telegram_user,
@@ -836,10 +539,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает раздел 'Лимиты' в настройках"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_limits_settings(
+        await self._settings_handler.handle_limits_settings(
             query,
             context,
             telegram_user,
@@ -852,10 +552,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает просмотр лимитов"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_limits_view(
+        await self._settings_handler.handle_limits_view(
             query,
             context,
             telegram_user,
@@ -868,10 +565,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает добавление лимита"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_limits_add(
+        await self._settings_handler.handle_limits_add(
             query,
             context,
             telegram_user,
@@ -884,10 +578,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает добавление лимита для конкретной категории"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_limit_add_for_category(
+        await self._settings_handler.handle_limit_add_for_category(
             query,
             context,
             telegram_user,
@@ -900,10 +591,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает удаление лимитов"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_limits_delete(
+        await self._settings_handler.handle_limits_delete(
             query,
             context,
             telegram_user,
@@ -914,41 +602,25 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        budget_id: int,
+        confirmed: bool,
     ) -> None:
         """Обрабатывает удаление конкретного лимита"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим данные из callback
-        callback_data = query.data
-        
-        if callback_data.startswith("limit_delete_confirm_"):
-            # Подтверждение удаления
-            try:
-                budget_id = int(callback_data.replace("limit_delete_confirm_", ""))
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_limit_delete_execution(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            except ValueError:
-                await query.answer("Ошибка: неверный ID лимита")
-        elif callback_data.startswith("limit_delete_"):
-            # Выбор лимита для удаления
-            try:
-                budget_id = int(callback_data.replace("limit_delete_", ""))
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_limit_delete_confirmation(
-                    query,
-                    context,
-                    telegram_user,
-                    budget_id,
-                )
-            except ValueError:
-                await query.answer("Ошибка: неверный ID лимита")
+        # limit_delete_{id} — выбор, limit_delete_confirm_{id} — подтверждение
+        if confirmed:
+            await self._settings_handler.handle_limit_delete_execution(
+                query,
+                context,
+                telegram_user,
+                budget_id,
+            )
         else:
-            await query.answer("Неизвестная команда")
+            await self._settings_handler.handle_limit_delete_confirmation(
+                query,
+                context,
+                telegram_user,
+                budget_id,
+            )
     
     async def _handle_settings_general(
         self,
@@ -957,10 +629,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает раздел 'Общие настройки' в настройках"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_general_settings(
+        await self._settings_handler.handle_general_settings(
             query,
             context,
             telegram_user,
@@ -973,69 +642,41 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Добавить категорию' в настройках"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        logger.info(f"Вызван _handle_category_add для пользователя {telegram_user.id}")
-        
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_category_add(
+        await self._settings_handler.handle_category_add(
             query,
             context,
             telegram_user,
         )
-        
-        logger.info("_handle_category_add завершен")
     
     async def _handle_category_add_type_selection(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_type: str,
     ) -> None:
         """Обрабатывает выбор типа категории при добавлении"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим тип категории
-        parts = query.data.split('_')
-        if len(parts) >= 4:
-            category_type = parts[3]  # 'income' или 'expense'
-            
-            settings_handler = SettingsHandler()
-            await settings_handler.handle_category_add_type_selection(
-                query,
-                context,
-                telegram_user,
-                category_type,
-            )
-        else:
-            await query.answer("Ошибка: неверный тип категории")
+        await self._settings_handler.handle_category_add_type_selection(
+            query,
+            context,
+            telegram_user,
+            category_type,
+        )
     
     async def _handle_category_list_by_type(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_type: str,
     ) -> None:
         """Обрабатывает отображение списка категорий по типу"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим данные из callback
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            category_type = parts[2] # 'expense' или 'income'
-            
-            settings_handler = SettingsHandler()
-            await settings_handler.handle_category_list_by_type(
-                query,
-                context,
-                telegram_user,
-                category_type,
-            )
-        else:
-            await query.answer("Ошибка: неверный тип категории")
+        await self._settings_handler.handle_category_list_by_type(
+            query,
+            context,
+            telegram_user,
+            category_type,
+        )
     
     async def _handle_category_edit(
         self,
@@ -1044,10 +685,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает редактирование категорий"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_category_list(
+        await self._settings_handler.handle_category_list(
             query,
             context,
             telegram_user,
@@ -1059,129 +697,72 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает выбор категории для редактирования"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим ID категории
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            try:
-                category_id = int(parts[2])
-                
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_category_edit_selection(
-                    query,
-                    context,
-                    telegram_user,
-                    category_id,
-                )
-            except ValueError:
-                await query.answer("Ошибка: неверный ID категории")
-        else:
-            await query.answer("Ошибка: неверный ID категории")
+        await self._settings_handler.handle_category_edit_selection(
+            query,
+            context,
+            telegram_user,
+            category_id,
+        )
     
     async def _handle_category_delete(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает удаление категорий"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим ID категории
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            try:
-                category_id = int(parts[2])
-                
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_category_confirmation(
-                    query,
-                    context,
-                    telegram_user,
-                    "delete",
-                    category_id,
-                )
-            except ValueError:
-                await query.answer("Ошибка: неверный ID категории")
-        else:
-            await query.answer("Ошибка: неверный ID категории")
+        await self._settings_handler.handle_category_confirmation(
+            query,
+            context,
+            telegram_user,
+            "delete",
+            category_id,
+        )
     
     async def _handle_category_actions(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает действия с категорией"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим ID категории
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            category_id = int(parts[2])
-            
-            settings_handler = SettingsHandler()
-            await settings_handler.handle_category_actions(
-                query,
-                context,
-                telegram_user,
-                category_id,
-            )
-        else:
-            await query.answer("Ошибка: неверный ID категории")
+        await self._settings_handler.handle_category_actions(
+            query,
+            context,
+            telegram_user,
+            category_id,
+        )
     
     async def _handle_category_icon(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает выбор иконки категории"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим ID категории
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            category_id = int(parts[2])
-            
-            settings_handler = SettingsHandler()
-            await settings_handler.handle_icon_selection(
-                query,
-                context,
-                telegram_user,
-                category_id,
-            )
-        else:
-            await query.answer("Ошибка: неверный ID категории")
+        await self._settings_handler.handle_icon_selection(
+            query,
+            context,
+            telegram_user,
+            category_id,
+        )
     
     async def _handle_category_icon_select(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
+        icon: str,
     ) -> None:
         """Обрабатывает выбор новой иконки из сетки"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-
-        # Формат: category_icon_select_{category_id}_{icon}
-        parts = query.data.split("_", 4)
-        if len(parts) < 5:
-            await query.answer("Ошибка: неверные данные иконки")
-            return
-
-        try:
-            category_id = int(parts[3])
-        except ValueError:
-            await query.answer("Ошибка: неверный ID категории")
-            return
-
-        icon = parts[4]
-
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_category_icon_change(
+        await self._settings_handler.handle_category_icon_change(
             query,
             context,
             telegram_user,
@@ -1194,23 +775,10 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает нажатие 'Переименовать'"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-
-        parts = query.data.split('_')
-        if len(parts) < 3:
-            await query.answer("Ошибка: неверный ID категории")
-            return
-
-        try:
-            category_id = int(parts[2])
-        except ValueError:
-            await query.answer("Ошибка: неверный ID категории")
-            return
-
-        settings_handler = SettingsHandler()
-        await settings_handler.handle_category_rename_prompt(
+        await self._settings_handler.handle_category_rename_prompt(
             query,
             context,
             telegram_user,
@@ -1222,82 +790,49 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         """Обрабатывает изменение типа категории"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим ID категории
-        parts = query.data.split('_')
-        if len(parts) >= 3:
-            try:
-                category_id = int(parts[2])
-                
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_category_type(
-                    query,
-                    context,
-                    telegram_user,
-                    category_id,
-                )
-            except ValueError:
-                await query.answer("Ошибка: неверный ID категории")
-        else:
-            await query.answer("Ошибка: неверный ID категории")
+        await self._settings_handler.handle_category_type(
+            query,
+            context,
+            telegram_user,
+            category_id,
+        )
     
     async def _handle_category_type_select(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
+        new_type: str,
     ) -> None:
         """Обрабатывает выбор нового типа категории"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим данные: category_type_select_14_expense
-        parts = query.data.split('_')
-        if len(parts) >= 4:
-            try:
-                category_id = int(parts[3])
-                new_type = parts[4]  # 'income' или 'expense'
-                
-                settings_handler = SettingsHandler()
-                await settings_handler.handle_category_type_change(
-                    query,
-                    context,
-                    telegram_user,
-                    category_id,
-                    new_type,
-                )
-            except (ValueError, IndexError):
-                await query.answer("Ошибка: неверные данные категории")
-        else:
-            await query.answer("Ошибка: неверные данные категории")
+        await self._settings_handler.handle_category_type_change(
+            query,
+            context,
+            telegram_user,
+            category_id,
+            new_type,
+        )
     
     async def _handle_category_confirm(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        action: str,
+        category_id: int,
     ) -> None:
         """Обрабатывает подтверждение действия с категорией"""
-        from telegram_bot.handlers.settings_handler import SettingsHandler
-        
-        # Парсим данные: category_confirm_delete_14
-        parts = query.data.split('_')
-        if len(parts) >= 4:
-            action = parts[2]  # 'delete'
-            category_id = int(parts[3])  # 14
-            
-            settings_handler = SettingsHandler()
-            await settings_handler.handle_category_action_execution(
-                query,
-                context,
-                telegram_user,
-                action,
-                category_id,
-            )
-        else:
-            await query.answer("Ошибка: неверные данные")
+        await self._settings_handler.handle_category_action_execution(
+            query,
+            context,
+            telegram_user,
+            action,
+            category_id,
+        )
     
     async def _handle_main_menu(
         self,
@@ -1331,7 +866,6 @@ class CallbackHandler(BaseHandler):
         ):
             context.user_data.pop(key, None)
 
-        await query.answer()
         await query.message.reply_text(
             text="🏠 Главное меню FinHub\n\nВыберите действие:",
             reply_markup=keyboard,
@@ -1343,8 +877,6 @@ class CallbackHandler(BaseHandler):
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         for key in (
             'goal_creation_step',
             'goal_creation_data',
@@ -1353,8 +885,7 @@ class CallbackHandler(BaseHandler):
         ):
             context.user_data.pop(key, None)
 
-        handler = GoalsHandler()
-        await handler.handle_goals_menu(query, context, telegram_user)
+        await self._goals_handler.handle_goals_menu(query, context, telegram_user)
 
     async def _handle_goals_list(
         self,
@@ -1362,8 +893,6 @@ class CallbackHandler(BaseHandler):
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         for key in (
             'goal_creation_step',
             'goal_creation_data',
@@ -1372,8 +901,7 @@ class CallbackHandler(BaseHandler):
         ):
             context.user_data.pop(key, None)
 
-        handler = GoalsHandler()
-        await handler.handle_goals_list(query, context, telegram_user)
+        await self._goals_handler.handle_goals_list(query, context, telegram_user)
 
     async def _handle_goal_view(
         self,
@@ -1382,8 +910,6 @@ class CallbackHandler(BaseHandler):
         telegram_user,
         goal_id: int,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         for key in (
             'goal_creation_step',
             'goal_creation_data',
@@ -1392,8 +918,7 @@ class CallbackHandler(BaseHandler):
         ):
             context.user_data.pop(key, None)
 
-        handler = GoalsHandler()
-        await handler.handle_goal_view(query, context, telegram_user, goal_id)
+        await self._goals_handler.handle_goal_view(query, context, telegram_user, goal_id)
 
     async def _handle_goal_history(
         self,
@@ -1402,8 +927,6 @@ class CallbackHandler(BaseHandler):
         telegram_user,
         goal_id: int,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         for key in (
             'goal_creation_step',
             'goal_creation_data',
@@ -1412,8 +935,7 @@ class CallbackHandler(BaseHandler):
         ):
             context.user_data.pop(key, None)
 
-        handler = GoalsHandler()
-        await handler.handle_goal_history(query, context, telegram_user, goal_id)
+        await self._goals_handler.handle_goal_history(query, context, telegram_user, goal_id)
 
     async def _handle_goal_create_prompt(
         self,
@@ -1477,12 +999,9 @@ class CallbackHandler(BaseHandler):
         goal_id: int,
         amount: int,
     ) -> None:
-        from decimal import Decimal
-        from asgiref.sync import sync_to_async
-        from telegram_bot.handlers.goals_handler import GoalsHandler
         from telegram_bot.services.goal_service import GoalService
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         service = GoalService(user)
         entry = await service.add_deposit(goal_id, Decimal(amount))
         if not entry:
@@ -1490,8 +1009,7 @@ class CallbackHandler(BaseHandler):
             return
 
         await query.answer("✅ Переведено")
-        handler = GoalsHandler()
-        await handler.handle_goal_view(query, context, telegram_user, goal_id)
+        await self._goals_handler.handle_goal_view(query, context, telegram_user, goal_id)
     
     async def _handle_show_report(
         self,
@@ -1500,10 +1018,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Отчет'"""
-        from telegram_bot.handlers.report_handler import ReportHandler
-        
-        report_handler = ReportHandler()
-        await report_handler.handle_show_report(
+        await self._report_handler.handle_show_report(
             query,  # Передаем CallbackQuery напрямую
             context,
             telegram_user,
@@ -1516,10 +1031,7 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает отчет за текущий месяц"""
-        from telegram_bot.handlers.report_handler import ReportHandler
-        
-        report_handler = ReportHandler()
-        await report_handler.handle_current_report(
+        await self._report_handler.handle_current_report(
             query,  # Передаем CallbackQuery напрямую
             context,
             telegram_user,
@@ -1532,11 +1044,8 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Обрабатывает кнопку 'Все отчеты'"""
-        from telegram_bot.handlers.report_handler import ReportHandler
-        
         # Показываем первый доступный отчет
-        report_handler = ReportHandler()
-        await report_handler.handle_current_report(
+        await self._report_handler.handle_current_report(
             query,
             context,
             telegram_user,
@@ -1550,11 +1059,8 @@ class CallbackHandler(BaseHandler):
     ) -> None:
         """Экспорт Excel за текущий месяц"""
         from datetime import datetime
-        from telegram_bot.handlers.report_handler import ReportHandler
-
         now = datetime.now()
-        report_handler = ReportHandler()
-        await report_handler.handle_export_excel_month(
+        await self._report_handler.handle_export_excel_month(
             query,
             context,
             telegram_user,
@@ -1567,51 +1073,34 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        year: int,
+        month: int,
     ) -> None:
         """Экспорт Excel за выбранный период"""
-        from telegram_bot.handlers.report_handler import ReportHandler
-
-        # report_export_excel_2026_01
-        parts = query.data.split('_')
-        if len(parts) >= 5:
-            year = int(parts[3])
-            month = int(parts[4])
-            report_handler = ReportHandler()
-            await report_handler.handle_export_excel_month(
-                query,
-                context,
-                telegram_user,
-                year,
-                month,
-            )
-        else:
-            await query.answer("Ошибка: неверный период для экспорта")
+        await self._report_handler.handle_export_excel_month(
+            query,
+            context,
+            telegram_user,
+            year,
+            month,
+        )
     
     async def _handle_report_navigation(
         self,
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        year: int,
+        month: int,
     ) -> None:
         """Обрабатывает навигацию по отчетам"""
-        from telegram_bot.handlers.report_handler import ReportHandler
-        
-        # Парсим данные из callback
-        parts = query.data.split('_')
-        if len(parts) >= 4:
-            year = int(parts[2])
-            month = int(parts[3])
-            
-            report_handler = ReportHandler()
-            await report_handler.handle_report_navigation(
-                query,  # Передаем CallbackQuery напрямую
-                context,
-                telegram_user,
-                year,
-                month,
-            )
-        else:
-            await query.answer("Ошибка навигации по отчетам")
+        await self._report_handler.handle_report_navigation(
+            query,  # Передаем CallbackQuery напрямую
+            context,
+            telegram_user,
+            year,
+            month,
+        )
     
     # Методы для обработки бюджетов
     async def _handle_budgets_view(
@@ -1621,10 +1110,8 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает список бюджетов"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budgets_view(
+        await self._budget_handler.handle_budgets_view(
             query,
             context,
             telegram_user,
@@ -1637,10 +1124,8 @@ class CallbackHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает форму добавления бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budgets_add(
+        await self._budget_handler.handle_budgets_add(
             query,
             context,
             telegram_user,
@@ -1654,10 +1139,8 @@ class CallbackHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает детали бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budget_detail(
+        await self._budget_handler.handle_budget_detail(
             query,
             context,
             telegram_user,
@@ -1672,10 +1155,8 @@ class CallbackHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает форму для ввода суммы бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budget_add_for_category(
+        await self._budget_handler.handle_budget_add_for_category(
             query,
             context,
             telegram_user,
@@ -1690,10 +1171,8 @@ class CallbackHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает подтверждение удаления бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budget_delete_confirmation(
+        await self._budget_handler.handle_budget_delete_confirmation(
             query,
             context,
             telegram_user,
@@ -1708,10 +1187,8 @@ class CallbackHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Выполняет удаление бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budget_delete_execution(
+        await self._budget_handler.handle_budget_delete_execution(
             query,
             context,
             telegram_user,
@@ -1726,10 +1203,7 @@ class CallbackHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Обрабатывает редактирование бюджета"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        
-        budget_handler = BudgetHandler()
-        await budget_handler.handle_budget_edit(
+        await self._budget_handler.handle_budget_edit(
             query,
             context,
             telegram_user,
@@ -1744,10 +1218,8 @@ class CallbackHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Обрабатывает кнопку бюджета в настройках категории"""
-        from telegram_bot.handlers.budget_handler import BudgetHandler
-        budget_handler = BudgetHandler()
         
-        await budget_handler.handle_budget_add_for_category(
+        await self._budget_handler.handle_budget_add_for_category(
             query,
             context,
             telegram_user,
@@ -1774,13 +1246,9 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        category_id: int,
     ) -> None:
         await query.answer()
-        try:
-            category_id = int(query.data.split('_')[-1])
-        except (ValueError, IndexError):
-            await query.answer('Ошибка данных')
-            return
         await self._command_executor.apply_voice_category_pick(
             update,
             context,
@@ -1822,13 +1290,9 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        goal_id: int,
     ) -> None:
         await query.answer()
-        try:
-            goal_id = int(query.data.split('_')[-1])
-        except (ValueError, IndexError):
-            await query.answer('Ошибка данных')
-            return
         await self._command_executor.apply_voice_goal_pick(
             update,
             context,
@@ -1842,10 +1306,10 @@ class CallbackHandler(BaseHandler):
         query: CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
+        tx_type: str,
     ) -> None:
         from telegram_bot.voice.dialog import VoiceDialogManager
 
-        tx_type = 'income' if query.data.endswith('income') else 'expense'
         await VoiceDialogManager().set_type_callback(
             update,
             context,
@@ -1870,4 +1334,221 @@ class CallbackHandler(BaseHandler):
         context.user_data.pop(VOICE_GOAL_PENDING_KEY, None)
         clear_dialog(context)
         await query.answer('Отменено')
-        await safe_edit_message_text(query, text='❌ Голосовая команда отменена.') 
\ No newline at end of file
+        await safe_edit_message_text(query, text='❌ Голосовая команда отменена.') 
+
+
+# Парсеры аргументов маршрутов: чистые функции args → tuple.
+# Вызываются CallbackRouter один раз на callback_data (результат кэшируется);
+# ValueError/IndexError означают неверные данные кнопки.
+def _int_arg(arg: str) -> int:
+    # Только ASCII-цифры: int() принял бы и '+7', ' 7', '٧'
+    if not (arg.isascii() and arg.isdigit()):
+        raise ValueError(arg)
+    return int(arg)
+
+
+def _parse_id(args: tuple[str, ...]) -> tuple[int]:
+    # budget_detail_42 → (42,)
+    return (_int_arg(args[0]),)
+
+
+def _parse_two_ids(args: tuple[str, ...]) -> tuple[int, int]:
+    # goal_quick_deposit_7_500 → (7, 500), report_prev_2026_01 → (2026, 1)
+    return _int_arg(args[0]), _int_arg(args[1])
+
+
+def _parse_type(args: tuple[str, ...]) -> tuple[str]:
+    # category_list_expense → ('expense',)
+    if args[0] not in _TYPE_META:
+        raise ValueError(args[0])
+    return (args[0],)
+
+
+def _parse_type_page(args: tuple[str, ...]) -> tuple[str, int]:
+    # page_expense_1 → ('expense', 1)
+    return _parse_type(args) + (_int_arg(args[1]),)
+
+
+def _parse_id_type(args: tuple[str, ...]) -> tuple[int, str]:
+    # category_type_select_14_expense → (14, 'expense')
+    return _parse_id(args) + _parse_type(args[1:])
+
+
+def _parse_id_icon(args: tuple[str, ...]) -> tuple[int, str]:
+    # category_icon_select_14_🍕 → (14, '🍕'); иконка может содержать `_`
+    if len(args) < 2:
+        raise IndexError(args)
+    return _int_arg(args[0]), '_'.join(args[1:])
+
+
+def _parse_action_id(args: tuple[str, ...]) -> tuple[str, int]:
+    # category_confirm_delete_14 → ('delete', 14)
+    return args[0], _int_arg(args[1])
+
+
+def _build_callback_router() -> CallbackRouter:
+    """
+    Таблица маршрутов callback_data → метод CallbackHandler.
+
+    Обработчик маршрута: (handler, update, query, context, telegram_user, p),
+    где p — CallbackMatch.params: кортеж аргументов, разобранных парсером
+    маршрута, или callback_data, разбитая по `_`, если парсер не задан.
+    """
+    router = CallbackRouter()
+    exact = router.add_exact
+    prefix = router.add_prefix
+
+    # Голосовой ввод
+    exact('voice_confirm_yes', lambda h, u, q, c, t, p: h._handle_voice_confirm(u, q, c, t))
+    exact('voice_cancel', lambda h, u, q, c, t, p: h._handle_voice_cancel(q, c))
+    prefix('voice_dialog_type_', lambda h, u, q, c, t, p: h._handle_voice_dialog_type(
+        u, q, c, t, *p,
+    ), _parse_type)
+    prefix('voice_cat_pick_', lambda h, u, q, c, t, p: h._handle_voice_cat_pick(u, q, c, t, *p), _parse_id)
+    exact('voice_cat_all', lambda h, u, q, c, t, p: h._handle_voice_cat_all(u, q, c, t))
+    exact('voice_cat_create', lambda h, u, q, c, t, p: h._handle_voice_cat_create(u, q, c, t))
+    prefix('voice_goal_pick_', lambda h, u, q, c, t, p: h._handle_voice_goal_pick(u, q, c, t, *p), _parse_id)
+
+    # Главное меню и транзакции
+    exact('add_expense', lambda h, u, q, c, t, p: h._handle_add_expense(q, c, t))
+    exact('add_income', lambda h, u, q, c, t, p: h._handle_add_income(q, c, t))
+    exact('show_stats', lambda h, u, q, c, t, p: h._handle_show_stats(q, c, t))
+    exact('main_menu', lambda h, u, q, c, t, p: h._handle_main_menu(q, c, t))
+    exact('switch_to_income', lambda h, u, q, c, t, p: h._handle_type_switch(q, c, t, 'income'))
+    exact('switch_to_expense', lambda h, u, q, c, t, p: h._handle_type_switch(q, c, t, 'expense'))
+    prefix('edit_amount_', lambda h, u, q, c, t, p: h._handle_transaction_edit(
+        q, c, t, 'amount', *p,
+    ), _parse_id)
+    prefix('edit_date_', lambda h, u, q, c, t, p: h._handle_transaction_edit(
+        q, c, t, 'date', *p,
+    ), _parse_id)
+    prefix('edit_comment_', lambda h, u, q, c, t, p: h._handle_transaction_edit(
+        q, c, t, 'comment', *p,
+    ), _parse_id)
+    prefix('transaction_actions_', lambda h, u, q, c, t, p: h._handle_transaction_actions(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('delete_transaction_', lambda h, u, q, c, t, p: h._handle_transaction_delete(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('page_', lambda h, u, q, c, t, p: h._handle_page_navigation(q, c, t, *p), _parse_type_page)
+
+    # Бюджеты
+    exact('show_budgets', lambda h, u, q, c, t, p: h._handle_show_budgets(q, c, t))
+    exact('budgets_view', lambda h, u, q, c, t, p: h._handle_budgets_view(q, c, t))
+    exact('budgets_add', lambda h, u, q, c, t, p: h._handle_budgets_add(q, c, t))
+    prefix('budget_detail_', lambda h, u, q, c, t, p: h._handle_budget_detail(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('budget_add_for_category_', lambda h, u, q, c, t, p: h._handle_budget_add_for_category(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('budget_edit_', lambda h, u, q, c, t, p: h._handle_budget_edit(q, c, t, *p), _parse_id)
+    prefix('budget_delete_', lambda h, u, q, c, t, p: h._handle_budget_delete_confirmation(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('confirm_budget_delete_', lambda h, u, q, c, t, p: h._handle_budget_delete_execution(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_budget_', lambda h, u, q, c, t, p: h._handle_category_budget(
+        q, c, t, *p,
+    ), _parse_id)
+
+    # Цели
+    exact('goals_menu', lambda h, u, q, c, t, p: h._handle_goals_menu(q, c, t))
+    exact('goals_list', lambda h, u, q, c, t, p: h._handle_goals_list(q, c, t))
+    exact('goal_create', lambda h, u, q, c, t, p: h._handle_goal_create_prompt(q, c, t))
+    prefix('goal_view_', lambda h, u, q, c, t, p: h._handle_goal_view(q, c, t, *p), _parse_id)
+    prefix('goal_history_', lambda h, u, q, c, t, p: h._handle_goal_history(q, c, t, *p), _parse_id)
+    prefix('goal_deposit_', lambda h, u, q, c, t, p: h._handle_goal_deposit_prompt(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('goal_withdraw_', lambda h, u, q, c, t, p: h._handle_goal_withdraw_prompt(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('goal_quick_deposit_', lambda h, u, q, c, t, p: h._handle_goal_quick_deposit(
+        q, c, t, *p,
+    ), _parse_two_ids)
+
+    # Настройки и лимиты
+    exact('settings', lambda h, u, q, c, t, p: h._handle_settings(q, c, t))
+    exact('settings_categories', lambda h, u, q, c, t, p: h._handle_settings_categories(q, c, t))
+    exact('settings_limits', lambda h, u, q, c, t, p: h._handle_settings_limits(q, c, t))
+    exact('settings_general', lambda h, u, q, c, t, p: h._handle_settings_general(q, c, t))
+    exact('limits_view', lambda h, u, q, c, t, p: h._handle_limits_view(q, c, t))
+    exact('limits_add', lambda h, u, q, c, t, p: h._handle_limits_add(q, c, t))
+    exact('limits_delete', lambda h, u, q, c, t, p: h._handle_limits_delete(q, c, t))
+    prefix('limit_delete_', lambda h, u, q, c, t, p: h._handle_limit_delete(
+        q, c, t, *p, confirmed=False,
+    ), _parse_id)
+    prefix('limit_delete_confirm_', lambda h, u, q, c, t, p: h._handle_limit_delete(
+        q, c, t, *p, confirmed=True,
+    ), _parse_id)
+    prefix('limit_add_', lambda h, u, q, c, t, p: h._handle_limit_add(q, c, t))
+
+    # Категории
+    exact('category_add', lambda h, u, q, c, t, p: h._handle_category_add(q, c, t))
+    exact('category_edit', lambda h, u, q, c, t, p: h._handle_category_edit(q, c, t))
+    exact('category_delete', lambda h, u, q, c, t, p: q.answer(_INVALID_DATA_TEXT))
+    prefix('category_add_type_', lambda h, u, q, c, t, p: h._handle_category_add_type_selection(
+        q, c, t, *p,
+    ), _parse_type)
+    prefix('category_list_', lambda h, u, q, c, t, p: h._handle_category_list_by_type(
+        q, c, t, *p,
+    ), _parse_type)
+    prefix('category_edit_', lambda h, u, q, c, t, p: h._handle_category_edit_selection(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_income_', lambda h, u, q, c, t, p: h._handle_category_edit_selection(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_expense_', lambda h, u, q, c, t, p: h._handle_category_edit_selection(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_actions_', lambda h, u, q, c, t, p: h._handle_category_actions(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_rename_', lambda h, u, q, c, t, p: h._handle_category_rename(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_icon_', lambda h, u, q, c, t, p: h._handle_category_icon(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_icon_select_', lambda h, u, q, c, t, p: h._handle_category_icon_select(
+        q, c, t, *p,
+    ), _parse_id_icon)
+    prefix('category_type_', lambda h, u, q, c, t, p: h._handle_category_type(
+        q, c, t, *p,
+    ), _parse_id)
+    prefix('category_type_select_', lambda h, u, q, c, t, p: h._handle_category_type_select(
+        q, c, t, *p,
+    ), _parse_id_type)
+    prefix('category_confirm_', lambda h, u, q, c, t, p: h._handle_category_confirm(
+        q, c, t, *p,
+    ), _parse_action_id)
+    prefix('category_delete_', lambda h, u, q, c, t, p: h._handle_category_delete(
+        q, c, t, *p,
+    ), _parse_id)
+    # Выбор категории для новой транзакции: category_{id}
+    prefix('category_', lambda h, u, q, c, t, p: h._handle_category_selection(q, c, t, *p), _parse_id)
+
+    # Отчёты
+    exact('show_report', lambda h, u, q, c, t, p: h._handle_show_report(q, c, t))
+    exact('report_current', lambda h, u, q, c, t, p: h._handle_report_current(q, c, t))
+    exact('report_all', lambda h, u, q, c, t, p: h._handle_report_all(q, c, t))
+    exact('report_export_excel_current', lambda h, u, q, c, t, p: h._handle_report_export_excel_current(q, c, t))
+    prefix('report_export_excel_', lambda h, u, q, c, t, p: h._handle_report_export_excel_period(
+        q, c, t, *p,
+    ), _parse_two_ids)
+    prefix('report_prev_', lambda h, u, q, c, t, p: h._handle_report_navigation(
+        q, c, t, *p,
+    ), _parse_two_ids)
+    prefix('report_next_', lambda h, u, q, c, t, p: h._handle_report_navigation(
+        q, c, t, *p,
+    ), _parse_two_ids)
+    exact('report_disabled', lambda h, u, q, c, t, p: q.answer("Нет доступных отчетов для навигации"))
+
+    return router
+
+
+_CALLBACK_ROUTER = _build_callback_router()
@@ -1,11 +1,14 @@
 import logging
+import string
+from functools import lru_cache
+from typing import Callable
 from telegram import Update
 from telegram.ext import ContextTypes
-from asgiref.sync import sync_to_async
 
 from .base import BaseHandler
 from telegram_bot.keyboards.actions import ActionKeyboard
 from telegram_bot.services.transaction_service import TransactionService
+from telegram_bot.utils.screen_caches import BOT_TEXT_CACHE
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,66 @@ DEFAULT_DEFAULT_CATEGORIES_MESSAGE = (
     "Ты можешь переименовать их, добавить свои или удалить лишние — как удобно."
 )
 
+HELP_TEXT = (
+    "🆘 Справка по использованию FinHub\n\n"
+    "📝 Способы добавления операций:\n\n"
+    "🚀 Быстрый ввод:\n"
+    "• 500 кофе - расход на кофе\n"
+    "• +2000 подработка - доход от подработки\n"
+    "• 1500 - выбрать категорию\n\n"
+    "⚡ Алиасы (настраиваются):\n"
+    "• п500 - продукты 500₽\n"
+    "• к200 - кофе 200₽\n"
+    "• т100 - транспорт 100₽\n\n"
+    "🎯 Категории автоматически определяются по словам!\n\n"
+    "📊 Команды:\n"
+    "• /start - главное меню\n"
+    "• /stats - статистика за сегодня\n"
+    "• /help - эта справка"
+)
+
+
+@lru_cache(maxsize=16)
+def _compile_template(template: str) -> Callable[[str], str]:
+    """
+    Разбирает шаблон один раз и возвращает функцию first_name -> текст.
+
+    Кэш по самому тексту шаблона: после правки в админке придёт новый
+    текст и будет разобран заново.
+    """
+    # поддержка алиаса, чтобы пользователь мог писать camelCase
+    normalized = template.replace("{firstName}", "{first_name}")
+    try:
+        parsed = list(string.Formatter().parse(normalized))
+    except ValueError:
+        # непарные скобки — отдаём текст как есть
+        return lambda first_name: template
+
+    # Обычный случай — только {first_name} без формата: склейка кусков
+    # вместо str.format на каждый /start
+    chunks = []
+    literal = ""
+    for text, field, spec, conversion in parsed:
+        literal += text
+        if field is None:
+            continue
+        if field != "first_name" or spec or conversion:
+            break
+        chunks.append(literal)
+        literal = ""
+    else:
+        chunks.append(literal)
+        return lambda first_name: first_name.join(chunks)
+
+    def render(first_name: str) -> str:
+        try:
+            return normalized.format(first_name=first_name)
+        except Exception:
+            # если в тексте встретились неизвестные {placeholders} — не падаем
+            return template
+
+    return render
+
 
 class CommandHandler(BaseHandler):
     """Обработчик команд бота"""
@@ -37,30 +100,25 @@ class CommandHandler(BaseHandler):
         - {first_name}
         - {firstName} (алиас)
         """
-        # поддержка алиаса, чтобы пользователь мог писать camelCase
-        normalized = template.replace("{firstName}", "{first_name}")
-        try:
-            return normalized.format(first_name=first_name)
-        except Exception:
-            # если в тексте встретились неизвестные {placeholders} — не падаем
-            return template
+        return _compile_template(template)(first_name)
 
     async def _get_bot_text(self, slug: str, default: str) -> str:
         from telegram_bot.models import BotText
 
-        try:
-            obj = await sync_to_async(
-                lambda: BotText.objects.filter(
+        # "" в кэше — текста нет (или он выключен): отдаём default без запроса
+        text = BOT_TEXT_CACHE.get(slug)
+        if text is None:
+            try:
+                text = await BotText.objects.filter(
                     slug=slug,
                     is_active=True,
-                ).first()
-            )()
-        except Exception:
-            return default
+                ).values_list('text', flat=True).afirst()
+            except Exception:
+                return default
+            text = text or ""
+            BOT_TEXT_CACHE.set(slug, text)
 
-        if not obj or not obj.text:
-            return default
-        return obj.text
+        return text or default
     
     async def start_command(
         self,
@@ -90,6 +148,10 @@ class CommandHandler(BaseHandler):
                 first_name=update.effective_user.first_name or "",
             )
 
+            # Онбординг — одно сообщение: Bot API не умеет ставить отправки
+            # в очередь на сервере (invokeAfterMsg есть только в MTProto),
+            # и каждое лишнее send_message — ещё один последовательный RTT.
+            # Новые блоки приветствия добавляем в этот же текст.
             if is_new_user and defaults_created_count > 0:
                 defaults_message = await self._get_bot_text(
                     slug="default_categories_message",
@@ -99,18 +161,19 @@ class CommandHandler(BaseHandler):
             
             keyboard = ActionKeyboard.get_main_menu_keyboard()
             
+            # Лог пишется фоном: ответ пользователю его не ждёт
+            self.log_message_in_background(
+                telegram_user,
+                'incoming',
+                '/start',
+            )
+            
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=welcome_text,
                 reply_markup=keyboard,
             )
             
-            await self.log_message(
-                telegram_user,
-                'incoming',
-                '/start',
-            )
-            
         except Exception as e:
             await self.handle_error(update, context, e)
     
@@ -131,38 +194,20 @@ class CommandHandler(BaseHandler):
                 update.effective_user
             )
             
-            help_text = (
-                "🆘 Справка по использованию FinHub\n\n"
-                "📝 Способы добавления операций:\n\n"
-                "🚀 Быстрый ввод:\n"
-                "• 500 кофе - расход на кофе\n"
-                "• +2000 подработка - доход от подработки\n"
-                "• 1500 - выбрать категорию\n\n"
-                "⚡ Алиасы (настраиваются):\n"
-                "• п500 - продукты 500₽\n"
-                "• к200 - кофе 200₽\n"
-                "• т100 - транспорт 100₽\n\n"
-                "🎯 Категории автоматически определяются по словам!\n\n"
-                "📊 Команды:\n"
-                "• /start - главное меню\n"
-                "• /stats - статистика за сегодня\n"
-                "• /help - эта справка"
-            )
-            
             keyboard = ActionKeyboard.get_main_menu_keyboard()
             
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=help_text,
-                reply_markup=keyboard,
-            )
-            
-            await self.log_message(
+            self.log_message_in_background(
                 telegram_user,
                 'incoming',
                 '/help',
             )
             
+            await context.bot.send_message(
+                chat_id=update.effective_chat.id,
+                text=HELP_TEXT,
+                reply_markup=keyboard,
+            )
+            
         except Exception as e:
             await self.handle_error(update, context, e)
     
@@ -182,9 +227,9 @@ class CommandHandler(BaseHandler):
             telegram_user = await self.get_or_create_telegram_user(
                 update.effective_user
             )
-            # Достаем связанного Django-пользователя через sync_to_async,
-            # чтобы не дергать ORM напрямую из async-контекста
-            user = await sync_to_async(lambda: telegram_user.user)()
+            # user уже загружен через select_related('user'): без запроса
+            # и без отдельного перехода в поток
+            user = await self.get_user(telegram_user)
             transaction_service = TransactionService(user)
             stats = await transaction_service.get_today_statistics()
             
@@ -204,17 +249,17 @@ class CommandHandler(BaseHandler):
             
             keyboard = ActionKeyboard.get_main_menu_keyboard()
             
+            self.log_message_in_background(
+                telegram_user,
+                'incoming',
+                '/stats',
+            )
+            
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=stats_text,
                 reply_markup=keyboard,
             )
             
-            await self.log_message(
-                telegram_user,
-                'incoming',
-                '/stats',
-            )
-            
         except Exception as e:
             await self.handle_error(update, context, e) 
\ No newline at end of file
@@ -1,14 +1,14 @@
 import logging
-from datetime import datetime
+from html import escape
 from decimal import Decimal
 
-from asgiref.sync import sync_to_async
 from telegram import (
     CallbackQuery,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     Update,
 )
+from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 
 from telegram_bot.handlers.base import BaseHandler
@@ -17,25 +17,36 @@ from telegram_bot.services.goal_service import GoalService
 
 logger = logging.getLogger(__name__)
 
+GOALS_MENU_TEXT = (
+    "🎯 <b>Цели (конверты)</b>\n\n"
+    "Цели помогают откладывать деньги на важные покупки и планы.\n\n"
+    "• ➕ Создать цель\n"
+    "• 📋 Посмотреть прогресс\n"
+    "• ➕/↩️ Вносить и снимать средства\n\n"
+    "💡 Важно: «пополнение цели» — это не расход, а резервирование. "
+    "Оно уменьшает «свободно для трат» в текущем месяце."
+)
+
+# Клавиатура пустого списка целей («Создать цель» + навигация) — одна на
+# все ответы «цель не найдена»
+_EMPTY_GOALS_LIST_KEYBOARD = GoalsKeyboard.get_goals_list_keyboard([])
+
+# Строка истории цели: знак, дата (occurred_at — всегда datetime), сумма,
+# комментарий
+_HISTORY_ROW_TEMPLATE = "{} {:%d.%m.%Y} — {:,.0f} ₽{}\n"
+
 
 class GoalsHandler(BaseHandler):
+    parse_mode = ParseMode.HTML
+
     async def handle_goals_menu(
         self,
         update: Update | CallbackQuery,
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
     ) -> None:
-        message = (
-            "🎯 **Цели (конверты)**\n\n"
-            "Цели помогают откладывать деньги на важные покупки и планы.\n\n"
-            "• ➕ Создать цель\n"
-            "• 📋 Посмотреть прогресс\n"
-            "• ➕/↩️ Вносить и снимать средства\n\n"
-            "💡 Важно: «пополнение цели» — это не расход, а резервирование. "
-            "Оно уменьшает «свободно для трат» в текущем месяце."
-        )
         keyboard = GoalsKeyboard.get_goals_menu_keyboard()
-        await self._send_or_edit_message(update, context, message, keyboard)
+        await self._send_or_edit_message(update, context, GOALS_MENU_TEXT, keyboard)
 
     async def handle_goals_list(
         self,
@@ -43,20 +54,21 @@ class GoalsHandler(BaseHandler):
         context: ContextTypes.DEFAULT_TYPE,
         telegram_user,
     ) -> None:
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         service = GoalService(user)
         goals = await service.list_goals()
 
         if goals:
-            message = "📋 **Мои цели:**\n\nВыберите цель:"
+            message = "📋 <b>Мои цели:</b>\n\nВыберите цель:"
+            keyboard = GoalsKeyboard.get_goals_list_keyboard(goals)
         else:
             message = (
-                "📋 **Мои цели**\n\n"
+                "📋 <b>Мои цели</b>\n\n"
                 "Пока целей нет.\n\n"
                 "Нажмите «➕ Создать цель», чтобы начать откладывать."
             )
+            keyboard = _EMPTY_GOALS_LIST_KEYBOARD
 
-        keyboard = GoalsKeyboard.get_goals_list_keyboard(goals)
         await self._send_or_edit_message(update, context, message, keyboard)
 
     async def handle_goal_view(
@@ -66,7 +78,7 @@ class GoalsHandler(BaseHandler):
         telegram_user,
         goal_id: int,
     ) -> None:
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         service = GoalService(user)
         data = await service.get_goal_card_data(goal_id)
         if not data:
@@ -74,7 +86,7 @@ class GoalsHandler(BaseHandler):
                 update,
                 context,
                 "❌ Цель не найдена или недоступна.",
-                GoalsKeyboard.get_goals_list_keyboard([]),
+                _EMPTY_GOALS_LIST_KEYBOARD,
             )
             return
 
@@ -91,22 +103,22 @@ class GoalsHandler(BaseHandler):
         free_funds = data['free_funds_this_month']
 
         lines = []
-        lines.append(f"🎯 **{goal.title}**")
+        lines.append(f"🎯 <b>{escape(goal.title)}</b>")
         if goal.deadline:
             lines.append(f"📅 Дедлайн: {goal.deadline.strftime('%d.%m.%Y')}")
         lines.append("")
-        lines.append(f"✅ Накоплено: **{balance:,.0f} ₽** из **{target:,.0f} ₽** ({progress_pct:.1f}%)")
-        lines.append(f"⏳ Осталось: **{remaining_total:,.0f} ₽**")
+        lines.append(f"✅ Накоплено: <b>{balance:,.0f} ₽</b> из <b>{target:,.0f} ₽</b> ({progress_pct:.1f}%)")
+        lines.append(f"⏳ Осталось: <b>{remaining_total:,.0f} ₽</b>")
 
         if planned_per_month is not None:
             lines.append("")
-            lines.append("📆 **План / факт (текущий месяц):**")
+            lines.append("📆 <b>План / факт (текущий месяц):</b>")
             lines.append(f"• План: {planned_per_month:,.0f} ₽")
             lines.append(f"• Внесено: {deposited_this_month:,.0f} ₽")
             lines.append(f"• Осталось внести: {remaining_this_month:,.0f} ₽")
 
         lines.append("")
-        lines.append(f"🧾 Свободно для трат в этом месяце: **{free_funds:,.0f} ₽**")
+        lines.append(f"🧾 Свободно для трат в этом месяце: <b>{free_funds:,.0f} ₽</b>")
 
         quick_amount = None
         recs = data['recommendations']
@@ -114,8 +126,8 @@ class GoalsHandler(BaseHandler):
             top = recs[0]
             quick_amount = top.suggested_amount
             lines.append("")
-            lines.append("💡 **Подсказка:**")
-            lines.append(top.description)
+            lines.append("💡 <b>Подсказка:</b>")
+            lines.append(escape(top.description))
 
         keyboard = GoalsKeyboard.get_goal_card_keyboard(goal_id, quick_amount=quick_amount)
         await self._send_or_edit_message(update, context, "\n".join(lines), keyboard)
@@ -127,34 +139,33 @@ class GoalsHandler(BaseHandler):
         telegram_user,
         goal_id: int,
     ) -> None:
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         service = GoalService(user)
-        goal = await service.get_goal(goal_id)
+        goal = await service.get_history_view(goal_id, limit=20)
         if not goal:
             await self._send_or_edit_message(
                 update,
                 context,
                 "❌ Цель не найдена.",
-                GoalsKeyboard.get_goals_list_keyboard([]),
+                _EMPTY_GOALS_LIST_KEYBOARD,
             )
             return
 
-        entries = await service.get_recent_entries(goal_id, limit=20)
-        message = f"🕓 **История: {goal.title}**\n\n"
+        parts = [f"🕓 <b>История: {escape(goal.title)}</b>\n\n"]
+        entries = goal.recent_entries
         if not entries:
-            message += "Пока нет операций."
+            parts.append("Пока нет операций.")
         else:
-            for e in entries:
-                dt = e.occurred_at
-                if isinstance(dt, datetime):
-                    dt_str = dt.strftime("%d.%m.%Y")
-                else:
-                    dt_str = str(dt)
-                sign = "➕" if e.amount >= 0 else "↩️"
-                message += f"{sign} {dt_str} — {abs(e.amount):,.0f} ₽"
-                if e.comment:
-                    message += f" — {e.comment}"
-                message += "\n"
+            parts.extend(
+                _HISTORY_ROW_TEMPLATE.format(
+                    "➕" if e.amount >= 0 else "↩️",
+                    e.occurred_at,
+                    abs(e.amount),
+                    f" — {escape(e.comment)}" if e.comment else "",
+                )
+                for e in entries
+            )
+        message = "".join(parts)
 
         keyboard = InlineKeyboardMarkup(
             [
@@ -172,21 +183,3 @@ class GoalsHandler(BaseHandler):
             message,
             keyboard,
         )
-
-    async def _send_or_edit_message(
-        self,
-        update: Update | CallbackQuery,
-        context: ContextTypes.DEFAULT_TYPE,
-        message: str,
-        keyboard,
-    ) -> None:
-        from telegram_bot.utils.telegram_resilience import send_or_edit_message
-
-        await send_or_edit_message(
-            update,
-            context,
-            text=message,
-            reply_markup=keyboard,
-            parse_mode='Markdown',
-        )
-
@@ -1,26 +1,53 @@
+import asyncio
 import logging
+from html import escape
 from datetime import datetime
-import io
 from telegram import Update, CallbackQuery
 from telegram.ext import ContextTypes
-from asgiref.sync import sync_to_async
-from telegram.constants import ChatAction
+from telegram.constants import ChatAction, ParseMode
 
 from .base import BaseHandler
 from telegram_bot.keyboards.reports import ReportKeyboard
 from telegram_bot.services.report_service import ReportService
 from telegram_bot.services.report_export_service import ReportExportService
-from telegram_bot.utils.telegram_resilience import (
-    safe_edit_message_text,
-    send_or_edit_message,
+from telegram_bot.utils.telegram_resilience import safe_edit_message_text
+from telegram_bot.utils.screen_caches import (
+    REPORT_PAST_SCREENS_CACHE,
+    REPORT_SCREENS_CACHE,
+    user_screens,
 )
 
 logger = logging.getLogger(__name__)
 
+_AVAILABLE_PERIODS_KEY = 'periods'
+
+
+REPORTS_MENU_TEXT = (
+    "📈 <b>Отчеты FinHub</b>\n\n"
+    "Выберите тип отчета:\n"
+    "• 📊 Текущий месяц - детальный отчет за текущий месяц\n"
+    "• 📈 Все отчеты - навигация по всем периодам"
+)
+
+# Шаблоны месячного отчета; шапка заполняется прямо из словаря отчета
+_REPORT_HEADER_TEMPLATE = (
+    "📊 <b>Отчет за {period_name}</b>\n\n"
+    "💰 <b>Общая статистика:</b>\n"
+    "• Доходы: {total_income:,.0f}₽\n"
+    "• Расходы: {total_expenses:,.0f}₽\n"
+    "• Баланс: {balance:,.0f}₽\n\n"
+    "📋 <b>Категории:</b>\n"
+)
+_REPORT_ROW_TEMPLATE = "• {} {}: {:,.0f}₽"
+_REPORT_LEFT_TEMPLATE = " (остаток: {:,.0f}₽)"
+_REPORT_OVERSPENT_TEMPLATE = " (превышен на {:,.0f}₽)"
+
 
 class ReportHandler(BaseHandler):
     """Обработчик отчетов"""
     
+    parse_mode = ParseMode.HTML
+    
     async def handle_show_report(
         self,
         update: Update | CallbackQuery,
@@ -29,21 +56,7 @@ class ReportHandler(BaseHandler):
     ) -> None:
         """Показывает главное меню отчетов"""
         keyboard = ReportKeyboard.get_report_main_keyboard()
-        
-        message = (
-            "📈 **Отчеты FinHub**\n\n"
-            "Выберите тип отчета:\n"
-            "• 📊 Текущий месяц - детальный отчет за текущий месяц\n"
-            "• 📈 Все отчеты - навигация по всем периодам"
-        )
-        
-        await send_or_edit_message(
-            update,
-            context,
-            text=message,
-            reply_markup=keyboard,
-            parse_mode='Markdown',
-        )
+        await self._send_or_edit_message(update, context, REPORTS_MENU_TEXT, keyboard)
     
     async def handle_current_report(
         self,
@@ -94,7 +107,7 @@ class ReportHandler(BaseHandler):
         - отправляем файл отдельным сообщением, чтобы отчет оставался на экране
         """
         try:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             export_service = ReportExportService(user)
 
             chat_id = None
@@ -114,14 +127,16 @@ class ReportHandler(BaseHandler):
             await context.bot.send_chat_action(chat_id=chat_id, action=ChatAction.UPLOAD_DOCUMENT)
             result = await export_service.build_monthly_excel(year, month)
 
-            buf = io.BytesIO(result.content)
-            buf.name = result.filename
-
-            await context.bot.send_document(
-                chat_id=chat_id,
-                document=buf,
-                caption=f"📥 Excel-отчет за {month:02d}.{year}",
-            )
+            try:
+                with open(result.path, "rb") as document:
+                    await context.bot.send_document(
+                        chat_id=chat_id,
+                        document=document,
+                        filename=result.filename,
+                        caption=f"📥 Excel-отчет за {month:02d}.{year}",
+                    )
+            finally:
+                result.cleanup()
         except Exception:
             logger.exception("Ошибка экспорта Excel")
             # Пытаемся показать ошибку пользователю максимально мягко
@@ -142,87 +157,71 @@ class ReportHandler(BaseHandler):
         month: int,
     ) -> None:
         """Показывает месячный отчет"""
-        user = await sync_to_async(lambda: telegram_user.user)()
-        report_service = ReportService(user)
-        
-        # Получаем отчет
-        report = await report_service.get_monthly_report(year, month)
+        user = await self.get_user(telegram_user)
         
-        # Получаем доступные периоды для навигации
-        available_periods = await report_service.get_available_periods()
-        
-        # Формируем сообщение
-        message = self._format_report_message(report)
+        now = datetime.now()
+        current_screens = user_screens(REPORT_SCREENS_CACHE, user.id)
+        if (year, month) == (now.year, now.month):
+            screens = current_screens
+        else:
+            screens = user_screens(REPORT_PAST_SCREENS_CACHE, user.id)
         
-        # Создаем клавиатуру навигации
-        keyboard = ReportKeyboard.get_report_navigation_keyboard(
-            current_period={'year': year, 'month': month},
-            available_periods=available_periods,
-        )
+        cached = screens.get((year, month))
+        if cached is not None:
+            message, keyboard = cached
+        else:
+            report_service = ReportService(user)
+            
+            # Доступные периоды для навигации — общие для всех месяцев;
+            # если их нет в кэше, запрашиваем вместе с отчетом
+            available_periods = current_screens.get(_AVAILABLE_PERIODS_KEY)
+            if available_periods is None:
+                report, available_periods = await asyncio.gather(
+                    report_service.get_monthly_report(year, month),
+                    report_service.get_available_periods(),
+                )
+                current_screens[_AVAILABLE_PERIODS_KEY] = available_periods
+            else:
+                report = await report_service.get_monthly_report(year, month)
+            
+            # Формируем сообщение
+            message = self._format_report_message(report)
+            
+            # Создаем клавиатуру навигации
+            keyboard = ReportKeyboard.get_report_navigation_keyboard(
+                current_period={'year': year, 'month': month},
+                available_periods=available_periods,
+            )
+            screens[(year, month)] = (message, keyboard)
         
-        await send_or_edit_message(
-            update,
-            context,
-            text=message,
-            reply_markup=keyboard,
-            parse_mode='Markdown',
-        )
+        await self._send_or_edit_message(update, context, message, keyboard)
     
     def _format_report_message(self, report: dict) -> str:
         """Форматирует сообщение отчета"""
-        message = f"📊 **Отчет за {report['period_name']}**\n\n"
-        
-        # Общая статистика
-        message += "💰 **Общая статистика:**\n"
-        message += f"• Доходы: {report['total_income']:,.0f}₽\n"
-        message += f"• Расходы: {report['total_expenses']:,.0f}₽\n"
-        message += f"• Баланс: {report['balance']:,.0f}₽\n\n"
-        
-        # Категории с остатками
-        message += "📋 **Категории:**\n"
+        parts = [_REPORT_HEADER_TEMPLATE.format_map(report)]
+        append = parts.append
         
-        # Сортируем категории по типу и остатку
-        income_categories = []
-        expense_categories = []
-        
-        for category_name, stats in report['categories'].items():
-            category = stats['category']
-            # Безопасно получаем тип категории
-            category_type = getattr(category, 'type', 'expense')
-            
-            if category_type == 'income':
-                income_categories.append((category_name, stats))
-            else:
-                expense_categories.append((category_name, stats))
-        
-        # Доходы
-        if income_categories:
-            message += "\n💰 **Доходы:**\n"
-            for category_name, stats in sorted(income_categories):
-                emoji = getattr(stats['category'], 'icon', '💰')
-                message += (
-                    f"• {emoji} {category_name}: "
-                    f"{stats['income']:,.0f}₽"
-                )
+        # Строки уже разбиты по типу и отсортированы в ReportService
+        income_rows = report['income_rows']
+        if income_rows:
+            append("\n💰 <b>Доходы:</b>\n")
+            for icon, name, amount, balance in income_rows:
+                append(_REPORT_ROW_TEMPLATE.format(escape(icon), escape(name), amount))
                 # Показываем остаток только если он больше 0 (для доходов это не должно быть)
-                if stats['balance'] > 0:
-                    message += f" (остаток: {stats['balance']:,.0f}₽)"
-                message += "\n"
+                if balance > 0:
+                    append(_REPORT_LEFT_TEMPLATE.format(balance))
+                append("\n")
         
-        # Расходы
-        if expense_categories:
-            message += "\n💸 **Расходы:**\n"
-            for category_name, stats in sorted(expense_categories):
-                emoji = getattr(stats['category'], 'icon', '💸')
-                message += (
-                    f"• {emoji} {category_name}: "
-                    f"{stats['expense']:,.0f}₽"
-                )
+        expense_rows = report['expense_rows']
+        if expense_rows:
+            append("\n💸 <b>Расходы:</b>\n")
+            for icon, name, amount, balance in expense_rows:
+                append(_REPORT_ROW_TEMPLATE.format(escape(icon), escape(name), amount))
                 # Показываем остаток только для категорий с бюджетом
-                if stats['balance'] > 0:
-                    message += f" (остаток: {stats['balance']:,.0f}₽)"
-                elif stats['balance'] < 0:
-                    message += f" (превышен на {abs(stats['balance']):,.0f}₽)"
-                message += "\n"
+                if balance > 0:
+                    append(_REPORT_LEFT_TEMPLATE.format(balance))
+                elif balance < 0:
+                    append(_REPORT_OVERSPENT_TEMPLATE.format(-balance))
+                append("\n")
         
-        return message 
\ No newline at end of file
+        return "".join(parts)
@@ -1,7 +1,6 @@
 import logging
-from telegram import Update, InlineKeyboardButton, CallbackQuery
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, CallbackQuery
 from telegram.ext import ContextTypes
-from asgiref.sync import sync_to_async
 
 from .base import BaseHandler
 from telegram_bot.keyboards.settings import SettingsKeyboard
@@ -9,6 +8,132 @@ from telegram_bot.services.category_management_service import CategoryManagement
 
 logger = logging.getLogger(__name__)
 
+# Подписи действий и типов категорий для сообщений
+_ACTION_NAMES = {
+    'delete': 'удаления',
+    'rename': 'переименования',
+    'icon': 'смены иконки',
+    'type': 'изменения типа',
+}
+# Тип → (эмодзи, название во мн. ч. род. падежа); порядок как у
+# _TYPE_META в callback_handler
+_TYPE_PLURAL_META = {
+    'income': ('💰', 'доходов'),
+    'expense': ('💸', 'расходов'),
+}
+_TYPE_NAMES = {
+    'income': 'доход',
+    'expense': 'расход',
+}
+
+# Экраны разделов настроек без пользовательских данных
+_MAIN_SETTINGS_MESSAGE = (
+    "⚙️ **Настройки FinHub**\n\n"
+    "Выберите раздел для настройки:\n"
+    "• 📂 Категории - управление категориями\n"
+    "• 🎯 Лимиты - настройка месячных лимитов\n"
+    "• ⚙️ Общие настройки - основные параметры"
+)
+_MAIN_SETTINGS_KEYBOARD = SettingsKeyboard.get_main_settings_keyboard()
+
+_CATEGORIES_SETTINGS_MESSAGE = (
+    "📂 **Управление категориями**\n\n"
+    "Выберите действие:\n"
+    "• ➕ Добавить категорию - создать новую\n"
+    "• 📝 Редактировать - изменить существующие\n"
+    "• 🗑️ Удалить - удалить категории"
+)
+_CATEGORIES_KEYBOARD = SettingsKeyboard.get_categories_keyboard()
+
+_GENERAL_SETTINGS_MESSAGE = (
+    "⚙️ **Общие настройки**\n\n"
+    "Здесь вы можете настроить основные параметры:\n"
+    "• 🔔 Уведомления - настройка уведомлений\n"
+    "• 📊 Отчеты - настройка отчетов\n"
+    "• 🎯 Цели - управление финансовыми целями\n"
+    "• 🔐 Безопасность - настройки безопасности\n\n"
+    "Функционал находится в разработке."
+)
+_BACK_TO_SETTINGS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="settings"
+        ),
+    ],
+])
+
+_LIMITS_SETTINGS_MESSAGE = (
+    "🎯 **Управление лимитами**\n\n"
+    "Здесь вы можете настроить месячные лимиты для категорий:\n"
+    "• 📊 Просмотр текущих лимитов\n"
+    "• ➕ Добавить новый лимит\n"
+    "• ✏️ Редактировать существующие лимиты\n"
+    "• 🗑️ Удалить лимиты\n\n"
+    "Лимиты помогают контролировать расходы и получать уведомления при превышении."
+)
+_LIMITS_SETTINGS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            text="📊 Просмотр лимитов",
+            callback_data="limits_view"
+        ),
+    ],
+    [
+        InlineKeyboardButton(
+            text="➕ Добавить лимит",
+            callback_data="limits_add"
+        ),
+    ],
+    [
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="settings"
+        ),
+    ],
+])
+
+_NO_LIMITS_MESSAGE = (
+    "📊 **Текущие лимиты**\n\n"
+    "У вас пока нет установленных лимитов.\n\n"
+    "Лимиты помогают контролировать расходы по категориям. "
+    "При превышении лимита вы получите уведомление."
+)
+_NO_LIMITS_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            text="➕ Добавить лимит",
+            callback_data="limits_add"
+        ),
+    ],
+    [
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="settings_limits"
+        ),
+    ],
+])
+_LIMITS_VIEW_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            text="➕ Добавить лимит",
+            callback_data="limits_add"
+        ),
+    ],
+    [
+        InlineKeyboardButton(
+            text="🗑️ Удалить лимит",
+            callback_data="limits_delete"
+        ),
+    ],
+    [
+        InlineKeyboardButton(
+            text="🔙 Назад",
+            callback_data="settings_limits"
+        ),
+    ],
+])
+
 
 class SettingsHandler(BaseHandler):
     """Обработчик настроек"""
@@ -20,21 +145,11 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает главное меню настроек"""
-        keyboard = SettingsKeyboard.get_main_settings_keyboard()
-        
-        message = (
-            "⚙️ **Настройки FinHub**\n\n"
-            "Выберите раздел для настройки:\n"
-            "• 📂 Категории - управление категориями\n"
-            "• 🎯 Лимиты - настройка месячных лимитов\n"
-            "• ⚙️ Общие настройки - основные параметры"
-        )
-        
         await self._send_or_edit_message(
             update,
             context,
-            message,
-            keyboard,
+            _MAIN_SETTINGS_MESSAGE,
+            _MAIN_SETTINGS_KEYBOARD,
         )
     
     async def handle_categories_settings(
@@ -44,21 +159,11 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает меню управления категориями"""
-        keyboard = SettingsKeyboard.get_categories_keyboard()
-        
-        message = (
-            "📂 **Управление категориями**\n\n"
-            "Выберите действие:\n"
-            "• ➕ Добавить категорию - создать новую\n"
-            "• 📝 Редактировать - изменить существующие\n"
-            "• 🗑️ Удалить - удалить категории"
-        )
-        
         await self._send_or_edit_message(
             update,
             context,
-            message,
-            keyboard,
+            _CATEGORIES_SETTINGS_MESSAGE,
+            _CATEGORIES_KEYBOARD,
         )
     
     async def handle_category_list(
@@ -69,14 +174,14 @@ class SettingsHandler(BaseHandler):
         action: str = "view",
     ) -> None:
         """Показывает список категорий"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         categories = await category_service.get_user_categories()
         
         if not categories:
             message = "📂 **Категории**\n\n❌ У вас пока нет категорий.\n\nНажмите '➕ Добавить категорию' для создания первой категории."
-            keyboard = SettingsKeyboard.get_categories_keyboard()
+            keyboard = _CATEGORIES_KEYBOARD
         else:
             message = f"📂 **Категории** ({len(categories)})\n\nВыберите категорию для {action}:"
             keyboard = SettingsKeyboard.get_category_list_keyboard(
@@ -99,7 +204,7 @@ class SettingsHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает действия с категорией"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         # Получаем информацию о категории
@@ -135,7 +240,7 @@ class SettingsHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает выбор иконки"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         icons = await category_service.get_available_icons()
@@ -192,14 +297,7 @@ class SettingsHandler(BaseHandler):
             category_id,
         )
         
-        action_names = {
-            'delete': 'удаления',
-            'rename': 'переименования',
-            'icon': 'смены иконки',
-            'type': 'изменения типа',
-        }
-        
-        action_name = action_names.get(action, action)
+        action_name = _ACTION_NAMES.get(action, action)
         
         message = (
             f"⚠️ **Подтверждение {action_name}**\n\n"
@@ -221,11 +319,6 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает выбор типа категории для добавления"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        logger.info(f"Начинаем создание категории для пользователя {telegram_user.id}")
-        
         message = (
             "➕ **Создание новой категории**\n\n"
             "Выберите тип категории:\n"
@@ -241,8 +334,6 @@ class SettingsHandler(BaseHandler):
             message,
             keyboard,
         )
-        
-        logger.info("Показан выбор типа категории")
     
     async def handle_category_add_type_selection(
         self,
@@ -252,13 +343,7 @@ class SettingsHandler(BaseHandler):
         category_type: str,
     ) -> None:
         """Показывает форму создания категории выбранного типа"""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        type_name = "доходов" if category_type == "income" else "расходов"
-        type_icon = "💰" if category_type == "income" else "💸"
-        
-        logger.info(f"Выбран тип категории: {category_type}")
+        type_icon, type_name = _TYPE_PLURAL_META.get(category_type, _TYPE_PLURAL_META['expense'])
         
         message = (
             f"{type_icon} **Создание категории {type_name}**\n\n"
@@ -276,7 +361,11 @@ class SettingsHandler(BaseHandler):
         user_state.context_data = {"category_type": category_type}
         await user_state.asave()
         
-        logger.info(f"Состояние установлено: awaiting_category_creation=True, type={category_type}")
+        logger.debug(
+            "Ожидаем название новой категории: user=%s, type=%s",
+            telegram_user.id,
+            category_type,
+        )
         
         keyboard = [
             [
@@ -293,8 +382,6 @@ class SettingsHandler(BaseHandler):
             message,
             keyboard,
         )
-        
-        logger.info("Форма создания категории отображена")
     
     async def handle_category_list_by_type(
         self,
@@ -304,18 +391,17 @@ class SettingsHandler(BaseHandler):
         category_type: str,
     ) -> None:
         """Показывает список категорий определенного типа"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         categories = await category_service.get_user_categories()
-        type_name = "доходов" if category_type == "income" else "расходов"
-        type_icon = "💰" if category_type == "income" else "💸"
+        type_icon, type_name = _TYPE_PLURAL_META.get(category_type, _TYPE_PLURAL_META['expense'])
         
         filtered_categories = [c for c in categories if c.type == category_type]
         
         if not filtered_categories:
             message = f"{type_icon} **Категории {type_name}**\n\n❌ У вас пока нет категорий {type_name}.\n\nНажмите '➕ Добавить категорию' для создания первой категории."
-            keyboard = SettingsKeyboard.get_categories_keyboard()
+            keyboard = _CATEGORIES_KEYBOARD
         else:
             message = f"{type_icon} **Категории {type_name}** ({len(filtered_categories)})\n\nВыберите категорию для редактирования:"
             keyboard = SettingsKeyboard.get_category_list_by_type_keyboard(
@@ -339,7 +425,7 @@ class SettingsHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает меню редактирования категории"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         # Получаем информацию о категории
@@ -351,27 +437,15 @@ class SettingsHandler(BaseHandler):
         
         category = category_stats['category']
         
-        # Проверяем наличие бюджета для категории расходов
-        has_budget = False
-        if category.type == 'expense':
-            from budgets.models import Budget
-            from django.utils import timezone
-            
-            today = timezone.now().date()
-            has_budget = await sync_to_async(Budget.objects.filter(
-                user=user,
-                category=category,
-                start_date__lte=today,
-                end_date__gte=today,
-                is_active=True,
-            ).exists)()
-        
-        keyboard = SettingsKeyboard.get_category_actions_keyboard(category_id, has_budget)
+        keyboard = SettingsKeyboard.get_category_actions_keyboard(
+            category_id,
+            category_stats['has_budget'],
+        )
         
         message = (
             f"📝 **Редактирование категории**\n\n"
             f"**{category.icon} {category.name}**\n"
-            f"Тип: {'доход' if category.type == 'income' else 'расход'}\n"
+            f"Тип: {_TYPE_NAMES.get(category.type, 'расход')}\n"
             f"Иконка: {category.icon}\n\n"
             f"Выберите что хотите изменить:"
         )
@@ -392,7 +466,7 @@ class SettingsHandler(BaseHandler):
         icon: str,
     ) -> None:
         """Сохраняет новую иконку для категории"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         
         # Используем метод update_category вместо прямого изменения
@@ -433,30 +507,11 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает общие настройки"""
-        message = (
-            "⚙️ **Общие настройки**\n\n"
-            "Здесь вы можете настроить основные параметры:\n"
-            "• 🔔 Уведомления - настройка уведомлений\n"
-            "• 📊 Отчеты - настройка отчетов\n"
-            "• 🎯 Цели - управление финансовыми целями\n"
-            "• 🔐 Безопасность - настройки безопасности\n\n"
-            "Функционал находится в разработке."
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    text="🔙 Назад",
-                    callback_data="settings"
-                ),
-            ],
-        ]
-        
         await self._send_or_edit_message(
             update,
             context,
-            message,
-            keyboard,
+            _GENERAL_SETTINGS_MESSAGE,
+            _BACK_TO_SETTINGS_KEYBOARD,
         )
     
     async def handle_limits_settings(
@@ -466,42 +521,11 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает настройки лимитов"""
-        message = (
-            "🎯 **Управление лимитами**\n\n"
-            "Здесь вы можете настроить месячные лимиты для категорий:\n"
-            "• 📊 Просмотр текущих лимитов\n"
-            "• ➕ Добавить новый лимит\n"
-            "• ✏️ Редактировать существующие лимиты\n"
-            "• 🗑️ Удалить лимиты\n\n"
-            "Лимиты помогают контролировать расходы и получать уведомления при превышении."
-        )
-        
-        keyboard = [
-            [
-                InlineKeyboardButton(
-                    text="📊 Просмотр лимитов",
-                    callback_data="limits_view"
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="➕ Добавить лимит",
-                    callback_data="limits_add"
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="🔙 Назад",
-                    callback_data="settings"
-                ),
-            ],
-        ]
-        
         await self._send_or_edit_message(
             update,
             context,
-            message,
-            keyboard,
+            _LIMITS_SETTINGS_MESSAGE,
+            _LIMITS_SETTINGS_KEYBOARD,
         )
     
     async def handle_limits_view(
@@ -511,82 +535,41 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает список лимитов"""
-        from asgiref.sync import sync_to_async
         from budgets.models import Budget
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         
-        # Получаем активные бюджеты пользователя
-        budgets = await sync_to_async(list)(
-            Budget.objects.filter(
+        # Получаем активные бюджеты пользователя вместе с потраченными суммами
+        budgets = [
+            budget
+            async for budget in Budget.objects.filter(
                 user=user,
                 is_active=True,
-            ).select_related('category')
-        )
+            ).select_related('category').with_stats()
+        ]
         
         if not budgets:
-            message = (
-                "📊 **Текущие лимиты**\n\n"
-                "У вас пока нет установленных лимитов.\n\n"
-                "Лимиты помогают контролировать расходы по категориям. "
-                "При превышении лимита вы получите уведомление."
-            )
-            
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        text="➕ Добавить лимит",
-                        callback_data="limits_add"
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Назад",
-                        callback_data="settings_limits"
-                    ),
-                ],
-            ]
+            message = _NO_LIMITS_MESSAGE
+            keyboard = _NO_LIMITS_KEYBOARD
         else:
             # Формируем список бюджетов
-            budgets_text = "📊 **Ваши лимиты:**\n\n"
+            parts = ["📊 **Ваши лимиты:**\n\n"]
             for budget in budgets:
-                # Оборачиваем свойства в sync_to_async
-                spent_percent = await sync_to_async(lambda b: b.spent_percentage)(budget)
-                spent_amount = await sync_to_async(lambda b: b.spent_amount)(budget)
+                # Потраченное уже в аннотации: свойства не ходят в БД
+                spent_percent = budget.spent_percentage
+                spent_amount = budget.spent_amount
                 
                 status_icon = "🟢" if spent_percent < 80 else "🟡" if spent_percent < 100 else "🔴"
                 
-                budgets_text += (
+                parts.append(
                     f"• {budget.category.icon} {budget.category.name}\n"
                     f"  {budget.amount:,.2f} ₽ ({spent_percent:.1f}%)\n"
                     f"  {status_icon} {spent_amount:,.2f} / {budget.amount:,.2f} ₽\n\n"
                 )
+            parts.append(f"\nВсего лимитов: {len(budgets)}")
             
-            message = (
-                f"{budgets_text}\n"
-                f"Всего лимитов: {len(budgets)}"
-            )
-            
-            keyboard = [
-                [
-                    InlineKeyboardButton(
-                        text="➕ Добавить лимит",
-                        callback_data="limits_add"
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="🗑️ Удалить лимит",
-                        callback_data="limits_delete"
-                    ),
-                ],
-                [
-                    InlineKeyboardButton(
-                        text="🔙 Назад",
-                        callback_data="settings_limits"
-                    ),
-                ],
-            ]
+            message = "".join(parts)
+            keyboard = _LIMITS_VIEW_KEYBOARD
         
         await self._send_or_edit_message(
             update,
@@ -609,7 +592,7 @@ class SettingsHandler(BaseHandler):
         )
         
         # Получаем категории пользователя
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         categories = await category_service.get_user_categories()
         
@@ -677,7 +660,7 @@ class SettingsHandler(BaseHandler):
             return
         
         # Получаем категорию
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         category = await category_service.get_category_by_id(category_id)
         
@@ -727,18 +710,18 @@ class SettingsHandler(BaseHandler):
         telegram_user,
     ) -> None:
         """Показывает список лимитов для удаления"""
-        from asgiref.sync import sync_to_async
         from budgets.models import Budget
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         
-        # Получаем активные бюджеты пользователя
-        budgets = await sync_to_async(list)(
-            Budget.objects.filter(
+        # Получаем активные бюджеты пользователя вместе с потраченными суммами
+        budgets = [
+            budget
+            async for budget in Budget.objects.filter(
                 user=user,
                 is_active=True,
-            ).select_related('category')
-        )
+            ).select_related('category').with_stats()
+        ]
         
         if not budgets:
             message = (
@@ -760,11 +743,8 @@ class SettingsHandler(BaseHandler):
             
             keyboard = []
             for budget in budgets:
-                # Оборачиваем свойства в sync_to_async
-                spent_percent = await sync_to_async(lambda b: b.spent_percentage)(budget)
-                spent_amount = await sync_to_async(lambda b: b.spent_amount)(budget)
-                
-                status_icon = "🟢" if spent_percent < 80 else "🟡" if spent_percent < 100 else "🔴"
+                # Потраченное уже в аннотации: свойство не ходит в БД
+                spent_percent = budget.spent_percentage
                 
                 keyboard.append([
                     InlineKeyboardButton(
@@ -795,20 +775,20 @@ class SettingsHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Показывает подтверждение удаления лимита"""
-        from asgiref.sync import sync_to_async
         from budgets.models import Budget
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         
         try:
-            budget = await sync_to_async(Budget.objects.get)(
+            # Категория и потраченная сумма — в том же запросе
+            budget = await Budget.objects.select_related('category').with_stats().aget(
                 id=budget_id,
                 user=user,
                 is_active=True,
             )
             
-            spent_percent = await sync_to_async(lambda b: b.spent_percentage)(budget)
-            spent_amount = await sync_to_async(lambda b: b.spent_amount)(budget)
+            spent_percent = budget.spent_percentage
+            spent_amount = budget.spent_amount
             
             message = (
                 f"🗑️ **Подтверждение удаления**\n\n"
@@ -860,13 +840,12 @@ class SettingsHandler(BaseHandler):
         budget_id: int,
     ) -> None:
         """Выполняет удаление лимита"""
-        from asgiref.sync import sync_to_async
         from budgets.models import Budget
         
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         
         try:
-            budget = await sync_to_async(Budget.objects.get)(
+            budget = await Budget.objects.select_related('category').aget(
                 id=budget_id,
                 user=user,
                 is_active=True,
@@ -877,7 +856,7 @@ class SettingsHandler(BaseHandler):
             amount = budget.amount
             
             # Удаляем бюджет
-            await sync_to_async(budget.delete)()
+            await budget.adelete()
             
             message = (
                 f"✅ **Лимит удален!**\n\n"
@@ -913,7 +892,7 @@ class SettingsHandler(BaseHandler):
     ) -> None:
         """Показывает меню выбора типа категории"""
         try:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category_service = CategoryManagementService(user)
             category = await category_service.get_category_by_id(category_id)
             
@@ -975,7 +954,7 @@ class SettingsHandler(BaseHandler):
     ) -> None:
         """Изменяет тип категории"""
         try:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category_service = CategoryManagementService(user)
             category = await category_service.get_category_by_id(category_id)
             
@@ -991,7 +970,7 @@ class SettingsHandler(BaseHandler):
             category.type = new_type
             await category_service.save_category(category)
             
-            type_name = "доход" if new_type == "income" else "расход"
+            type_name = _TYPE_NAMES.get(new_type, 'расход')
             message = (
                 f"✅ **Тип категории изменен!**\n\n"
                 f"Категория: {category.icon} {category.name}\n"
@@ -1031,7 +1010,7 @@ class SettingsHandler(BaseHandler):
     ) -> None:
         """Выполняет действие с категорией"""
         try:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category_service = CategoryManagementService(user)
             
             if action == "delete":
@@ -1087,7 +1066,7 @@ class SettingsHandler(BaseHandler):
         category_id: int,
     ) -> None:
         """Показывает форму переименования категории и ставит флаг"""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
         category = await category_service.get_category_by_id(category_id)
 
@@ -1125,35 +1104,6 @@ class SettingsHandler(BaseHandler):
             keyboard,
         )
 
-    async def _send_or_edit_message(
-        self,
-        update: Update | CallbackQuery,
-        context: ContextTypes.DEFAULT_TYPE,
-        message: str,
-        keyboard,
-    ) -> None:
-        """Отправляет или редактирует сообщение"""
-        # Обрабатываем клавиатуру
-        reply_markup = None
-        if keyboard:
-            if hasattr(keyboard, 'inline_keyboard'):
-                # Это уже InlineKeyboardMarkup
-                reply_markup = keyboard
-            else:
-                # Это список кнопок, создаем InlineKeyboardMarkup
-                from telegram import InlineKeyboardMarkup
-                reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        from telegram_bot.utils.telegram_resilience import send_or_edit_message
-
-        await send_or_edit_message(
-            update,
-            context,
-            text=message,
-            reply_markup=reply_markup,
-            parse_mode='Markdown',
-        )
-    
     async def _send_error_message(
         self,
         update: Update | CallbackQuery,
@@ -1,10 +1,12 @@
 import logging
 from decimal import Decimal
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
 from telegram.ext import ContextTypes
 from asgiref.sync import sync_to_async
 
 from .base import BaseHandler
+from .goals_handler import GoalsHandler
 from telegram_bot.keyboards.categories import CategoryKeyboard
 from telegram_bot.keyboards.actions import ActionKeyboard
 from telegram_bot.services.command_executor import CommandExecutor
@@ -25,6 +27,7 @@ class TextHandler(BaseHandler):
     def __init__(self) -> None:
         super().__init__()
         self._command_executor = CommandExecutor()
+        self._goals_handler = GoalsHandler()
 
     @staticmethod
     def _parse_money(text: str) -> Decimal:
@@ -142,7 +145,7 @@ class TextHandler(BaseHandler):
                 )
                 return
 
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             service = GoalService(user)
             try:
                 goal = await service.create_goal(
@@ -165,12 +168,9 @@ class TextHandler(BaseHandler):
             context.user_data.pop('goal_creation_step', None)
             context.user_data.pop('goal_creation_data', None)
 
-            from telegram_bot.handlers.goals_handler import GoalsHandler
-
-            handler = GoalsHandler()
             try:
                 await update.message.reply_text("✅ Цель создана. Вот её карточка:")
-                await handler.handle_goal_view(update, context, telegram_user, goal.id)
+                await self._goals_handler.handle_goal_view(update, context, telegram_user, goal.id)
             except Exception:
                 # Цель создана, но UI мог упасть (Markdown/Telegram ошибки и т.п.).
                 # Не маскируем это как "не получилось распознать ввод".
@@ -198,21 +198,18 @@ class TextHandler(BaseHandler):
         goal_id: int,
         message_text: str,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         try:
             amount = self._parse_money(message_text)
             if amount <= 0:
                 raise ValueError("amount<=0")
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             service = GoalService(user)
             entry = await service.add_deposit(goal_id, amount)
             if not entry:
                 await update.message.reply_text("❌ Цель не найдена.")
                 return
             await update.message.reply_text(f"✅ Внесено {amount:,.0f} ₽")
-            handler = GoalsHandler()
-            await handler.handle_goal_view(update, context, telegram_user, goal_id)
+            await self._goals_handler.handle_goal_view(update, context, telegram_user, goal_id)
         except Exception:
             await update.message.reply_text("❌ Неверная сумма. Пример: 5000 или 499.90")
         finally:
@@ -255,7 +252,7 @@ class TextHandler(BaseHandler):
             context.user_data.pop(VOICE_GOAL_PENDING_KEY, None)
             return False
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         resolved = await sync_to_async(GoalResolver(user).resolve)(text)
         if resolved.status == ResolveStatus.MATCHED and resolved.match:
             context.user_data.pop(VOICE_GOAL_PENDING_KEY, None)
@@ -287,21 +284,18 @@ class TextHandler(BaseHandler):
         goal_id: int,
         message_text: str,
     ) -> None:
-        from telegram_bot.handlers.goals_handler import GoalsHandler
-
         try:
             amount = self._parse_money(message_text)
             if amount <= 0:
                 raise ValueError("amount<=0")
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             service = GoalService(user)
             entry = await service.add_withdraw(goal_id, amount)
             if not entry:
                 await update.message.reply_text("❌ Цель не найдена.")
                 return
             await update.message.reply_text(f"✅ Снято {amount:,.0f} ₽")
-            handler = GoalsHandler()
-            await handler.handle_goal_view(update, context, telegram_user, goal_id)
+            await self._goals_handler.handle_goal_view(update, context, telegram_user, goal_id)
         except Exception:
             await update.message.reply_text("❌ Неверная сумма. Пример: 5000 или 499.90")
         finally:
@@ -315,10 +309,21 @@ class TextHandler(BaseHandler):
         """
         Обрабатывает текстовые сообщения
         
+        Ждёт chat_lock, чтобы не пересечься с callback того же чата,
+        который ещё выполняется в фоне.
+        
         Args:
             update: Объект Update
             context: Контекст бота
         """
+        async with self.chat_lock(context):
+            await self._handle_text_message(update, context)
+    
+    async def _handle_text_message(
+        self,
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+    ) -> None:
         try:
             message_text = context.user_data.pop(
                 '_voice_text_override',
@@ -396,7 +401,7 @@ class TextHandler(BaseHandler):
                     if new_amount <= 0:
                         raise ValueError("amount<=0")
 
-                    user = await sync_to_async(lambda: telegram_user.user)()
+                    user = await self.get_user(telegram_user)
                     transaction_service = TransactionService(user)
                     updated = await transaction_service.update_transaction_amount(
                         transaction_id,
@@ -435,7 +440,7 @@ class TextHandler(BaseHandler):
                     except ValueError:
                         new_date = _dt.strptime(text, '%Y-%m-%d').date()
 
-                    user = await sync_to_async(lambda: telegram_user.user)()
+                    user = await self.get_user(telegram_user)
                     transaction_service = TransactionService(user)
                     updated = await transaction_service.update_transaction_date(transaction_id, new_date)
 
@@ -466,7 +471,7 @@ class TextHandler(BaseHandler):
             if context.user_data.get('editing_transaction_comment'):
                 transaction_id = context.user_data.get('editing_transaction_comment')
                 comment_text = message_text.strip()
-                user = await sync_to_async(lambda: telegram_user.user)()
+                user = await self.get_user(telegram_user)
                 transaction_service = TransactionService(user)
                 updated = await transaction_service.update_transaction_description(transaction_id, comment_text)
 
@@ -578,15 +583,15 @@ class TextHandler(BaseHandler):
                 if handled:
                     return
 
-            # Логируем входящее сообщение
-            await self.log_message(
+            # Логируем входящее сообщение (фоном, разбор его не ждёт)
+            self.log_message_in_background(
                 telegram_user,
                 'incoming',
                 message_text,
             )
             
             # Парсим команду
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             parser = await sync_to_async(self.get_parser)(user)
             parsed_command = await sync_to_async(parser.parse)(message_text)
             
@@ -643,7 +648,7 @@ class TextHandler(BaseHandler):
         user_state,
     ) -> None:
         """Завершает amount_only flow: пользователь назвал категорию текстом/голосом."""
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         parser = await sync_to_async(self.get_parser)(user)
         transaction_type = user_state.last_transaction_type or 'expense'
         amount = user_state.current_amount
@@ -942,7 +947,7 @@ class TextHandler(BaseHandler):
             logger.info(f"Нормализованный тип: {normalized_type}")
             
             # Создаем категорию
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category_service = CategoryManagementService(user)
             
             logger.info(f"Создаем категорию для пользователя {user.id}")
@@ -1108,7 +1113,7 @@ class TextHandler(BaseHandler):
             
             logger.info(f"✅ Сумма распарсена: {amount}")
             
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             logger.info(f"✅ Пользователь получен: {user.username}")
             
             # Проверяем, редактируем ли мы существующий бюджет
@@ -1120,21 +1125,20 @@ class TextHandler(BaseHandler):
                 # При редактировании получаем категорию из бюджета
                 try:
                     logger.info(f"🔍 Получаем бюджет с ID: {editing_budget_id}")
-                    budget = await sync_to_async(lambda: Budget.objects.get(
+                    budget = await Budget.objects.select_related('category').aget(
                         id=editing_budget_id,
                         user=user,
                         is_active=True,
-                    ), thread_sensitive=True)()
+                    )
                     logger.info(f"✅ Бюджет найден: {budget}")
-                    category = await sync_to_async(lambda: budget.category)()
-                    category_name = await sync_to_async(lambda: category.name)()
+                    category = budget.category
+                    category_name = category.name
                     logger.info(f"✅ Категория получена: {category_name}")
                     
                     # Обновляем сумму бюджета
-                    budget_amount = await sync_to_async(lambda: budget.amount)()
-                    logger.info(f"🔄 Обновляем сумму с {budget_amount} на {amount}")
-                    await sync_to_async(lambda: setattr(budget, 'amount', amount))()
-                    await sync_to_async(budget.save)()
+                    logger.info(f"🔄 Обновляем сумму с {budget.amount} на {amount}")
+                    budget.amount = amount
+                    await budget.asave()
                     logger.info("✅ Бюджет обновлен успешно")
                     
                     action_text = "обновлен"
@@ -1179,59 +1183,56 @@ class TextHandler(BaseHandler):
                 
                 try:
                     logger.info(f"🔍 Получаем категорию с ID: {category_id}")
-                    category = await sync_to_async(lambda: Category.objects.get(
+                    category = await Category.objects.aget(
                         id=category_id,
                         user=user
-                    ), thread_sensitive=True)()
-                    category_name = await sync_to_async(lambda: category.name)()
+                    )
+                    category_name = category.name
                     logger.info(f"✅ Категория получена: {category_name}")
                     
                     # Проверяем, есть ли уже бюджет для этой категории в текущем месяце
                     logger.info("🔍 Проверяем существующие бюджеты")
-                    today = await sync_to_async(timezone.now, thread_sensitive=True)()
-                    today = today.date()
+                    today = timezone.now().date()
                     logger.info(f"✅ Сегодня: {today}")
                     
-                    # Вычисляем даты через sync_to_async
-                    start_date = await sync_to_async(lambda: datetime(today.year, today.month, 1).date())()
+                    start_date = datetime(today.year, today.month, 1).date()
                     logger.info(f"✅ Дата начала: {start_date}")
                     
                     # Последний день месяца
                     if today.month == 12:
-                        end_date = await sync_to_async(lambda: datetime(today.year + 1, 1, 1).date())()
+                        end_date = datetime(today.year + 1, 1, 1).date()
                     else:
-                        end_date = await sync_to_async(lambda: datetime(today.year, today.month + 1, 1).date())()
-                    end_date = await sync_to_async(lambda: end_date - timedelta(days=1))()
+                        end_date = datetime(today.year, today.month + 1, 1).date()
+                    end_date = end_date - timedelta(days=1)
                     logger.info(f"✅ Дата окончания: {end_date}")
                     
                     # Проверяем существующий бюджет
-                    budget_queryset = await sync_to_async(lambda: Budget.objects.filter(
+                    existing_budget = await Budget.objects.filter(
                         user=user,
                         category=category,
                         start_date=start_date,
                         end_date=end_date,
                         is_active=True
-                    ), thread_sensitive=True)()
-                    existing_budget = await sync_to_async(lambda: budget_queryset.first(), thread_sensitive=True)()
+                    ).afirst()
                     
                     if existing_budget:
                         logger.info("🔄 Найден существующий бюджет: id=%s", existing_budget.id)
                         # Обновляем существующий бюджет
-                        await sync_to_async(lambda: setattr(existing_budget, 'amount', amount))()
-                        await sync_to_async(existing_budget.save, thread_sensitive=True)()
+                        existing_budget.amount = amount
+                        await existing_budget.asave()
                         logger.info("✅ Существующий бюджет обновлен")
                         action_text = "обновлен"
                     else:
                         logger.info("🆕 Создаем новый бюджет")
                         # Создаем новый бюджет
-                        budget = await sync_to_async(lambda: Budget.objects.create(
+                        budget = await Budget.objects.acreate(
                             user=user,
                             category=category,
                             amount=amount,
                             period_type='monthly',
                             start_date=start_date,
                             end_date=end_date
-                        ), thread_sensitive=True)()
+                        )
                         logger.info(f"✅ Новый бюджет создан: {budget}")
                         action_text = "создан"
                     
@@ -1259,8 +1260,8 @@ class TextHandler(BaseHandler):
             
             # Получаем иконку и название категории
             logger.info("🔍 Получаем данные категории для отображения")
-            category_icon = await sync_to_async(lambda: category.icon)()
-            category_name = await sync_to_async(lambda: category.name)()
+            category_icon = category.icon
+            category_name = category.name
             logger.info(f"✅ Данные категории: {category_icon} {category_name}")
             
             # Формируем сообщение в зависимости от типа операции
@@ -1390,7 +1391,7 @@ class TextHandler(BaseHandler):
                 return
             
             # Получаем категорию
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             category_service = CategoryManagementService(user)
             category = await category_service.get_category_by_id(category_id)
             
@@ -1548,7 +1549,7 @@ class TextHandler(BaseHandler):
             return
 
         name, icon = self._parse_category_name_and_icon(text)
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         category_service = CategoryManagementService(user)
 
         category = await category_service.get_category_by_id(category_id)
@@ -1587,24 +1588,16 @@ class TextHandler(BaseHandler):
         keyboard,
     ) -> None:
         """Отправляет или редактирует сообщение"""
-        # Обрабатываем клавиатуру
-        reply_markup = None
-        if keyboard:
-            if hasattr(keyboard, 'inline_keyboard'):
-                # Это уже InlineKeyboardMarkup
-                reply_markup = keyboard
-            else:
-                # Это список кнопок, создаем InlineKeyboardMarkup
-                from telegram import InlineKeyboardMarkup
-                reply_markup = InlineKeyboardMarkup(keyboard)
+        if isinstance(keyboard, list):
+            keyboard = InlineKeyboardMarkup(keyboard) if keyboard else None
         
         try:
             # Для текстовых сообщений всегда отправляем новое сообщение
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=message,
-                reply_markup=reply_markup,
-                parse_mode='Markdown',
+                reply_markup=keyboard,
+                parse_mode=ParseMode.MARKDOWN,
             )
         except Exception as e:
             logger.error(f"❌ Ошибка при отправке сообщения: {e}")
@@ -1612,5 +1605,5 @@ class TextHandler(BaseHandler):
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=message,
-                reply_markup=reply_markup,
+                reply_markup=keyboard,
             ) 
\ No newline at end of file
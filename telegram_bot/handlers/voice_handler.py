@@ -101,7 +101,7 @@ class VoiceHandler(BaseHandler):
                 context.bot,
                 incoming,
             )
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self.get_user(telegram_user)
             whisper_hint = await sync_to_async(build_user_whisper_prompt)(user)
 
             with timed_ms() as transcribe_timing:
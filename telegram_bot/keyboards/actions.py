@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from telegram import (
     InlineKeyboardButton,
@@ -116,9 +117,10 @@ class ActionKeyboard:
         return InlineKeyboardMarkup(buttons)
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_main_menu_keyboard() -> InlineKeyboardMarkup:
         """
-        Создает главное меню бота
+        Создает главное меню бота (статическое, создается один раз)
         
         Returns:
             InlineKeyboardMarkup с главным меню
@@ -6,6 +6,7 @@ from telegram import (
 )
 from asgiref.sync import sync_to_async
 
+from telegram_bot.keyboards.navigation import MAIN_MENU_BUTTON
 from telegram_bot.models import TelegramUser
 from categories.models import Category
 
@@ -58,11 +59,7 @@ class CategoryKeyboard:
         buttons.append([switch_button])
         
         # Кнопка "Главное меню"
-        main_menu_button = InlineKeyboardButton(
-            text="🏠 Главное меню",
-            callback_data="main_menu",
-        )
-        buttons.append([main_menu_button])
+        buttons.append([MAIN_MENU_BUTTON])
         
         return InlineKeyboardMarkup(buttons)
     
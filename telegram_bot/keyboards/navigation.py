@@ -1,31 +1,42 @@
+from functools import lru_cache
 from typing import Optional
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
+# Кнопки и клавиатуры PTB неизменяемые, поэтому статические экземпляры
+# во всём боте создаются один раз (при импорте или через lru_cache) и
+# переиспользуются всеми ответами. MAIN_MENU_BUTTON — общий для всех клавиатур.
+MAIN_MENU_BUTTON = InlineKeyboardButton(
+    text="🏠 Главное меню",
+    callback_data="main_menu",
+)
 
-def get_navigation_buttons(back_callback: Optional[str] = None) -> list[list[InlineKeyboardButton]]:
-    buttons = []
+
+@lru_cache(maxsize=64)
+def _navigation_rows(
+    back_callback: Optional[str],
+) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    # Ряды для каждого back_callback создаются один раз
+    rows = []
     if back_callback:
-        buttons.append([
+        rows.append((
             InlineKeyboardButton(
                 text="🔙 Назад",
                 callback_data=back_callback,
             ),
-        ])
-    buttons.append([
-        InlineKeyboardButton(
-            text="🏠 Главное меню",
-            callback_data="main_menu",
-        ),
-    ])
-    return buttons
+        ))
+    rows.append((MAIN_MENU_BUTTON,))
+    return tuple(rows)
+
+
+def get_navigation_buttons(back_callback: Optional[str] = None) -> list[list[InlineKeyboardButton]]:
+    return [list(row) for row in _navigation_rows(back_callback)]
 
 
 def attach_persistent_navigation(
     keyboard: InlineKeyboardMarkup,
     back_callback: Optional[str] = None,
 ) -> InlineKeyboardMarkup:
-    buttons = [row[:] for row in keyboard.inline_keyboard]
-    buttons.extend(get_navigation_buttons(back_callback))
-    return InlineKeyboardMarkup(buttons)
-
+    return InlineKeyboardMarkup(
+        keyboard.inline_keyboard + _navigation_rows(back_callback),
+    )
@@ -1,5 +1,9 @@
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from telegram_bot.keyboards.navigation import MAIN_MENU_BUTTON
 
 
 class ReportKeyboard:
@@ -13,6 +17,9 @@ class ReportKeyboard:
         """
         Клавиатура навигации по отчетам
         
+        Кнопки зависят только от текущего периода и его соседей, поэтому
+        готовая клавиатура берется из кэша по (период, предыдущий, следующий).
+        
         Args:
             current_period: Текущий период {'year': int, 'month': int}
             available_periods: Доступные периоды
@@ -20,84 +27,31 @@ class ReportKeyboard:
         Returns:
             InlineKeyboardMarkup с кнопками навигации
         """
-        keyboard = []
+        year = current_period['year']
+        month = current_period['month']
         
         # Находим индекс текущего периода
         current_index = -1
         for i, period in enumerate(available_periods):
-            if (period['year'] == current_period['year'] and 
-                period['month'] == current_period['month']):
+            if period['year'] == year and period['month'] == month:
                 current_index = i
                 break
         
-        # Кнопки навигации
-        nav_buttons = []
-        
-        # Кнопка "Назад"
+        prev_period = None
         if current_index > 0:
-            prev_period = available_periods[current_index - 1]
-            nav_buttons.append(
-                InlineKeyboardButton(
-                    text="⬅️ Назад",
-                    callback_data=f"report_prev_{prev_period['year']}_{prev_period['month']}"
-                )
-            )
-        else:
-            nav_buttons.append(
-                InlineKeyboardButton(
-                    text="⬅️ Назад",
-                    callback_data="report_disabled"
-                )
-            )
-        
-        # Кнопка "Вперед"
+            period = available_periods[current_index - 1]
+            prev_period = (period['year'], period['month'])
+        next_period = None
         if current_index < len(available_periods) - 1:
-            next_period = available_periods[current_index + 1]
-            nav_buttons.append(
-                InlineKeyboardButton(
-                    text="Вперед ➡️",
-                    callback_data=f"report_next_{next_period['year']}_{next_period['month']}"
-                )
-            )
-        else:
-            nav_buttons.append(
-                InlineKeyboardButton(
-                    text="Вперед ➡️",
-                    callback_data="report_disabled"
-                )
-            )
-        
-        keyboard.append(nav_buttons)
+            period = available_periods[current_index + 1]
+            next_period = (period['year'], period['month'])
         
-        # Действия для текущего периода
-        keyboard.append(
-            [
-                InlineKeyboardButton(
-                    text="📥 Excel",
-                    callback_data=f"report_export_excel_{current_period['year']}_{current_period['month']}",
-                ),
-                InlineKeyboardButton(
-                    text="📋 К отчетам",
-                    callback_data="show_report",
-                ),
-            ]
-        )
-
-        # Кнопка "Главное меню"
-        keyboard.append(
-            [
-                InlineKeyboardButton(
-                    text="🏠 Главное меню",
-                    callback_data="main_menu",
-                )
-            ]
-        )
-        
-        return InlineKeyboardMarkup(keyboard)
+        return _navigation_keyboard(year, month, prev_period, next_period)
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_report_main_keyboard() -> InlineKeyboardMarkup:
-        """Главная клавиатура отчетов"""
+        """Главная клавиатура отчетов (статическая, создается один раз)"""
         keyboard = [
             [
                 InlineKeyboardButton(
@@ -117,12 +71,54 @@ class ReportKeyboard:
                     callback_data="report_all"
                 )
             ],
+            [MAIN_MENU_BUTTON],
+        ]
+        
+        return InlineKeyboardMarkup(keyboard) 
+
+
+@lru_cache(maxsize=256)
+def _navigation_keyboard(
+    year: int,
+    month: int,
+    prev_period: Optional[Tuple[int, int]],
+    next_period: Optional[Tuple[int, int]],
+) -> InlineKeyboardMarkup:
+    """Собирает клавиатуру навигации"""
+    # Кнопки "Назад" / "Вперед"; на краях — неактивные
+    nav_buttons = [
+        InlineKeyboardButton(
+            text="⬅️ Назад",
+            callback_data=(
+                f"report_prev_{prev_period[0]}_{prev_period[1]}"
+                if prev_period is not None
+                else "report_disabled"
+            ),
+        ),
+        InlineKeyboardButton(
+            text="Вперед ➡️",
+            callback_data=(
+                f"report_next_{next_period[0]}_{next_period[1]}"
+                if next_period is not None
+                else "report_disabled"
+            ),
+        ),
+    ]
+    
+    return InlineKeyboardMarkup(
+        [
+            nav_buttons,
+            # Действия для текущего периода
             [
                 InlineKeyboardButton(
-                    text="🏠 Главное меню",
-                    callback_data="main_menu"
-                )
-            ]
+                    text="📥 Excel",
+                    callback_data=f"report_export_excel_{year}_{month}",
+                ),
+                InlineKeyboardButton(
+                    text="📋 К отчетам",
+                    callback_data="show_report",
+                ),
+            ],
+            [MAIN_MENU_BUTTON],
         ]
-        
-        return InlineKeyboardMarkup(keyboard) 
\ No newline at end of file
+    )
@@ -3,7 +3,10 @@ import asyncio
 import os
 from django.core.management.base import BaseCommand
 from django.conf import settings
-from telegram import BotCommand
+from telegram import (
+    BotCommand,
+    Update,
+)
 from telegram.request import HTTPXRequest
 from telegram.ext import (
     Application,
@@ -18,6 +21,7 @@ from telegram_bot.handlers.voice_handler import VoiceHandler
 from telegram_bot.handlers.callback_handler import CallbackHandler
 from telegram_bot.handlers.command_handler import CommandHandler as BotCommandHandler
 from telegram_bot.utils.admin_alerts import notify_admins_about_exception
+from telegram_bot.utils.rate_limiter import TelegramRateLimiter
 from telegram_bot.utils.telegram_resilience import retry_telegram_call
 
 logger = logging.getLogger(__name__)
@@ -32,6 +36,29 @@ def _env_int(name: str, default: int) -> int:
         return default
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    return raw in ("1", "true", "yes", "on")
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Создаёт event loop для бота: uvloop (libuv), если он установлен и не
+    отключён через TELEGRAM_USE_UVLOOP, иначе стандартный asyncio.
+    """
+    if _env_bool("TELEGRAM_USE_UVLOOP", True):
+        try:
+            import uvloop
+        except ImportError:
+            logger.info("uvloop is not installed, using default asyncio loop")
+        else:
+            logger.info("Using uvloop event loop")
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
 def _get_proxy_url() -> str | None:
     raw = os.getenv("TELEGRAM_PROXY_URL", "").strip()
     return raw or None
@@ -105,7 +132,7 @@ class Command(BaseCommand):
         # Запускаем бота
         try:
             # Используем новый event loop для избежания конфликтов
-            loop = asyncio.new_event_loop()
+            loop = _new_event_loop()
             asyncio.set_event_loop(loop)
             loop.run_until_complete(self._run_bot(token))
         except KeyboardInterrupt:
@@ -151,13 +178,21 @@ class Command(BaseCommand):
             )
 
             # Создаем приложение
-            application = (
+            builder = (
                 Application.builder()
                 .token(token)
                 .request(request)
                 .get_updates_request(get_updates_request)
-                .build()
             )
+            if _env_bool("TELEGRAM_RATE_LIMIT", True):
+                # Все исходящие send/edit идут через token bucket:
+                # общий лимит бота + лимит на чат, повтор на RetryAfter
+                builder = builder.rate_limiter(
+                    TelegramRateLimiter(
+                        overall_rate=_env_int("TELEGRAM_RATE_LIMIT_PER_SECOND", 25),
+                    )
+                )
+            application = builder.build()
             
             # Создаем обработчики
             text_handler = TextHandler()
@@ -200,10 +235,13 @@ class Command(BaseCommand):
                 )
             )
             
-            # Регистрируем обработчик callback запросов
+            # Регистрируем обработчик callback запросов.
+            # block=False: callback выполняется отдельной задачей и не
+            # задерживает апдейты других чатов (порядок в чате — chat_lock).
             application.add_handler(
                 CallbackQueryHandler(
                     callback_handler.handle_callback_query,
+                    block=False,
                 )
             )
             
@@ -250,19 +288,26 @@ class Command(BaseCommand):
             # Инициализируем и запускаем приложение
             await application.initialize()
             await application.start()
+            # Long polling: getUpdates висит на сервере до timeout секунд,
+            # следующий запрос уходит сразу (poll_interval=0). allowed_updates —
+            # только типы апдейтов, на которые есть обработчики.
             await application.updater.start_polling(
+                poll_interval=0.0,
                 timeout=_env_int("TELEGRAM_POLLING_TIMEOUT", 30),
+                bootstrap_retries=-1,
+                allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY],
             )
             
             # Ждем остановки
             try:
-                # Просто ждем бесконечно
-                while True:
-                    await asyncio.sleep(1)
+                # Ждем бесконечно, без периодических пробуждений
+                await asyncio.Event().wait()
             except KeyboardInterrupt:
                 pass
             finally:
                 await application.stop()
+                # Дописываем BotMessage, которые обработчики отправили фоном
+                await BotCommandHandler.wait_background_tasks()
                 await application.shutdown()
             
         except Exception as e:
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("telegram_bot", "0004_seed_bottexts"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="botmessage",
+            index=models.Index(
+                fields=["telegram_user", "-created_at"],
+                name="botmsg_tgu_created_desc",
+            ),
+        ),
+    ]
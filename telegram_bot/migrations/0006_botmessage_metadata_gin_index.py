@@ -0,0 +1,25 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+from core.operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции.
+    atomic = False
+
+    dependencies = [
+        ("telegram_bot", "0005_botmessage_tgu_created_desc_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="botmessage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["metadata"],
+                name="botmsg_metadata_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
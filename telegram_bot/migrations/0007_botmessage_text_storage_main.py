@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from core.operations import AlterColumnStorageIfPostgres
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("telegram_bot", "0006_botmessage_metadata_gin_index"),
+    ]
+
+    operations = [
+        # text обрезается до 1000 символов в BaseHandler.log_message:
+        # держим его в строке таблицы, без отдельного чтения из TOAST.
+        AlterColumnStorageIfPostgres(
+            model_name="botmessage",
+            name="text",
+            storage="MAIN",
+        ),
+    ]
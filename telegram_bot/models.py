@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
 from core.models import TimestampedModel
 
 
@@ -129,6 +130,26 @@ class BotMessage(TimestampedModel):
         verbose_name = "Сообщение бота"
         verbose_name_plural = "Сообщения бота"
         ordering = ['-created_at']
+        indexes = [
+            # Админка фильтрует по пользователю и сортирует по дате (DESC).
+            models.Index(
+                fields=[
+                    'telegram_user',
+                    '-created_at',
+                ],
+                name='botmsg_tgu_created_desc',
+            ),
+            # Поиск по metadata через `metadata__contains` (jsonb @>).
+            GinIndex(
+                fields=[
+                    'metadata',
+                ],
+                name='botmsg_metadata_gin',
+                opclasses=[
+                    'jsonb_path_ops',
+                ],
+            ),
+        ]
 
 
 class BotText(TimestampedModel):
@@ -562,21 +562,18 @@ class AdvisorSnapshotService:
                 user=self.user,
                 is_active=True,
                 start_date=start,
-            ).select_related('category'),
+            ).select_related('category').with_stats(),
         )
         rows: list[dict[str, Any]] = []
+        # Потраченное уже в аннотации with_stats(): свойства не ходят в БД
         for budget in budgets:
-            spent = await sync_to_async(lambda b: b.spent_amount)(budget)
-            remaining = await sync_to_async(lambda b: b.remaining_amount)(budget)
-            pct = await sync_to_async(lambda b: b.spent_percentage)(budget)
-            overspent = await sync_to_async(lambda b: b.is_overspent)(budget)
             rows.append({
                 'category': budget.category.name,
                 'limit': _money(budget.amount),
-                'spent': _money(spent),
-                'remaining': _money(remaining),
-                'spent_percent': float(pct),
-                'overspent': bool(overspent),
+                'spent': _money(budget.spent_amount),
+                'remaining': _money(budget.remaining_amount),
+                'spent_percent': float(budget.spent_percentage),
+                'overspent': bool(budget.is_overspent),
             })
         rows.sort(key=lambda r: r['spent_percent'], reverse=True)
         return rows
@@ -1,13 +1,29 @@
 import logging
 from typing import List, Optional, Dict
 from django.contrib.auth.models import User
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
 from asgiref.sync import sync_to_async
 
+from budgets.models import Budget
 from categories.models import Category
+from telegram_bot.utils.ttl_cache import TTLCache
 from transactions.models import Transaction
 
 logger = logging.getLogger(__name__)
 
+# Категории пользователя для экранов настроек (список, лимиты): кнопки
+# листаются часто, а категории меняются редко.
+CATEGORIES_CACHE_TTL_SECONDS = 60
+_CATEGORIES_CACHE = TTLCache(maxsize=1024, ttl=CATEGORIES_CACHE_TTL_SECONDS)
+
+_AVAILABLE_ICONS = (
+    "💰", "💸", "🏠", "🚗", "🍔", "🎉", "📱", "💻", "🎓", "💊",
+    "🏃", "🎁", "👕", "🚌", "⛽", "☕", "🎨", "🧠", "🍽️", "🏍️",
+    "👩‍🦰", "✍️", "🍰", "🏥", "💪", "💵", "🔒", "🍀", "🥕", "🚽",
+    "⚓", "✈️", "🐿️", "🐙", "🥰", "🥋", "🛵", "🍽️", "🍰", "💪",
+)
+
 
 class CategoryManagementService:
     """Сервис для управления категориями"""
@@ -15,11 +31,28 @@ class CategoryManagementService:
     def __init__(self, user: User):
         self.user = user
     
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Сбрасывает кэш категорий пользователя."""
+        _CATEGORIES_CACHE.pop(user_id, None)
+    
     async def get_user_categories(self) -> List[Category]:
-        """Получает все категории пользователя"""
-        return await sync_to_async(list)(
-            Category.objects.filter(user=self.user).order_by('type', 'name')
-        )
+        """
+        Получает все категории пользователя (кэш на CATEGORIES_CACHE_TTL_SECONDS)
+        
+        Экземпляры общие для всех вызовов — только для чтения; для правок
+        загружайте категорию через get_category_by_id.
+        """
+        categories = _CATEGORIES_CACHE.get(self.user.id)
+        if categories is None:
+            categories = [
+                category
+                async for category in Category.objects.filter(
+                    user=self.user,
+                ).order_by('type', 'name')
+            ]
+            _CATEGORIES_CACHE.set(self.user.id, categories)
+        return list(categories)
     
     async def get_category_by_id(self, category_id: int) -> Optional[Category]:
         """Получает категорию по ID"""
@@ -95,7 +128,7 @@ class CategoryManagementService:
             return category
             
         except Category.DoesNotExist:
-            logger.warning(f"Категория {category_id} не найдена")
+            logger.warning("Категория %s не найдена", category_id)
             return None
     
     async def delete_category(self, category_id: int) -> bool:
@@ -121,17 +154,33 @@ class CategoryManagementService:
             # Удаляем категорию
             await sync_to_async(category.delete)()
             
-            logger.info(f"Удалена категория: {category.name}")
+            logger.info("Удалена категория: %s", category.name)
             return True
             
         except Category.DoesNotExist:
-            logger.warning(f"Категория {category_id} не найдена")
+            logger.warning("Категория %s не найдена", category_id)
             return False
     
     async def get_category_stats(self, category_id: int) -> Optional[Dict]:
-        """Получает статистику по категории"""
+        """
+        Получает статистику по категории
+        
+        has_budget — есть ли активный лимит на сегодня (только для расходов);
+        считается через Exists в том же запросе, что и сама категория.
+        """
+        today = timezone.now().date()
         try:
-            category = await Category.objects.aget(
+            category = await Category.objects.annotate(
+                current_budget_exists=Exists(
+                    Budget.objects.filter(
+                        user=OuterRef('user'),
+                        category=OuterRef('pk'),
+                        start_date__lte=today,
+                        end_date__gte=today,
+                        is_active=True,
+                    )
+                ),
+            ).aget(
                 id=category_id,
                 user=self.user,
             )
@@ -155,6 +204,7 @@ class CategoryManagementService:
                 'total_amount': total_amount,
                 'transaction_count': transaction_count,
                 'last_transaction': transactions[0] if transactions else None,
+                'has_budget': category.type == 'expense' and category.current_budget_exists,
             }
             
         except Category.DoesNotExist:
@@ -162,9 +212,4 @@ class CategoryManagementService:
     
     async def get_available_icons(self) -> List[str]:
         """Возвращает список доступных иконок"""
-        return [
-            "💰", "💸", "🏠", "🚗", "🍔", "🎉", "📱", "💻", "🎓", "💊",
-            "🏃", "🎁", "👕", "🚌", "⛽", "☕", "🎨", "🧠", "🍽️", "🏍️",
-            "👩‍🦰", "✍️", "🍰", "🏥", "💪", "💵", "🔒", "🍀", "🥕", "🚽",
-            "⚓", "✈️", "🐿️", "🐙", "🥰", "🥋", "🛵", "🍽️", "🍰", "💪",
-        ] 
\ No newline at end of file
+        return list(_AVAILABLE_ICONS)
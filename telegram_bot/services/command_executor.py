@@ -9,6 +9,7 @@ from asgiref.sync import sync_to_async
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes
 
+from telegram_bot.handlers.base import BaseHandler
 from telegram_bot.keyboards.actions import ActionKeyboard
 from telegram_bot.keyboards.categories import CategoryKeyboard
 from telegram_bot.services.transaction_service import TransactionService
@@ -27,6 +28,14 @@ VOICE_GOAL_PENDING_KEY = 'voice_goal_pending'
 
 
 class CommandExecutor:
+    def __init__(self) -> None:
+        # Нужен ради get_user / get_user_state: один экземпляр на исполнителя
+        self._base_handler = BaseHandler()
+
+    async def get_user(self, telegram_user):
+        """Django User без похода в пул потоков (см. BaseHandler.get_user)."""
+        return await self._base_handler.get_user(telegram_user)
+
     async def execute_create_transaction(
         self,
         update: Update,
@@ -119,7 +128,7 @@ class CommandExecutor:
             )
             return
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         existing = await find_current_month_budget_async(user, command.category)
         if existing and not skip_update_confirm:
             await self.prompt_budget_update_confirmation(
@@ -297,7 +306,7 @@ class CommandExecutor:
             )
             return
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         try:
             if action == GOAL_ACTION_CREATE:
                 title = (command.goal_title or '').strip()
@@ -366,7 +375,7 @@ class CommandExecutor:
     ) -> None:
         from telegram_bot.voice.goal_resolver import GoalResolver, ResolveStatus
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         query_name = command.goal_title or ''
         resolved = await sync_to_async(GoalResolver(user).resolve)(query_name)
 
@@ -439,7 +448,7 @@ class CommandExecutor:
             return
 
         command: ParsedVoiceCommand = pending['command']
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         try:
             goal = await Goal.objects.aget(id=goal_id, user=user)
         except Goal.DoesNotExist:
@@ -533,7 +542,7 @@ class CommandExecutor:
             chat_id=update.effective_chat.id,
             text='🤔 Смотрю ваши цифры…',
         )
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         try:
             from telegram_bot.services.voice_advisor_executor import (
                 answer_advisor_query,
@@ -643,7 +652,7 @@ class CommandExecutor:
             ResolveStatus,
         )
 
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         transaction_type = command.transaction_type or 'expense'
         if command.intent == VoiceIntentType.SET_BUDGET:
             transaction_type = 'expense'
@@ -659,10 +668,7 @@ class CommandExecutor:
             'command': command,
         }
         # Keep amount ready for create-category / full-list flows.
-        from telegram_bot.handlers.base import BaseHandler
-
-        base = BaseHandler()
-        user_state = await base.get_user_state(telegram_user)
+        user_state = await self._base_handler.get_user_state(telegram_user)
         user_state.current_amount = command.amount
         user_state.awaiting_category = True
         user_state.last_transaction_type = transaction_type
@@ -752,7 +758,7 @@ class CommandExecutor:
             return
 
         command: ParsedVoiceCommand = pending['command']
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         try:
             category = await Category.objects.aget(id=category_id, user=user)
         except Category.DoesNotExist:
@@ -764,10 +770,7 @@ class CommandExecutor:
         command.transaction_type = category.type
         command.command_type = 'amount_category'
 
-        from telegram_bot.handlers.base import BaseHandler
-
-        base = BaseHandler()
-        user_state = await base.get_user_state(telegram_user)
+        user_state = await self._base_handler.get_user_state(telegram_user)
         user_state.awaiting_category = False
         user_state.current_amount = None
         await user_state.asave()
@@ -827,10 +830,7 @@ class CommandExecutor:
             transaction_type = 'expense'
         suggested = (command.category_name or '').strip()
 
-        from telegram_bot.handlers.base import BaseHandler
-
-        base = BaseHandler()
-        user_state = await base.get_user_state(telegram_user)
+        user_state = await self._base_handler.get_user_state(telegram_user)
         user_state.awaiting_category_creation = True
         user_state.awaiting_category = True
         user_state.current_amount = command.amount
@@ -871,7 +871,7 @@ class CommandExecutor:
         *,
         voice_transcript: str | None = None,
     ) -> None:
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self.get_user(telegram_user)
         transaction_service = TransactionService(user)
 
         if parsed_command.get('category'):
@@ -882,10 +882,7 @@ class CommandExecutor:
                     transaction_type=parsed_command['transaction_type'],
                     description=parsed_command.get('description') or '',
                 )
-                from telegram_bot.handlers.base import BaseHandler
-
-                base = BaseHandler()
-                user_state = await base.get_user_state(telegram_user)
+                user_state = await self._base_handler.get_user_state(telegram_user)
                 user_state.last_transaction_type = parsed_command['transaction_type']
                 await user_state.asave()
 
@@ -927,10 +924,7 @@ class CommandExecutor:
         *,
         voice_transcript: str | None = None,
     ) -> None:
-        from telegram_bot.handlers.base import BaseHandler
-
-        base = BaseHandler()
-        user_state = await base.get_user_state(telegram_user)
+        user_state = await self._base_handler.get_user_state(telegram_user)
         transaction_type = (
             parsed_command.get('transaction_type')
             or user_state.last_transaction_type
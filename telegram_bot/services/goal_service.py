@@ -118,6 +118,31 @@ class GoalService:
             .order_by('-occurred_at', '-id')[:limit]
         )
 
+    async def get_history_view(
+        self,
+        goal_id: int,
+        limit: int = 15,
+    ) -> Optional[Goal]:
+        """
+        Цель пользователя с последними операциями в `goal.recent_entries`
+        (новые сверху) или None, если цели нет.
+
+        Оба запроса (цель + prefetch записей) идут за один переход в
+        sync-поток; записи запрашиваются только для найденной цели.
+        """
+        return await sync_to_async(
+            Goal.objects.filter(id=goal_id, user=self.user)
+            .prefetch_related(
+                models.Prefetch(
+                    'entries',
+                    queryset=GoalLedgerEntry.objects.order_by('-occurred_at', '-id')[:limit],
+                    to_attr='recent_entries',
+                )
+            )
+            .first,
+            thread_sensitive=True,
+        )()
+
     # --- Monthly metrics ---
     @staticmethod
     def _month_range(target: date) -> tuple[date, date]:
@@ -301,7 +326,7 @@ class GoalService:
                 is_active=True,
                 period_type=Budget.MONTHLY,
                 start_date__in=months_list,
-            ).select_related('category')
+            ).select_related('category').with_stats()
         )
 
         by_category: dict[int, list[Budget]] = {}
@@ -324,7 +349,8 @@ class GoalService:
             budget_amounts: list[Decimal] = []
             for m in months_list:
                 b = items_by_start[m]
-                spent = await sync_to_async(lambda bb: bb.spent_amount)(b)
+                # spent_amount — из аннотации with_stats(), без запроса
+                spent = b.spent_amount
                 budget_amount = Decimal(b.amount)
                 budget_amounts.append(budget_amount)
                 underuse = max(Decimal('0'), budget_amount - Decimal(spent))
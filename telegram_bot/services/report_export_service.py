@@ -1,5 +1,6 @@
-import io
 import logging
+import os
+import tempfile
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, datetime
@@ -22,8 +23,21 @@ logger = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class ExcelExportResult:
+    """
+    Готовый Excel-файл на диске.
+
+    Файл временный: после отправки вызывающий код удаляет его через
+    `cleanup()`.
+    """
+
     filename: str
-    content: bytes
+    path: str
+
+    def cleanup(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
 
 
 class ReportExportService:
@@ -51,20 +65,28 @@ class ReportExportService:
         report_title = f"FinHub — отчет за {month:02d}.{year}"
         filename = f"finhub_report_{year}-{month:02d}.xlsx"
 
-        content = self._render_excel(
-            report_title=report_title,
-            start_date=start_date,
-            end_date=end_date,
-            transactions=transactions,
-            goals=goals,
-            goal_balances=goal_balances,
-            goal_entries=goal_entries,
-        )
+        # Книга пишется сразу во временный файл (без копии в памяти), а сам
+        # рендеринг идёт в отдельном потоке и не блокирует event loop.
+        # Данные уже загружены целиком (select_related), к БД он не ходит.
+        fd, path = tempfile.mkstemp(prefix="finhub_report_", suffix=".xlsx")
+        os.close(fd)
+        result = ExcelExportResult(filename=filename, path=path)
+        try:
+            await sync_to_async(self._render_excel, thread_sensitive=False)(
+                path=path,
+                report_title=report_title,
+                start_date=start_date,
+                end_date=end_date,
+                transactions=transactions,
+                goals=goals,
+                goal_balances=goal_balances,
+                goal_entries=goal_entries,
+            )
+        except BaseException:
+            result.cleanup()
+            raise
 
-        return ExcelExportResult(
-            filename=filename,
-            content=content,
-        )
+        return result
 
     @staticmethod
     def _month_range(year: int, month: int) -> tuple[date, date]:
@@ -128,6 +150,7 @@ class ReportExportService:
 
     def _render_excel(
         self,
+        path: str,
         report_title: str,
         start_date: date,
         end_date: date,
@@ -135,7 +158,7 @@ class ReportExportService:
         goals: list[Goal],
         goal_balances: dict[int, Decimal],
         goal_entries: list[GoalLedgerEntry],
-    ) -> bytes:
+    ) -> None:
         try:
             import xlsxwriter
         except Exception as exc:  # pragma: no cover
@@ -143,8 +166,7 @@ class ReportExportService:
                 "xlsxwriter не установлен. Добавьте зависимость 'xlsxwriter' в проект."
             ) from exc
 
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+        workbook = xlsxwriter.Workbook(path)
 
         fmt_title = workbook.add_format(
             {
@@ -497,6 +519,4 @@ class ReportExportService:
             ws_tx.write_number(idx, 5, int(row["id"]))
 
         workbook.close()
-        output.seek(0)
-        return output.read()
 
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from decimal import Decimal
 from datetime import date, datetime
 from typing import Dict, List, Optional
@@ -52,6 +53,7 @@ class ReportService:
             stat['expense'] for stat in category_stats.values()
         )
         balance = total_income - total_expenses
+        income_rows, expense_rows = self._build_category_rows(category_stats)
         
         return {
             'year': year,
@@ -60,6 +62,8 @@ class ReportService:
             'total_expenses': total_expenses,
             'balance': balance,
             'categories': category_stats,
+            'income_rows': income_rows,
+            'expense_rows': expense_rows,
             'period_name': self._get_period_name(year, month),
         }
     
@@ -103,17 +107,14 @@ class ReportService:
         
         stats = {}
         
+        # category_id — обычное поле модели, читается без запроса к БД;
+        # группируем транзакции за один проход
+        transactions_by_category = defaultdict(list)
+        for transaction in transactions:
+            transactions_by_category[transaction.category_id].append(transaction)
+        
         for category in categories:
-            # Фильтруем транзакции для категории
-            category_transactions = []
-            for transaction in transactions:
-                # Безопасно получаем category_id
-                transaction_category_id = await sync_to_async(
-                    lambda t: t.category_id
-                )(transaction)
-                
-                if transaction_category_id == category.id:
-                    category_transactions.append(transaction)
+            category_transactions = transactions_by_category.get(category.id, [])
             
             # Рассчитываем статистику
             income = sum(
@@ -147,6 +148,28 @@ class ReportService:
         
         return stats
     
+    @staticmethod
+    def _build_category_rows(
+        category_stats: Dict[str, Dict],
+    ) -> tuple[list[tuple], list[tuple]]:
+        """
+        Строки категорий для отображения, отсортированные по названию
+        
+        Returns:
+            (income_rows, expense_rows) — списки кортежей
+            (icon, name, amount, balance)
+        """
+        income_rows = []
+        expense_rows = []
+        for name in sorted(category_stats):
+            stats = category_stats[name]
+            category = stats['category']
+            if category.type == 'income':
+                income_rows.append((category.icon, name, stats['income'], stats['balance']))
+            else:
+                expense_rows.append((category.icon, name, stats['expense'], stats['balance']))
+        return income_rows, expense_rows
+    
     def _get_period_name(self, year: int, month: int) -> str:
         """Получает название периода"""
         month_names = [
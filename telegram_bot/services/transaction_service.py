@@ -4,15 +4,25 @@ from datetime import date
 from typing import Optional
 from django.contrib.auth.models import User
 from django.db import models
+from django.db import transaction as db_transaction
+from django.utils import timezone
 from asgiref.sync import sync_to_async
 
 from transactions.models import Transaction
 from categories.models import Category
 from budgets.models import Budget
+from telegram_bot.models import UserState
 
 logger = logging.getLogger(__name__)
 
 
+def _signed_amount(amount: Decimal, transaction_type: str) -> Decimal:
+    """Расход хранится с минусом, доход — с плюсом."""
+    if transaction_type == 'expense':
+        return -abs(amount)
+    return abs(amount)
+
+
 class TransactionService:
     """Сервис для работы с транзакциями через Telegram бот"""
     
@@ -44,10 +54,7 @@ class TransactionService:
             transaction_date = date.today()
         
         # Корректируем знак суммы в зависимости от типа
-        if transaction_type == 'expense':
-            amount = -abs(amount)
-        else:
-            amount = abs(amount)
+        amount = _signed_amount(amount, transaction_type)
         
         transaction = await Transaction.objects.acreate(
             user=self.user,
@@ -64,6 +71,57 @@ class TransactionService:
         
         return transaction
     
+    async def create_transaction_from_state(
+        self,
+        user_state,
+        category: Category,
+    ) -> Transaction:
+        """
+        Создает транзакцию на сумму из UserState и сбрасывает ожидание
+        категории — одной DB-транзакцией (INSERT + UPDATE, один поток).
+        
+        Args:
+            user_state: UserState с current_amount
+            category: Выбранная категория (её тип задаёт знак суммы)
+            
+        Returns:
+            Созданная транзакция
+        """
+        transaction = await sync_to_async(
+            self._create_transaction_from_state,
+            thread_sensitive=True,
+        )(user_state, category)
+        
+        logger.info(
+            f"Создана транзакция: {transaction.amount}₽ "
+            f"в категории {category.name} для пользователя {self.user.id}"
+        )
+        
+        return transaction
+    
+    def _create_transaction_from_state(self, user_state, category: Category) -> Transaction:
+        with db_transaction.atomic():
+            transaction = Transaction.objects.create(
+                user=self.user,
+                category=category,
+                amount=_signed_amount(user_state.current_amount, category.type),
+                date=date.today(),
+                description="",
+            )
+            # UPDATE без предварительного SELECT; updated_at — вручную,
+            # т.к. update() не трогает auto_now
+            UserState.objects.filter(pk=user_state.pk).update(
+                last_transaction_type=category.type,
+                current_amount=None,
+                awaiting_category=False,
+                updated_at=timezone.now(),
+            )
+        
+        user_state.last_transaction_type = category.type
+        user_state.current_amount = None
+        user_state.awaiting_category = False
+        return transaction
+    
     async def update_transaction_date(
         self,
         transaction_id: int,
@@ -182,30 +240,16 @@ class TransactionService:
         Returns:
             Словарь со статистикой
         """
-        today = date.today()
-        
-        # Используем sync ORM в отдельном потоке через sync_to_async
-        expenses_qs = Transaction.objects.filter(
-            user=self.user,
-            date=today,
-            amount__lt=0,
-        )
-        
-        income_qs = Transaction.objects.filter(
+        # Расходы и доходы — одним запросом через агрегаты с filter
+        totals = await Transaction.objects.filter(
             user=self.user,
-            date=today,
-            amount__gt=0,
+            date=date.today(),
+        ).aaggregate(
+            expenses=models.Sum('amount', filter=models.Q(amount__lt=0)),
+            income=models.Sum('amount', filter=models.Q(amount__gt=0)),
         )
-        
-        # Агрегируем суммы в thread-sensitive контексте
-        expenses_total = await sync_to_async(
-            lambda: expenses_qs.aggregate(total=models.Sum('amount'))['total'] or Decimal('0'),
-            thread_sensitive=True,
-        )()
-        income_total = await sync_to_async(
-            lambda: income_qs.aggregate(total=models.Sum('amount'))['total'] or Decimal('0'),
-            thread_sensitive=True,
-        )()
+        expenses_total = totals['expenses'] or Decimal('0')
+        income_total = totals['income'] or Decimal('0')
         
         return {
             'expenses': abs(expenses_total),
@@ -0,0 +1,73 @@
+"""
+Сброс in-process кэшей бота при изменении данных пользователя.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+)
+from django.dispatch import receiver
+
+from budgets.models import Budget
+from categories.models import Category
+from telegram_bot.models import (
+    BotText,
+    TelegramUser,
+    UserAlias,
+)
+from telegram_bot.services.category_management_service import CategoryManagementService
+from telegram_bot.utils.screen_caches import (
+    invalidate_bot_texts,
+    invalidate_budget_screens,
+    invalidate_report_screens,
+)
+from telegram_bot.utils.text_parser import TextCommandParser
+from transactions.models import Transaction
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_caches(sender, instance: User, **kwargs) -> None:
+    # id может быть переиспользован (SQLite в тестах) — начинаем с чистого кэша.
+    TextCommandParser.invalidate_user(instance.pk)
+    invalidate_budget_screens(instance.pk)
+    invalidate_report_screens(instance.pk)
+    CategoryManagementService.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_caches(sender, instance: Category, **kwargs) -> None:
+    TextCommandParser.invalidate_user(instance.user_id)
+    invalidate_budget_screens(instance.user_id)
+    invalidate_report_screens(instance.user_id)
+    CategoryManagementService.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=UserAlias)
+@receiver(post_delete, sender=UserAlias)
+def invalidate_alias_caches(sender, instance: UserAlias, **kwargs) -> None:
+    user_id = (
+        TelegramUser.objects.filter(pk=instance.telegram_user_id)
+        .values_list('user_id', flat=True)
+        .first()
+    )
+    if user_id is not None:
+        TextCommandParser.invalidate_user(user_id)
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def invalidate_budget_caches(sender, instance, **kwargs) -> None:
+    invalidate_budget_screens(instance.user_id)
+    invalidate_report_screens(instance.user_id)
+
+
+@receiver(post_save, sender=BotText)
+@receiver(post_delete, sender=BotText)
+def invalidate_bot_text_caches(sender, instance: BotText, **kwargs) -> None:
+    # slug мог смениться при сохранении — сбрасываем все тексты целиком.
+    invalidate_bot_texts()
@@ -464,6 +464,65 @@ class TelegramResilienceTestCase(TestCase):
         self.assertFalse(is_message_not_modified_error(other_error))
         self.assertFalse(is_message_not_modified_error(ValueError("boom")))
 
+    def test_safe_edit_sends_only_markup_when_text_unchanged(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from asgiref.sync import async_to_sync
+        from telegram_bot.utils.telegram_resilience import safe_edit_message_text
+
+        query = MagicMock()
+        query.message = SimpleNamespace(
+            text='💸 500₽ - выбери категорию (расход):',
+            reply_markup=None,
+        )
+        query.edit_message_text = AsyncMock()
+        query.edit_message_reply_markup = AsyncMock()
+        keyboard = object()
+
+        async_to_sync(safe_edit_message_text)(
+            query,
+            text='💸 500₽ - выбери категорию (расход):',
+            reply_markup=keyboard,
+        )
+        query.edit_message_reply_markup.assert_awaited_once_with(reply_markup=keyboard)
+        query.edit_message_text.assert_not_awaited()
+
+        async_to_sync(safe_edit_message_text)(
+            query,
+            text='💰 500₽ - выбери категорию (доход):',
+            reply_markup=keyboard,
+        )
+        query.edit_message_text.assert_awaited_once()
+
+    def test_safe_edit_skips_unchanged_text_and_markup(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from asgiref.sync import async_to_sync
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram_bot.utils.telegram_resilience import safe_edit_message_text
+
+        def keyboard():
+            return InlineKeyboardMarkup([
+                [InlineKeyboardButton(text='🏠 Главное меню', callback_data='main_menu')],
+            ])
+
+        query = MagicMock()
+        query.message = SimpleNamespace(text='📊 Статистика', reply_markup=keyboard())
+        query.answer = AsyncMock()
+        query.edit_message_text = AsyncMock()
+        query.edit_message_reply_markup = AsyncMock()
+
+        edited = async_to_sync(safe_edit_message_text)(
+            query,
+            text='📊 Статистика',
+            reply_markup=keyboard(),
+        )
+
+        self.assertFalse(edited)
+        query.answer.assert_awaited_once_with()
+        query.edit_message_text.assert_not_awaited()
+        query.edit_message_reply_markup.assert_not_awaited()
+
     def test_get_callback_query(self):
         from telegram import CallbackQuery, Update
         from unittest.mock import MagicMock
@@ -480,6 +539,136 @@ class TelegramResilienceTestCase(TestCase):
         del plain_update.edit_message_text
         self.assertIsNone(get_callback_query(plain_update))
 
+    def test_get_callback_query_duck_typed_fallback(self):
+        from types import SimpleNamespace
+        from telegram_bot.utils.telegram_resilience import get_callback_query
+
+        query = SimpleNamespace(edit_message_text=lambda **kwargs: None)
+        update = SimpleNamespace(callback_query=query)
+
+        self.assertIs(get_callback_query(update), query)
+        self.assertIs(get_callback_query(query), query)
+        self.assertIsNone(get_callback_query(SimpleNamespace(callback_query=None)))
+
+
+class TelegramRateLimiterTests(TestCase):
+    def test_retries_after_flood_control(self):
+        from unittest.mock import AsyncMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram.error import RetryAfter
+        from telegram_bot.utils.rate_limiter import TelegramRateLimiter
+
+        limiter = TelegramRateLimiter()
+        callback = AsyncMock(side_effect=[RetryAfter(3), {'ok': True}])
+
+        with patch('telegram_bot.utils.rate_limiter.asyncio.sleep', new=AsyncMock()) as sleep:
+            result = async_to_sync(limiter.process_request)(
+                callback, (), {}, 'sendMessage', {'chat_id': 1}, None,
+            )
+
+        self.assertEqual(result, {'ok': True})
+        self.assertEqual(callback.await_count, 2)
+        sleep.assert_awaited_with(3.0)
+
+    def test_gives_up_after_max_retries(self):
+        from unittest.mock import AsyncMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram.error import RetryAfter
+        from telegram_bot.utils.rate_limiter import TelegramRateLimiter
+
+        limiter = TelegramRateLimiter(max_retries=1)
+        callback = AsyncMock(side_effect=RetryAfter(1))
+
+        with patch('telegram_bot.utils.rate_limiter.asyncio.sleep', new=AsyncMock()):
+            with self.assertRaises(RetryAfter):
+                async_to_sync(limiter.process_request)(
+                    callback, (), {}, 'sendMessage', {'chat_id': 1}, None,
+                )
+        self.assertEqual(callback.await_count, 2)
+
+    def test_bucket_throttles_bursts(self):
+        import time
+        from asgiref.sync import async_to_sync
+        from telegram_bot.utils.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+
+        async def burst(count):
+            started = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        # два токена есть сразу, ещё два накапливаются ~0.04с
+        self.assertLess(async_to_sync(burst)(2), 0.02)
+        self.assertGreaterEqual(async_to_sync(burst)(2), 0.03)
+
+
+class PersistentNavigationTests(TestCase):
+    def test_attach_appends_back_and_main_menu_rows(self):
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram_bot.keyboards.navigation import attach_persistent_navigation
+
+        keyboard = InlineKeyboardMarkup([
+            [InlineKeyboardButton(text='A', callback_data='a')],
+        ])
+
+        result = attach_persistent_navigation(keyboard, back_callback='back')
+        again = attach_persistent_navigation(keyboard, back_callback='back')
+
+        self.assertEqual(
+            [[button.callback_data for button in row] for row in result.inline_keyboard],
+            [['a'], ['back'], ['main_menu']],
+        )
+        self.assertIs(result.inline_keyboard[1][0], again.inline_keyboard[1][0])
+        self.assertEqual(
+            len(attach_persistent_navigation(keyboard).inline_keyboard),
+            2,
+        )
+
+    def test_main_menu_keyboard_is_shared(self):
+        from telegram_bot.keyboards.actions import ActionKeyboard
+
+        self.assertIs(
+            ActionKeyboard.get_main_menu_keyboard(),
+            ActionKeyboard.get_main_menu_keyboard(),
+        )
+
+    def test_report_navigation_keyboard_is_cached_by_neighbours(self):
+        from telegram_bot.keyboards.reports import ReportKeyboard
+
+        periods = [{'year': 2025, 'month': m} for m in (1, 2, 3)]
+        keyboard = ReportKeyboard.get_report_navigation_keyboard(
+            {'year': 2025, 'month': 2},
+            periods,
+        )
+        self.assertEqual(
+            [b.callback_data for b in keyboard.inline_keyboard[0]],
+            ['report_prev_2025_1', 'report_next_2025_3'],
+        )
+        self.assertEqual(keyboard.inline_keyboard[1][0].callback_data, 'report_export_excel_2025_2')
+        self.assertIs(
+            keyboard,
+            ReportKeyboard.get_report_navigation_keyboard(
+                {'year': 2025, 'month': 2},
+                periods + [{'year': 2025, 'month': 4}],
+            ),
+        )
+
+        edge = ReportKeyboard.get_report_navigation_keyboard({'year': 2025, 'month': 1}, periods)
+        self.assertEqual(
+            [b.callback_data for b in edge.inline_keyboard[0]],
+            ['report_disabled', 'report_next_2025_2'],
+        )
+
+    def test_report_main_keyboard_is_shared(self):
+        from telegram_bot.keyboards.reports import ReportKeyboard
+
+        self.assertIs(
+            ReportKeyboard.get_report_main_keyboard(),
+            ReportKeyboard.get_report_main_keyboard(),
+        )
+
 
 class CategoryResolverTests(TestCase):
     def setUp(self):
@@ -1660,3 +1849,1280 @@ class VoiceRouterMockE2ETests(TestCase):
         self.assertEqual(command.intent, VoiceIntentType.SET_BUDGET)
         self.assertEqual(command.amount, self.Decimal('5000'))
         self.assertEqual(command.category.id, self.products.id)
+
+
+class TelegramUserBootstrapTests(TestCase):
+    def _telegram_user(self, telegram_id=777001):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            id=telegram_id,
+            username='boot',
+            first_name='Boot',
+            last_name='',
+            language_code='ru',
+        )
+
+    def test_bootstrap_creates_user_state_and_categories(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+        from telegram_bot.models import UserState
+
+        handler = BaseHandler()
+        tg_user, is_new, created_count = async_to_sync(
+            handler.get_or_create_telegram_user_with_bootstrap
+        )(self._telegram_user())
+
+        self.assertTrue(is_new)
+        self.assertGreater(created_count, 0)
+        self.assertEqual(tg_user.user.username, 'tg_777001')
+        self.assertTrue(UserState.objects.filter(telegram_user=tg_user).exists())
+        self.assertEqual(
+            Category.objects.filter(user=tg_user.user).count(),
+            created_count,
+        )
+
+    def test_bootstrap_is_idempotent_for_existing_django_user(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+
+        User.objects.create_user(username='tg_777002', password='x')
+        handler = BaseHandler()
+        bootstrap = async_to_sync(handler.get_or_create_telegram_user_with_bootstrap)
+
+        tg_user, is_new, _ = bootstrap(self._telegram_user(777002))
+        again, is_new_again, created_again = bootstrap(self._telegram_user(777002))
+
+        self.assertTrue(is_new)
+        self.assertEqual(tg_user.pk, again.pk)
+        self.assertFalse(is_new_again)
+        self.assertEqual(created_again, 0)
+
+    def test_existing_user_comes_with_django_user_loaded(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+
+        user = User.objects.create_user(username='tg_777003', password='x')
+        TelegramUser.objects.create(telegram_id=777003, user=user, username='boot')
+
+        tg_user = async_to_sync(BaseHandler().get_or_create_telegram_user)(
+            self._telegram_user(777003),
+        )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(tg_user.user.username, 'tg_777003')
+
+    def test_new_user_comes_with_django_user_loaded(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+
+        tg_user = async_to_sync(BaseHandler().get_or_create_telegram_user)(
+            self._telegram_user(777005),
+        )
+
+        self.assertTrue(TelegramUser.user.is_cached(tg_user))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                async_to_sync(BaseHandler().get_user)(tg_user).username,
+                'tg_777005',
+            )
+
+    def test_get_user_loads_user_once_when_not_preloaded(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+
+        user = User.objects.create_user(username='tg_777004', password='x')
+        tg_user = TelegramUser.objects.create(telegram_id=777004, user=user, username='boot')
+        tg_user = TelegramUser.objects.get(pk=tg_user.pk)
+        get_user = async_to_sync(BaseHandler().get_user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user(tg_user).pk, user.pk)
+            self.assertEqual(get_user(tg_user).pk, user.pk)
+
+
+class BackgroundLogMessageTests(TestCase):
+    def test_log_message_in_background_is_awaited_on_drain(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.base import BaseHandler
+        from telegram_bot.models import BotMessage
+
+        user = User.objects.create_user(username='bg_log', password='x')
+        tg_user = TelegramUser.objects.create(telegram_id=777101, user=user, username='bg_log')
+
+        async def command():
+            handler = BaseHandler()
+            handler.log_message_in_background(tg_user, 'incoming', '/help')
+            await BaseHandler.wait_background_tasks()
+
+        async_to_sync(command)()
+
+        self.assertEqual(
+            list(BotMessage.objects.filter(telegram_user=tg_user).values_list('text', flat=True)),
+            ['/help'],
+        )
+
+
+class SendOrEditMessageTests(TestCase):
+    def test_list_keyboard_is_wrapped_and_markdown_used(self):
+        from unittest.mock import AsyncMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.constants import ParseMode
+        from telegram_bot.handlers.base import BaseHandler
+
+        row = [InlineKeyboardButton(text='OK', callback_data='ok')]
+        with patch(
+            'telegram_bot.handlers.base.send_or_edit_message',
+            new=AsyncMock(),
+        ) as send:
+            async_to_sync(BaseHandler()._send_or_edit_message)(None, None, 'text', [row])
+            async_to_sync(BaseHandler()._send_or_edit_message)(None, None, 'text', [])
+
+        first, second = send.await_args_list
+        self.assertEqual(first.kwargs['reply_markup'], InlineKeyboardMarkup([row]))
+        self.assertEqual(first.kwargs['parse_mode'], ParseMode.MARKDOWN)
+        self.assertIsNone(second.kwargs['reply_markup'])
+
+    def test_text_handler_falls_back_to_plain_text_with_keyboard(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from asgiref.sync import async_to_sync
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+        from telegram.error import BadRequest
+
+        row = [InlineKeyboardButton(text='OK', callback_data='ok')]
+        bot = MagicMock()
+        bot.send_message = AsyncMock(side_effect=[BadRequest("Can't parse entities"), None])
+        update = MagicMock()
+        update.effective_chat.id = 42
+
+        async_to_sync(TextHandler()._send_or_edit_message)(
+            update,
+            SimpleNamespace(bot=bot),
+            '*text',
+            [row],
+        )
+
+        markdown, plain = bot.send_message.await_args_list
+        self.assertIn('parse_mode', markdown.kwargs)
+        self.assertNotIn('parse_mode', plain.kwargs)
+        self.assertEqual(plain.kwargs['reply_markup'], InlineKeyboardMarkup([row]))
+
+
+class TextCommandParserCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='parser_cache', password='x')
+
+    def test_parser_is_cached_per_user(self):
+        from telegram_bot.utils.text_parser import TextCommandParser
+
+        parser = TextCommandParser.from_user_cached(self.user)
+        self.assertIs(parser, TextCommandParser.from_user_cached(self.user))
+
+    def test_category_change_invalidates_cache(self):
+        from telegram_bot.utils.text_parser import TextCommandParser
+
+        parser = TextCommandParser.from_user_cached(self.user)
+        self.assertIsNone(parser.parse('500 кофе').get('category'))
+
+        category = Category.objects.create(
+            user=self.user,
+            name='Кофе',
+            type='expense',
+            color='#000000',
+            icon='☕',
+        )
+
+        fresh = TextCommandParser.from_user_cached(self.user)
+        self.assertIsNot(parser, fresh)
+        self.assertEqual(fresh.parse('500 кофе')['category'].id, category.id)
+
+    def test_categories_loaded_once(self):
+        from telegram_bot.utils.text_parser import TextCommandParser
+
+        Category.objects.create(
+            user=self.user,
+            name='Кофе',
+            type='expense',
+            color='#000000',
+            icon='☕',
+        )
+        parser = TextCommandParser.from_user_cached(self.user)
+        parser.parse('500 кофе')
+        with self.assertNumQueries(0):
+            parser.parse('300 кофе')
+            parser.parse('кофе')
+
+
+class BotTextCacheTests(TestCase):
+    def setUp(self):
+        from telegram_bot.utils.screen_caches import invalidate_bot_texts
+
+        invalidate_bot_texts()
+
+    def _get(self, slug):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.command_handler import CommandHandler
+
+        return async_to_sync(CommandHandler()._get_bot_text)(slug, 'default')
+
+    def test_text_is_cached(self):
+        from telegram_bot.models import BotText
+
+        BotText.objects.update_or_create(
+            slug='welcome_message',
+            defaults={'text': 'Привет', 'is_active': True},
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get('welcome_message'), 'Привет')
+            self.assertEqual(self._get('welcome_message'), 'Привет')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self._get('missing_slug'), 'default')
+            self.assertEqual(self._get('missing_slug'), 'default')
+
+    def test_render_template(self):
+        from telegram_bot.handlers.command_handler import CommandHandler
+
+        render = CommandHandler._render_template
+        self.assertEqual(render('Привет, {first_name}!', 'Аня'), 'Привет, Аня!')
+        self.assertEqual(render('{firstName} и {first_name}', 'Аня'), 'Аня и Аня')
+        self.assertEqual(render('Скобки {{x}}', 'Аня'), 'Скобки {x}')
+        self.assertEqual(render('{first_name!r}', 'Аня'), "'Аня'")
+        # неизвестные плейсхолдеры и битые скобки — текст как есть
+        self.assertEqual(render('Привет, {name}', 'Аня'), 'Привет, {name}')
+        self.assertEqual(render('Привет, {', 'Аня'), 'Привет, {')
+
+    def test_save_invalidates_cache(self):
+        from telegram_bot.models import BotText
+
+        bot_text, _ = BotText.objects.update_or_create(
+            slug='welcome_message',
+            defaults={'text': 'Привет', 'is_active': True},
+        )
+        self.assertEqual(self._get('welcome_message'), 'Привет')
+
+        bot_text.is_active = False
+        bot_text.save()
+        self.assertEqual(self._get('welcome_message'), 'default')
+
+
+def _make_telegram_user(username, telegram_id):
+    """
+    TelegramUser с уже загруженным user, как после
+    get_or_create_telegram_user: get_user() не делает запроса.
+    """
+    user = User.objects.create_user(username=username, password='x')
+    telegram_user = TelegramUser.objects.create(
+        telegram_id=telegram_id,
+        user=user,
+        username=username,
+    )
+    return TelegramUser.objects.select_related('user').get(pk=telegram_user.pk)
+
+
+def _render_screen(handler, method, telegram_user, *args):
+    """Вызывает экран обработчика и возвращает (message, keyboard) последнего ответа."""
+    from unittest.mock import AsyncMock
+    from asgiref.sync import async_to_sync
+
+    handler._send_or_edit_message = AsyncMock()
+    async_to_sync(getattr(handler, method))(None, None, telegram_user, *args)
+    return handler._send_or_edit_message.await_args.args[2:]
+
+
+class BudgetHandlerTests(TestCase):
+    def setUp(self):
+        from decimal import Decimal
+
+        self.telegram_user = _make_telegram_user('budget_cache', 888001)
+        self.user = self.telegram_user.user
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Продукты',
+            type='expense',
+            color='#000000',
+            icon='🥕',
+        )
+        today = timezone.now().date()
+        self.budget = Budget.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=Decimal('5000'),
+            period_type=Budget.MONTHLY,
+            start_date=today.replace(day=1),
+            end_date=today + timedelta(days=30),
+            is_active=True,
+        )
+
+    def _render_view(self):
+        from telegram_bot.handlers.budget_handler import BudgetHandler
+
+        message, _ = _render_screen(BudgetHandler(), 'handle_budgets_view', self.telegram_user)
+        return message
+
+    def test_budgets_view_is_cached(self):
+        message = self._render_view()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._render_view(), message)
+
+    def test_budgets_view_query_count_does_not_grow_with_budgets(self):
+        from decimal import Decimal
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from telegram_bot.utils.screen_caches import invalidate_budget_screens
+
+        with CaptureQueriesContext(connection) as single:
+            self._render_view()
+
+        for name in ('Кафе', 'Транспорт', 'Связь'):
+            category = Category.objects.create(
+                user=self.user,
+                name=name,
+                type='expense',
+                color='#000000',
+                icon='•',
+            )
+            Budget.objects.create(
+                user=self.user,
+                category=category,
+                amount=Decimal('1000'),
+                period_type=Budget.MONTHLY,
+                start_date=self.budget.start_date,
+                end_date=self.budget.end_date,
+                is_active=True,
+            )
+        invalidate_budget_screens(self.user.id)
+
+        with CaptureQueriesContext(connection) as several:
+            message = self._render_view()
+
+        self.assertIn('Связь', message)
+        self.assertGreater(len(single), 0)
+        self.assertEqual(len(several), len(single))
+
+    def test_transaction_invalidates_budgets_view(self):
+        from decimal import Decimal
+        from transactions.models import Transaction
+
+        self.assertIn('Потрачено: 0.00 ₽', self._render_view())
+
+        Transaction.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=Decimal('-300'),
+            date=timezone.now().date(),
+        )
+
+        self.assertIn('Потрачено: 300.00 ₽', self._render_view())
+
+    def _delete(self):
+        from unittest.mock import AsyncMock
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.budget_handler import BudgetHandler
+
+        handler = BudgetHandler()
+        handler._send_or_edit_message = AsyncMock()
+        async_to_sync(handler.handle_budget_delete_execution)(
+            None,
+            None,
+            self.telegram_user,
+            self.budget.id,
+        )
+        return [call.args[2] for call in handler._send_or_edit_message.await_args_list]
+
+    def test_deletes_budget(self):
+        messages = self._delete()
+
+        self.assertEqual(len(messages), 1)
+        self.assertIn('Бюджет удален', messages[0])
+        self.assertFalse(Budget.objects.filter(pk=self.budget.pk).exists())
+
+    def test_delete_failure_replaces_confirmation_with_error(self):
+        from unittest.mock import patch
+
+        with patch.object(Budget, 'adelete', side_effect=RuntimeError('db down')):
+            messages = self._delete()
+
+        self.assertIn('Бюджет удален', messages[0])
+        self.assertIn('Не удалось удалить бюджет', messages[-1])
+        self.assertTrue(Budget.objects.filter(pk=self.budget.pk).exists())
+
+
+class CategoryListCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='category_cache', password='x')
+        Category.objects.create(user=self.user, name='Кафе', type='expense', icon='☕')
+
+    def _names(self):
+        from asgiref.sync import async_to_sync
+        from telegram_bot.services.category_management_service import (
+            CategoryManagementService,
+        )
+
+        categories = async_to_sync(CategoryManagementService(self.user).get_user_categories)()
+        return [c.name for c in categories]
+
+    def test_categories_are_cached(self):
+        self.assertEqual(self._names(), ['Кафе'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._names(), ['Кафе'])
+
+    def test_category_change_invalidates_cache(self):
+        self.assertEqual(self._names(), ['Кафе'])
+
+        Category.objects.create(user=self.user, name='Аптека', type='expense', icon='💊')
+
+        self.assertEqual(self._names(), ['Аптека', 'Кафе'])
+
+
+class LimitsSettingsTests(TestCase):
+    def setUp(self):
+        from decimal import Decimal
+        from transactions.models import Transaction
+
+        self.telegram_user = _make_telegram_user('limits_settings', 888201)
+        self.user = self.telegram_user.user
+        today = timezone.now().date()
+        for name, spent in (('Продукты', '4500'), ('Кафе', '500')):
+            category = Category.objects.create(
+                user=self.user,
+                name=name,
+                type='expense',
+                color='#000000',
+                icon='🥕',
+            )
+            Budget.objects.create(
+                user=self.user,
+                category=category,
+                amount=Decimal('5000'),
+                period_type=Budget.MONTHLY,
+                start_date=today.replace(day=1),
+                end_date=today + timedelta(days=30),
+                is_active=True,
+            )
+            Transaction.objects.create(
+                user=self.user,
+                category=category,
+                amount=-Decimal(spent),
+                date=today,
+            )
+
+    def _render(self, method, *args):
+        from telegram_bot.handlers.settings_handler import SettingsHandler
+
+        return _render_screen(SettingsHandler(), method, self.telegram_user, *args)
+
+    def test_limits_view_loads_spent_in_one_query(self):
+        with self.assertNumQueries(1):
+            message, _ = self._render('handle_limits_view')
+
+        self.assertIn('🟡 4,500.00 / 5,000.00 ₽', message)
+        self.assertIn('🟢 500.00 / 5,000.00 ₽', message)
+        self.assertIn('Всего лимитов: 2', message)
+
+    def test_limits_delete_loads_spent_in_one_query(self):
+        with self.assertNumQueries(1):
+            _, keyboard = self._render('handle_limits_delete')
+
+        self.assertCountEqual(
+            [row[0].text for row in keyboard[:-1]],
+            ['🥕 Продукты - 5,000 ₽ (90%)', '🥕 Кафе - 5,000 ₽ (10%)'],
+        )
+
+    def test_limit_delete_confirmation_loads_budget_in_one_query(self):
+        budget = Budget.objects.get(user=self.user, category__name='Продукты')
+
+        with self.assertNumQueries(1):
+            message, _ = self._render('handle_limit_delete_confirmation', budget.id)
+
+        self.assertIn('🥕 Продукты', message)
+        self.assertIn('Потрачено: 4,500.00 ₽ (90.0%)', message)
+
+    def test_static_screens_reuse_module_keyboards(self):
+        first = self._render('handle_limits_settings')
+        second = self._render('handle_limits_settings')
+
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        self.assertEqual(first[1].inline_keyboard[0][0].callback_data, 'limits_view')
+
+    def test_category_edit_menu_checks_budget_with_category_query(self):
+        category = Category.objects.get(user=self.user, name='Кафе')
+
+        # Категория с флагом лимита + транзакции за 3 месяца
+        with self.assertNumQueries(2):
+            _, keyboard = self._render('handle_category_edit_selection', category.id)
+
+        self.assertIn('✏️ Изменить лимит', [
+            button.text for row in keyboard.inline_keyboard for button in row
+        ])
+
+
+class ReportHandlerCacheTests(TestCase):
+    def setUp(self):
+        self.telegram_user = _make_telegram_user('report_cache', 888101)
+        self.user = self.telegram_user.user
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Кафе',
+            type='expense',
+            color='#000000',
+            icon='☕',
+        )
+        self.today = timezone.now().date()
+
+    def _render(self, year=None, month=None):
+        from unittest.mock import AsyncMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.report_handler import ReportHandler
+
+        with patch(
+            'telegram_bot.handlers.base.send_or_edit_message',
+            new=AsyncMock(),
+        ) as send:
+            async_to_sync(ReportHandler()._show_monthly_report)(
+                None,
+                None,
+                self.telegram_user,
+                year or self.today.year,
+                month or self.today.month,
+            )
+        return send.await_args.kwargs['text']
+
+    def test_report_screen_is_cached(self):
+        message = self._render()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._render(), message)
+
+    def test_available_periods_loaded_once_for_all_months(self):
+        from unittest.mock import patch
+        from telegram_bot.services.report_service import ReportService
+
+        previous = self.today.replace(day=1) - timedelta(days=1)
+        with patch.object(
+            ReportService,
+            'get_available_periods',
+            autospec=True,
+            side_effect=ReportService.get_available_periods,
+        ) as periods:
+            self._render()
+            self._render(previous.year, previous.month)
+
+        self.assertEqual(periods.call_count, 1)
+
+    def test_transaction_invalidates_report_screen(self):
+        from decimal import Decimal
+        from transactions.models import Transaction
+
+        self.assertIn('Расходы: 0₽', self._render())
+
+        Transaction.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=Decimal('-350'),
+            date=self.today,
+        )
+
+        self.assertIn('Расходы: 350₽', self._render())
+
+    def test_format_report_message(self):
+        from decimal import Decimal
+        from telegram_bot.handlers.report_handler import ReportHandler
+
+        message = ReportHandler()._format_report_message({
+            'period_name': 'Январь 2025',
+            'total_income': Decimal('50000'),
+            'total_expenses': Decimal('1500'),
+            'balance': Decimal('48500'),
+            'income_rows': [('💼', 'Зарплата', Decimal('50000'), 0)],
+            'expense_rows': [('☕', 'Кафе & бар', Decimal('1500'), Decimal('-500'))],
+        })
+
+        self.assertTrue(message.startswith('📊 <b>Отчет за Январь 2025</b>\n\n'))
+        self.assertIn('• Баланс: 48,500₽\n\n📋 <b>Категории:</b>\n', message)
+        self.assertIn('\n💰 <b>Доходы:</b>\n• 💼 Зарплата: 50,000₽\n', message)
+        self.assertIn('• ☕ Кафе &amp; бар: 1,500₽ (превышен на 500₽)\n', message)
+
+
+class ReportExportServiceTests(TestCase):
+    def test_monthly_excel_is_written_to_temp_file(self):
+        import os
+        import zipfile
+        from decimal import Decimal
+        from asgiref.sync import async_to_sync
+        from transactions.models import Transaction
+        from telegram_bot.services.report_export_service import ReportExportService
+
+        user = User.objects.create_user(username='excel_export', password='x')
+        category = Category.objects.create(user=user, name='Кафе', type='expense', icon='☕')
+        today = timezone.now().date()
+        Transaction.objects.create(user=user, category=category, amount=Decimal('-350'), date=today)
+
+        result = async_to_sync(ReportExportService(user).build_monthly_excel)(today.year, today.month)
+        try:
+            self.assertEqual(result.filename, f'finhub_report_{today.year}-{today.month:02d}.xlsx')
+            self.assertTrue(zipfile.is_zipfile(result.path))
+        finally:
+            result.cleanup()
+        self.assertFalse(os.path.exists(result.path))
+
+
+class GoalHistoryTests(TestCase):
+    def setUp(self):
+        from decimal import Decimal
+
+        from asgiref.sync import async_to_sync
+        from goals.models import Goal
+        from telegram_bot.services.goal_service import GoalService
+
+        self.telegram_user = _make_telegram_user('goal_history', 777301)
+        self.user = self.telegram_user.user
+        self.goal = Goal.objects.create(
+            user=self.user,
+            title='Отпуск',
+            target_amount=Decimal('100000'),
+        )
+        async_to_sync(GoalService(self.user).add_deposit)(
+            self.goal.id,
+            Decimal('5000'),
+            comment='<аванс>',
+        )
+
+    def _render(self, goal_id):
+        from telegram_bot.handlers.goals_handler import GoalsHandler
+
+        message, _ = _render_screen(
+            GoalsHandler(),
+            'handle_goal_history',
+            self.telegram_user,
+            goal_id,
+        )
+        return message
+
+    def test_history_lists_entries(self):
+        message = self._render(self.goal.id)
+        today = timezone.now().strftime('%d.%m.%Y')
+        self.assertIn('История: Отпуск', message)
+        self.assertIn(f'➕ {today} — 5,000 ₽ — &lt;аванс&gt;\n', message)
+
+    def test_history_uses_goal_and_entries_queries_only(self):
+        with self.assertNumQueries(2):
+            self._render(self.goal.id)
+
+    def test_foreign_goal_is_not_found(self):
+        from goals.models import Goal
+
+        other = User.objects.create_user(username='goal_history_other', password='x')
+        foreign = Goal.objects.create(user=other, title='Чужая', target_amount=1)
+        self.assertEqual(self._render(foreign.id), '❌ Цель не найдена.')
+
+
+class BudgetAmountInputTests(TestCase):
+    def setUp(self):
+        self.telegram_user = _make_telegram_user('budget_input', 888002)
+        self.user = self.telegram_user.user
+        self.category = Category.objects.create(
+            user=self.user,
+            name='Продукты',
+            type='expense',
+            color='#000000',
+            icon='🥕',
+        )
+
+    def _input(self, text, user_data):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+        from asgiref.sync import async_to_sync
+
+        update = MagicMock()
+        update.message.reply_text = AsyncMock()
+        context = SimpleNamespace(user_data=user_data)
+        async_to_sync(TextHandler()._handle_budget_amount_input)(
+            update,
+            context,
+            self.telegram_user,
+            text,
+        )
+        return update.message.reply_text.await_args.args[0]
+
+    def test_creates_then_updates_monthly_budget(self):
+        message = self._input('5000', {
+            'waiting_for_budget_amount': True,
+            'budget_category_id': self.category.id,
+        })
+        self.assertIn('Бюджет создан', message)
+
+        message = self._input('7000', {
+            'waiting_for_budget_amount': True,
+            'budget_category_id': self.category.id,
+        })
+        self.assertIn('Бюджет обновлен', message)
+
+        budget = Budget.objects.get(user=self.user, category=self.category)
+        self.assertEqual(int(budget.amount), 7000)
+
+    def test_edits_budget_by_id(self):
+        today = timezone.now().date()
+        budget = Budget.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=1000,
+            period_type=Budget.MONTHLY,
+            start_date=today.replace(day=1),
+            end_date=today + timedelta(days=30),
+        )
+        user_data = {'waiting_for_budget_amount': True, 'editing_budget_id': budget.id}
+
+        message = self._input('2500', user_data)
+
+        self.assertIn('🥕 Продукты', message)
+        self.assertNotIn('editing_budget_id', user_data)
+        budget.refresh_from_db()
+        self.assertEqual(int(budget.amount), 2500)
+
+
+class CallbackRouterTests(TestCase):
+    def setUp(self):
+        from telegram_bot.utils.callback_router import CallbackRouter
+
+        self.router = CallbackRouter()
+        self.router.add_exact('category_edit', 'edit_menu')
+        self.router.add_prefix('category_', 'select')
+        self.router.add_prefix('category_edit_', 'edit')
+        self.router.add_prefix('category_icon_', 'icon')
+        self.router.add_prefix('category_icon_select_', 'icon_select')
+
+    def test_exact_beats_prefix(self):
+        self.assertEqual(self.router.resolve('category_edit'), 'edit_menu')
+        self.assertEqual(self.router.resolve('category_edit_5'), 'edit')
+
+    def test_exact_route_shadows_longer_prefix(self):
+        self.assertEqual(self.router.resolve('category_icon_select_none'), 'icon_select')
+        self.router.add_exact('category_icon_select_none', 'no_icon')
+        self.assertEqual(self.router.resolve('category_icon_select_none'), 'no_icon')
+        self.assertEqual(self.router.resolve('category_icon_select_5_🍕'), 'icon_select')
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(self.router.resolve('category_icon_5'), 'icon')
+        self.assertEqual(self.router.resolve('category_icon_select_5_🍕'), 'icon_select')
+        self.assertEqual(self.router.resolve('category_42'), 'select')
+
+    def test_prefix_requires_suffix(self):
+        self.assertIsNone(self.router.resolve('category'))
+        self.assertEqual(self.router.resolve('category_icon'), 'select')
+        self.assertIsNone(self.router.resolve('goal_view_1'))
+
+    def test_match_returns_parsed_parts(self):
+        match = self.router.match('category_icon_select_5_🍕')
+        self.assertEqual(match.handler, 'icon_select')
+        self.assertEqual(match.route, 'category_icon_select_')
+        self.assertEqual(match.parts, ('category', 'icon', 'select', '5', '🍕'))
+        self.assertEqual(match.args, ('5', '🍕'))
+        self.assertIs(self.router.match('category_icon_select_5_🍕'), match)
+
+        match = self.router.match('category_edit')
+        self.assertEqual(match.args, ())
+        self.assertIsNone(self.router.match('goal_view_1'))
+
+    def test_prefix_must_end_with_separator(self):
+        with self.assertRaises(ValueError):
+            self.router.add_prefix('goal_view', 'view')
+
+    def test_prefix_parser_runs_once_per_data(self):
+        calls = []
+
+        def parse(args):
+            calls.append(args)
+            return (int(args[0]),)
+
+        self.router.add_prefix('goal_view_', 'view', parse)
+
+        match = self.router.match('goal_view_7')
+        self.assertEqual(match.params, (7,))
+        self.assertIs(self.router.match('goal_view_7'), match)
+        self.assertEqual(calls, [('7',)])
+
+        self.assertIsNone(self.router.match('goal_view_x').params)
+        self.assertEqual(
+            self.router.match('category_42').params,
+            ('category', '42'),
+        )
+
+
+class CallbackDispatchTests(TestCase):
+    def _dispatch(self, data, method_name):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        handler = CallbackHandler()
+        handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+        handler.handle_error = AsyncMock()
+        update = MagicMock()
+        update.callback_query.data = data
+        update.callback_query.answer = AsyncMock()
+
+        context = SimpleNamespace(chat_data={}, user_data={})
+        with patch.object(CallbackHandler, method_name, new_callable=AsyncMock) as target:
+            async_to_sync(handler.handle_callback_query)(update, context)
+
+        handler.handle_error.assert_not_awaited()
+        target.query = update.callback_query
+        return target
+
+    def test_routes_exact_callback(self):
+        target = self._dispatch('budgets_view', '_handle_budgets_view')
+        target.assert_awaited_once()
+
+    def test_silent_routes_are_acknowledged_by_dispatcher(self):
+        target = self._dispatch('budget_detail_7', '_handle_budget_detail')
+        target.query.answer.assert_awaited_once_with()
+
+        # Маршруты с собственными всплывающими ответами не трогаем
+        target = self._dispatch('goal_quick_deposit_7_500', '_handle_goal_quick_deposit')
+        target.query.answer.assert_not_awaited()
+
+    def test_routes_prefix_callback_with_id(self):
+        target = self._dispatch('goal_quick_deposit_7_500', '_handle_goal_quick_deposit')
+        self.assertEqual(target.await_args.args[-2:], (7, 500))
+
+    def test_icon_select_is_not_shadowed_by_icon_prefix(self):
+        target = self._dispatch('category_icon_select_5_🍕', '_handle_category_icon_select')
+        target.assert_awaited_once()
+
+    def test_unknown_callback(self):
+        target = self._dispatch('no_such_button', '_handle_unknown_callback')
+        target.assert_awaited_once()
+
+    def test_routes_receive_parsed_args(self):
+        cases = {
+            'category_icon_select_5_🍕_x': ('_handle_category_icon_select', (5, '🍕_x')),
+            'category_type_select_3_income': ('_handle_category_type_select', (3, 'income')),
+            'category_confirm_delete_3': ('_handle_category_confirm', ('delete', 3)),
+            'category_list_expense': ('_handle_category_list_by_type', ('expense',)),
+            'report_prev_2026_01': ('_handle_report_navigation', (2026, 1)),
+            'edit_comment_42': ('_handle_transaction_edit', ('comment', 42)),
+            'switch_to_expense': ('_handle_type_switch', ('expense',)),
+            'voice_goal_pick_9': ('_handle_voice_goal_pick', (9,)),
+            'voice_dialog_type_income': ('_handle_voice_dialog_type', ('income',)),
+            'page_expense_2': ('_handle_page_navigation', ('expense', 2)),
+            'delete_transaction_42': ('_handle_transaction_delete', (42,)),
+        }
+        for data, (method_name, args) in cases.items():
+            with self.subTest(data=data):
+                target = self._dispatch(data, method_name)
+                self.assertEqual(target.await_args.args[-len(args):], args)
+
+    def test_limit_delete_confirm_has_own_route(self):
+        for data, confirmed in (('limit_delete_3', False), ('limit_delete_confirm_3', True)):
+            with self.subTest(data=data):
+                target = self._dispatch(data, '_handle_limit_delete')
+                self.assertEqual(target.await_args.args[-1], 3)
+                self.assertIs(target.await_args.kwargs['confirmed'], confirmed)
+
+    def test_invalid_args_answer_without_calling_handler(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        for data in (
+            'category_edit_x',
+            'category_edit_+7',
+            'category_edit_٧',
+            'category_list_other',
+            'category_delete',
+        ):
+            with self.subTest(data=data):
+                handler = CallbackHandler()
+                handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+                handler.handle_error = AsyncMock()
+                update = MagicMock()
+                update.callback_query.data = data
+                update.callback_query.answer = AsyncMock()
+
+                with patch.object(
+                    CallbackHandler,
+                    '_handle_category_edit_selection',
+                    new_callable=AsyncMock,
+                ) as target:
+                    async_to_sync(handler.handle_callback_query)(
+                        update,
+                        SimpleNamespace(chat_data={}, user_data={}),
+                    )
+
+                target.assert_not_awaited()
+                handler.handle_error.assert_not_awaited()
+                update.callback_query.answer.assert_awaited_once_with(
+                    "Ошибка: неверные данные кнопки",
+                )
+
+    def test_error_reports_failed_route(self):
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        handler = CallbackHandler()
+        handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+        handler.handle_error = AsyncMock()
+        update = MagicMock()
+        update.callback_query.data = 'budget_detail_7'
+        update.callback_query.answer = AsyncMock()
+        error = RuntimeError('boom')
+
+        with patch.object(
+            CallbackHandler,
+            '_handle_budget_detail',
+            new_callable=AsyncMock,
+            side_effect=error,
+        ):
+            async_to_sync(handler.handle_callback_query)(update, MagicMock())
+
+        self.assertEqual(
+            handler.handle_error.await_args.kwargs['where'],
+            'CallbackHandler[budget_detail_]',
+        )
+        self.assertIs(handler.handle_error.await_args.args[2], error)
+
+    def test_category_block_routes_by_segments(self):
+        cases = {
+            'category_add': '_handle_category_add',
+            'category_add_type_income': '_handle_category_add_type_selection',
+            'category_list_expense': '_handle_category_list_by_type',
+            'category_edit': '_handle_category_edit',
+            'category_edit_3': '_handle_category_edit_selection',
+            'category_income_3': '_handle_category_edit_selection',
+            'category_delete_3': '_handle_category_delete',
+            'category_type_3': '_handle_category_type',
+            'category_type_select_3_income': '_handle_category_type_select',
+            'category_confirm_delete_3': '_handle_category_confirm',
+            'category_budget_3': '_handle_category_budget',
+            'category_3': '_handle_category_selection',
+        }
+        for data, method_name in cases.items():
+            with self.subTest(data=data):
+                self._dispatch(data, method_name).assert_awaited_once()
+
+    def test_transaction_edit_sets_state_and_reuses_keyboard(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        sent = []
+        for _ in range(2):
+            query = MagicMock()
+            context = SimpleNamespace(user_data={})
+            with patch(
+                'telegram_bot.handlers.callback_handler.safe_edit_message_text',
+                new_callable=AsyncMock,
+            ) as edit:
+                async_to_sync(CallbackHandler()._handle_transaction_edit)(
+                    query, context, 'tg_user', 'date', 42,
+                )
+            self.assertEqual(context.user_data, {'editing_transaction_date': 42})
+            sent.append(edit.await_args.kwargs)
+
+        self.assertIn('ДД.MM.YYYY', sent[0]['text'])
+        self.assertIs(sent[0]['reply_markup'], sent[1]['reply_markup'])
+        self.assertEqual(
+            sent[0]['reply_markup'].inline_keyboard[0][0].callback_data,
+            'transaction_actions_42',
+        )
+
+    def test_same_chat_callbacks_are_serialized(self):
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        handler = CallbackHandler()
+        handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+        handler.handle_error = AsyncMock()
+        events = []
+
+        async def slow_view(self, query, context, telegram_user):
+            events.append(('start', query.data))
+            await asyncio.sleep(0.01)
+            events.append(('end', query.data))
+
+        def make_update(data):
+            update = MagicMock()
+            update.callback_query.data = data
+            update.callback_query.answer = AsyncMock()
+            return update
+
+        async def run(first_chat_data, second_chat_data):
+            await asyncio.gather(
+                handler.handle_callback_query(
+                    make_update('budgets_view'),
+                    SimpleNamespace(chat_data=first_chat_data),
+                ),
+                handler.handle_callback_query(
+                    make_update('budgets_view'),
+                    SimpleNamespace(chat_data=second_chat_data),
+                ),
+            )
+
+        with patch.object(CallbackHandler, '_handle_budgets_view', slow_view):
+            chat_data = {}
+            async_to_sync(run)(chat_data, chat_data)
+            self.assertEqual([e[0] for e in events], ['start', 'end', 'start', 'end'])
+
+            events.clear()
+            async_to_sync(run)({}, {})
+            self.assertEqual([e[0] for e in events], ['start', 'start', 'end', 'end'])
+
+    def test_superseded_navigation_callbacks_are_skipped(self):
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        handler = CallbackHandler()
+        handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+        handler.handle_error = AsyncMock()
+        shown = []
+
+        async def navigate(self, query, context, telegram_user, year, month):
+            await asyncio.sleep(0.01)
+            shown.append((year, month))
+
+        def make_update(query_id, data):
+            update = MagicMock()
+            update.callback_query.id = query_id
+            update.callback_query.data = data
+            update.callback_query.answer = AsyncMock()
+            return update
+
+        updates = [
+            make_update('1', 'report_prev_2026_03'),
+            make_update('2', 'report_prev_2026_02'),
+            make_update('3', 'report_next_2026_03'),
+            make_update('4', 'budgets_view'),
+        ]
+
+        async def run():
+            context = SimpleNamespace(chat_data={}, user_data={})
+            await asyncio.gather(*(
+                handler.handle_callback_query(update, context) for update in updates
+            ))
+
+        with patch.object(CallbackHandler, '_handle_report_navigation', navigate), \
+                patch.object(CallbackHandler, '_handle_budgets_view', new_callable=AsyncMock) as view:
+            async_to_sync(run)()
+
+        # Первое нажатие уже выполнялось, второе перекрыто третьим
+        self.assertEqual(shown, [(2026, 3), (2026, 3)])
+        updates[1].callback_query.answer.assert_awaited_once_with()
+        view.assert_awaited_once()
+
+    def test_superseded_goal_navigation_callbacks_are_skipped(self):
+        import asyncio
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        handler = CallbackHandler()
+        handler.get_or_create_telegram_user = AsyncMock(return_value='tg_user')
+        handler.handle_error = AsyncMock()
+        shown = []
+
+        async def view(self, query, context, telegram_user, goal_id):
+            await asyncio.sleep(0.01)
+            shown.append(('view', goal_id))
+
+        async def history(self, query, context, telegram_user, goal_id):
+            shown.append(('history', goal_id))
+
+        def make_update(query_id, data):
+            update = MagicMock()
+            update.callback_query.id = query_id
+            update.callback_query.data = data
+            update.callback_query.answer = AsyncMock()
+            return update
+
+        updates = [
+            make_update('1', 'goal_view_1'),
+            make_update('2', 'goal_view_2'),
+            make_update('3', 'goal_history_3'),
+        ]
+
+        async def run():
+            context = SimpleNamespace(chat_data={}, user_data={})
+            await asyncio.gather(*(
+                handler.handle_callback_query(update, context) for update in updates
+            ))
+
+        with patch.object(CallbackHandler, '_handle_goal_view', view), \
+                patch.object(CallbackHandler, '_handle_goal_history', history):
+            async_to_sync(run)()
+
+        self.assertEqual(shown, [('view', 1), ('history', 3)])
+
+
+class TransactionFromStateTests(TestCase):
+    def test_creates_transaction_and_resets_state(self):
+        from decimal import Decimal
+        from asgiref.sync import async_to_sync
+        from telegram_bot.models import UserState
+        from telegram_bot.services.transaction_service import TransactionService
+
+        user = User.objects.create_user(username='from_state', password='x')
+        telegram_user = TelegramUser.objects.create(telegram_id=888003, user=user)
+        category = Category.objects.create(
+            user=user,
+            name='Кофе',
+            type='expense',
+            color='#000000',
+            icon='☕',
+        )
+        state = UserState.objects.create(
+            telegram_user=telegram_user,
+            current_amount=Decimal('250'),
+            awaiting_category=True,
+            last_transaction_type='income',
+        )
+
+        transaction = async_to_sync(
+            TransactionService(user).create_transaction_from_state
+        )(state, category)
+
+        self.assertEqual(transaction.amount, Decimal('-250'))
+        self.assertIsNone(state.current_amount)
+        state.refresh_from_db()
+        self.assertIsNone(state.current_amount)
+        self.assertFalse(state.awaiting_category)
+        self.assertEqual(state.last_transaction_type, 'expense')
+
+
+class TodayStatisticsTests(TestCase):
+    def test_totals_in_one_query(self):
+        from decimal import Decimal
+        from datetime import date, timedelta
+        from asgiref.sync import async_to_sync
+        from transactions.models import Transaction
+        from telegram_bot.services.transaction_service import TransactionService
+
+        user = User.objects.create_user(username='today_stats', password='x')
+        category = Category.objects.create(
+            user=user,
+            name='Разное',
+            type='expense',
+            color='#000000',
+            icon='📦',
+        )
+        for amount, day in (
+            ('-100', date.today()),
+            ('-50.50', date.today()),
+            ('300', date.today()),
+            ('-999', date.today() - timedelta(days=1)),
+        ):
+            Transaction.objects.create(
+                user=user,
+                category=category,
+                amount=Decimal(amount),
+                date=day,
+            )
+
+        with self.assertNumQueries(1):
+            stats = async_to_sync(TransactionService(user).get_today_statistics)()
+
+        self.assertEqual(stats['expenses'], Decimal('150.50'))
+        self.assertEqual(stats['income'], Decimal('300'))
+        self.assertEqual(stats['balance'], Decimal('149.50'))
+
+        empty = User.objects.create_user(username='today_stats_empty', password='x')
+        stats = async_to_sync(TransactionService(empty).get_today_statistics)()
+        self.assertEqual(stats, {
+            'expenses': Decimal('0'),
+            'income': Decimal('0'),
+            'balance': Decimal('0'),
+        })
+
+
+class TransactionActionsCallbackTests(TestCase):
+    def setUp(self):
+        from decimal import Decimal
+        from django.utils import timezone
+        from transactions.models import Transaction
+
+        self.user = User.objects.create_user(username='tx_actions', password='x')
+        self.telegram_user = TelegramUser.objects.create(telegram_id=888004, user=self.user)
+        category = Category.objects.create(
+            user=self.user,
+            name='Такси',
+            type='expense',
+            color='#000000',
+            icon='🚕',
+        )
+        self.transaction = Transaction.objects.create(
+            user=self.user,
+            category=category,
+            amount=Decimal('-300'),
+            date=timezone.now().date(),
+        )
+
+    def _call(self, transaction_id):
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        query = MagicMock()
+        query.answer = AsyncMock()
+        with patch(
+            'telegram_bot.handlers.callback_handler.safe_edit_message_text',
+            new_callable=AsyncMock,
+        ) as edit:
+            async_to_sync(CallbackHandler()._handle_transaction_actions)(
+                query, MagicMock(), self.telegram_user, transaction_id,
+            )
+        return query, edit
+
+    def test_card_is_built_with_one_query(self):
+        with self.assertNumQueries(1):
+            query, edit = self._call(self.transaction.id)
+
+        query.answer.assert_not_awaited()
+        self.assertIn('Такси', edit.await_args.kwargs['text'])
+
+    def test_foreign_or_missing_transaction(self):
+        other = User.objects.create_user(username='tx_actions_other', password='x')
+        self.telegram_user.user = other
+
+        query, edit = self._call(self.transaction.id)
+
+        query.answer.assert_awaited_once_with("Транзакция не найдена")
+        edit.assert_not_awaited()
+
+
+class TypeSwitchCallbackTests(TestCase):
+    def test_switch_without_amount_answers_alert_without_editing(self):
+        from unittest.mock import AsyncMock, MagicMock, patch
+        from asgiref.sync import async_to_sync
+        from telegram_bot.handlers.callback_handler import CallbackHandler
+
+        user = User.objects.create_user(username='type_switch', password='x')
+        telegram_user = TelegramUser.objects.create(telegram_id=888005, user=user)
+        query = MagicMock()
+        query.answer = AsyncMock()
+
+        with patch(
+            'telegram_bot.handlers.callback_handler.safe_edit_message_text',
+            new_callable=AsyncMock,
+        ) as edit:
+            async_to_sync(CallbackHandler()._handle_type_switch)(
+                query, MagicMock(), telegram_user, 'income',
+            )
+
+        query.answer.assert_awaited_once_with("❌ Сначала укажите сумму", show_alert=True)
+        edit.assert_not_awaited()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+ArgParser = Callable[[tuple[str, ...]], tuple]
+
+
+class _Node:
+    __slots__ = ('children', 'prefix', 'route', 'parse')
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.prefix: Any = None
+        self.route: str = ''
+        self.parse: Optional[ArgParser] = None
+
+
+class CallbackMatch:
+    """
+    Результат маршрутизации: обработчик и уже разобранная callback_data.
+
+    route — зарегистрированный маршрут (`budget_detail_` или `main_menu`),
+    parts — все сегменты `data.split('_')`, args — сегменты после
+    совпавшего префикса (`budget_detail_42` → `('42',)`).
+    params — аргументы, разобранные парсером маршрута (`(42,)`);
+    без парсера это parts, а None означает, что args не прошли разбор.
+    Неизменяемый: один и тот же объект отдаётся из кэша CallbackRouter.
+    """
+
+    __slots__ = ('handler', 'route', 'parts', 'depth', 'params')
+
+    def __init__(
+        self,
+        handler: Any,
+        route: str,
+        parts: tuple[str, ...],
+        depth: int,
+    ) -> None:
+        self.handler = handler
+        self.route = route
+        self.parts = parts
+        self.depth = depth
+        self.params: Optional[tuple] = parts
+
+    @property
+    def args(self) -> tuple[str, ...]:
+        return self.parts[self.depth:]
+
+
+class CallbackRouter:
+    """
+    Маршрутизация callback_data по точному совпадению и по префиксу.
+
+    Точные маршруты лежат в dict и проверяются первыми — один hash lookup.
+    Префиксные хранятся в trie по сегментам через `_`
+    (`goal_view_` → `goal` → `view`), поэтому поиск занимает
+    O(число сегментов), а не перебор всех `startswith`.
+
+    Правила совпадения:
+    - точный маршрут важнее префиксного (`category_edit` vs `category_`);
+    - из префиксных выигрывает самый длинный
+      (`category_icon_select_` vs `category_icon_`).
+
+    Префиксному маршруту можно передать parse — чистую функцию
+    args → tuple. Она вызывается внутри кэшируемого match, поэтому
+    `int(...)` и проверки выполняются один раз на callback_data;
+    ValueError/IndexError из parse превращаются в params=None.
+    """
+
+    # Кнопки повторяются (main_menu, budgets_view, budget_detail_42…),
+    # поэтому разбор кэшируется по callback_data.
+    MATCH_CACHE_SIZE = 1024
+
+    def __init__(self) -> None:
+        self._exact: dict[str, Any] = {}
+        self._root = _Node()
+        self._cached_match = lru_cache(maxsize=self.MATCH_CACHE_SIZE)(self._match)
+
+    def add_exact(self, data: str, handler: Any) -> None:
+        self._exact[data] = handler
+        self._cached_match.cache_clear()
+
+    def add_prefix(
+        self,
+        prefix: str,
+        handler: Any,
+        parse: Optional[ArgParser] = None,
+    ) -> None:
+        if not prefix.endswith('_'):
+            raise ValueError(f"Префикс маршрута должен оканчиваться на '_': {prefix!r}")
+        node = self._node(prefix[:-1].split('_'))
+        node.prefix = handler
+        node.route = prefix
+        node.parse = parse
+        self._cached_match.cache_clear()
+
+    def resolve(self, data: str) -> Any:
+        """Возвращает обработчик для callback_data или None."""
+        match = self.match(data)
+        return None if match is None else match.handler
+
+    def match(self, data: str) -> Optional[CallbackMatch]:
+        """
+        Разбирает callback_data один раз и возвращает CallbackMatch
+        (или None, если маршрут не найден). Результат кэшируется.
+        """
+        return self._cached_match(data)
+
+    def _match(self, data: str) -> Optional[CallbackMatch]:
+        tokens = tuple(data.split('_'))
+        handler = self._exact.get(data)
+        if handler is not None:
+            return CallbackMatch(handler, data, tokens, len(tokens))
+
+        node = self._root
+        best = None
+        # Последний сегмент — всегда аргумент: префикс требует хвоста
+        for index in range(len(tokens) - 1):
+            node = node.children.get(tokens[index])
+            if node is None:
+                break
+            if node.prefix is not None:
+                best = node
+                best_depth = index + 1
+        if best is None:
+            return None
+        match = CallbackMatch(best.prefix, best.route, tokens, best_depth)
+        if best.parse is not None:
+            try:
+                match.params = best.parse(match.args)
+            except (ValueError, IndexError):
+                match.params = None
+        return match
+
+    def _node(self, tokens: list[str]) -> _Node:
+        node = self._root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        return node
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Any, Callable, Coroutine
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Асинхронный token bucket: `rate` токенов в секунду, не больше `capacity`.
+
+    `acquire()` ждёт, пока накопится токен; ожидающие обслуживаются по
+    очереди (под локом), поэтому всплеск запросов растягивается во времени,
+    а не отклоняется.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+
+    def is_idle(self) -> bool:
+        """Bucket полон и никем не занят — его можно выбросить без потерь."""
+        if self._lock.locked():
+            return False
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def _retry_after_seconds(error: RetryAfter) -> float:
+    retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class TelegramRateLimiter(BaseRateLimiter[None]):
+    """
+    Rate limiter исходящих запросов бота (подключается через
+    `Application.builder().rate_limiter(...)`).
+
+    Все запросы к Bot API проходят через общий bucket (лимит Telegram —
+    около 30 сообщений в секунду на бота), запросы с `chat_id` — ещё и через
+    bucket своего чата (около 1 сообщения в секунду в личке, 20 в минуту в
+    группе). На `RetryAfter` запрос повторяется после указанной паузы, не
+    больше `max_retries` раз.
+    """
+
+    def __init__(
+        self,
+        *,
+        overall_rate: float = 25,
+        chat_rate: float = 1,
+        group_rate: float = 20 / 60,
+        chat_burst: float = 3,
+        max_retries: int = 2,
+        max_chat_buckets: int = 1024,
+    ):
+        self._overall = TokenBucket(rate=overall_rate, capacity=overall_rate)
+        self._chat_rate = chat_rate
+        self._group_rate = group_rate
+        self._chat_burst = chat_burst
+        self._max_retries = max_retries
+        self._max_chat_buckets = max_chat_buckets
+        self._chat_buckets: dict[Any, TokenBucket] = {}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chat_buckets.clear()
+
+    def _chat_bucket(self, chat_id: Any) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self._max_chat_buckets:
+                self._drop_idle_buckets()
+            # Группы и каналы — отрицательные id или @username
+            is_group = isinstance(chat_id, str) or int(chat_id) < 0
+            bucket = self._chat_buckets[chat_id] = TokenBucket(
+                rate=self._group_rate if is_group else self._chat_rate,
+                capacity=self._chat_burst,
+            )
+        return bucket
+
+    def _drop_idle_buckets(self) -> None:
+        idle = [
+            chat_id
+            for chat_id, bucket in self._chat_buckets.items()
+            if bucket.is_idle()
+        ]
+        for chat_id in idle:
+            del self._chat_buckets[chat_id]
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Any]],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: None,
+    ) -> Any:
+        chat_id = data.get("chat_id")
+        attempt = 0
+        while True:
+            if chat_id is not None:
+                await self._chat_bucket(chat_id).acquire()
+            await self._overall.acquire()
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                attempt += 1
+                if attempt > self._max_retries:
+                    raise
+                delay = _retry_after_seconds(exc)
+                logger.warning(
+                    "Telegram flood control on %s, retrying in %.1fs (attempt %s/%s)",
+                    endpoint,
+                    delay,
+                    attempt,
+                    self._max_retries,
+                )
+                await asyncio.sleep(delay)
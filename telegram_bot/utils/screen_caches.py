@@ -0,0 +1,62 @@
+"""
+In-process кэши готовых экранов бота и текстов BotText.
+
+Вынесены из обработчиков, чтобы telegram_bot/signals.py мог их сбрасывать,
+не импортируя стек PTB-обработчиков (клавиатуры, экраны) в web/admin.
+"""
+
+from __future__ import annotations
+
+from telegram_bot.utils.ttl_cache import TTLCache
+
+# Экраны «список бюджетов» / «детали бюджета»:
+# {user_id: {ключ экрана: (message, keyboard)}}. Короткий TTL гасит
+# повторные запросы при навигации туда-обратно.
+BUDGET_SCREENS_CACHE_TTL_SECONDS = 10
+BUDGET_SCREENS_CACHE = TTLCache(maxsize=1024, ttl=BUDGET_SCREENS_CACHE_TTL_SECONDS)
+
+# Экраны месячных отчетов: {user_id: {(year, month): (message, keyboard)}}.
+# «Текущий месяц», «Все отчеты» и навигация назад к уже открытому месяцу
+# отдаются из кэша без повторной агрегации. Прошлые месяцы меняются
+# редко, поэтому живут дольше. В коротком кэше рядом с текущим месяцем
+# лежит и список доступных периодов — он нужен клавиатуре любого месяца.
+#
+# Ключ — период, а не хэш содержимого отчета: чтобы посчитать хэш, отчет
+# пришлось бы сначала собрать из БД, а это и есть дорогая часть; сборка
+# текста поверх готового отчета — доли миллисекунды.
+REPORT_SCREENS_CACHE_TTL_SECONDS = 60
+REPORT_PAST_SCREENS_CACHE_TTL_SECONDS = 600
+REPORT_SCREENS_CACHE = TTLCache(maxsize=1024, ttl=REPORT_SCREENS_CACHE_TTL_SECONDS)
+REPORT_PAST_SCREENS_CACHE = TTLCache(
+    maxsize=1024,
+    ttl=REPORT_PAST_SCREENS_CACHE_TTL_SECONDS,
+)
+
+# Тексты из админки (BotText) по slug; "" — текста нет или он выключен.
+BOT_TEXT_CACHE_TTL_SECONDS = 60
+BOT_TEXT_CACHE = TTLCache(maxsize=64, ttl=BOT_TEXT_CACHE_TTL_SECONDS)
+
+
+def user_screens(cache: TTLCache, user_id: int) -> dict:
+    """Словарь экранов пользователя в кэше (создаётся при первом обращении)."""
+    screens = cache.get(user_id)
+    if screens is None:
+        screens = {}
+        cache.set(user_id, screens)
+    return screens
+
+
+def invalidate_budget_screens(user_id: int) -> None:
+    """Сбрасывает кэш экранов бюджетов пользователя."""
+    BUDGET_SCREENS_CACHE.pop(user_id, None)
+
+
+def invalidate_report_screens(user_id: int) -> None:
+    """Сбрасывает кэш экранов отчетов пользователя."""
+    REPORT_SCREENS_CACHE.pop(user_id, None)
+    REPORT_PAST_SCREENS_CACHE.pop(user_id, None)
+
+
+def invalidate_bot_texts() -> None:
+    """Сбрасывает кэш текстов BotText (изменились в админке)."""
+    BOT_TEXT_CACHE.clear()
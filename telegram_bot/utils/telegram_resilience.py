@@ -55,14 +55,23 @@ def is_message_not_modified_error(error: Exception) -> bool:
 
 
 def get_callback_query(update: Update | CallbackQuery) -> CallbackQuery | None:
-    if hasattr(update, "callback_query") and update.callback_query is not None:
+    # Fast path: handlers pass real PTB objects, isinstance is cheaper than
+    # hasattr (no AttributeError machinery on a miss).
+    if isinstance(update, CallbackQuery):
+        return update
+    if isinstance(update, Update):
+        return update.callback_query
+
+    # Duck-typed fallback for non-PTB objects.
+    if getattr(update, "callback_query", None) is not None:
         return update.callback_query
     if hasattr(update, "edit_message_text"):
         return update  # type: ignore[return-value]
     return None
 
 
-async def _safe_answer_callback(query: CallbackQuery) -> None:
+async def safe_answer_callback(query: CallbackQuery) -> None:
+    """Answer callback query (dismiss the button spinner); ignore BadRequest."""
     try:
         await query.answer()
     except BadRequest:
@@ -80,15 +89,31 @@ async def safe_edit_message_text(
     """
     Edit callback message; ignore Telegram 'Message is not modified'.
 
+    If the plain text is the same as in the current message, only the
+    keyboard is sent (editMessageReplyMarkup) instead of the whole text.
+    If the keyboard is the same too, nothing is sent: Telegram would only
+    answer 'Message is not modified', so the round trip is skipped.
+
     Returns True if the message was edited, False if content was unchanged.
     """
     try:
-        await query.edit_message_text(
-            text=text,
-            reply_markup=reply_markup,
-            parse_mode=parse_mode,
-            **kwargs,
-        )
+        if (
+            parse_mode is None
+            and not kwargs
+            and getattr(query.message, "text", None) == text
+        ):
+            # PTB keyboards compare by content (buttons), not identity
+            if query.message.reply_markup == reply_markup:
+                await safe_answer_callback(query)
+                return False
+            await query.edit_message_reply_markup(reply_markup=reply_markup)
+        else:
+            await query.edit_message_text(
+                text=text,
+                reply_markup=reply_markup,
+                parse_mode=parse_mode,
+                **kwargs,
+            )
         return True
     except BadRequest as exc:
         if is_message_not_modified_error(exc):
@@ -96,7 +121,7 @@ async def safe_edit_message_text(
                 "Message is not modified for callback '%s' - ignoring",
                 query.data,
             )
-            await _safe_answer_callback(query)
+            await safe_answer_callback(query)
             return False
         raise
 
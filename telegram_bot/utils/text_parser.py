@@ -10,6 +10,11 @@ from typing import (
 )
 
 from categories.models import Category
+from telegram_bot.utils.ttl_cache import TTLCache
+
+# Парсеры per-user вместе с загруженными категориями/алиасами
+PARSER_CACHE_TTL_SECONDS = 60
+_PARSER_CACHE = TTLCache(maxsize=1024, ttl=PARSER_CACHE_TTL_SECONDS)
 
 
 class TextCommandParser:
@@ -29,7 +34,40 @@ class TextCommandParser:
     
     def __init__(self, user):
         self.user = user
-        
+        self._categories: Optional[list[Category]] = None
+        self._aliases: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_user_cached(cls, user) -> 'TextCommandParser':
+        """Парсер пользователя из кэша (категории и алиасы уже загружены)."""
+        parser = _PARSER_CACHE.get(user.id)
+        if parser is None:
+            parser = cls(user)
+            _PARSER_CACHE.set(user.id, parser)
+        return parser
+
+    @staticmethod
+    def invalidate_user(user_id: int) -> None:
+        """Сбрасывает кэш парсера пользователя (категории/алиасы изменились)."""
+        _PARSER_CACHE.pop(user_id, None)
+
+    def _get_categories(self) -> list[Category]:
+        if self._categories is None:
+            self._categories = list(Category.objects.filter(user=self.user))
+        return self._categories
+
+    def _get_aliases(self) -> Dict[str, Any]:
+        from telegram_bot.models import UserAlias
+
+        if self._aliases is None:
+            self._aliases = {
+                user_alias.alias: user_alias
+                for user_alias in UserAlias.objects.filter(
+                    telegram_user__user=self.user,
+                ).select_related('category')
+            }
+        return self._aliases
+
     def parse(self, text: str) -> Dict[str, Any]:
         """
         Парсит текстовую команду пользователя
@@ -105,30 +143,23 @@ class TextCommandParser:
         Returns:
             Результат парсинга алиаса
         """
-        from telegram_bot.models import UserAlias
-        
-        try:
-            telegram_user = self.user.telegramuser
-            user_alias = UserAlias.objects.get(
-                telegram_user=telegram_user,
-                alias=alias,
-            )
-            
-            return {
-                'type': 'alias',
-                'alias': alias,
-                'amount': user_alias.amount,
-                'category': user_alias.category,
-                'transaction_type': user_alias.category.type,
-                'success': True,
-            }
-        except UserAlias.DoesNotExist:
+        user_alias = self._get_aliases().get(alias)
+        if user_alias is None:
             return {
                 'type': 'alias',
                 'alias': alias,
                 'success': False,
                 'error': f'Алиас "{alias}" не найден',
             }
+
+        return {
+            'type': 'alias',
+            'alias': alias,
+            'amount': user_alias.amount,
+            'category': user_alias.category,
+            'transaction_type': user_alias.category.type,
+            'success': True,
+        }
     
     def _parse_amount_category(
         self,
@@ -288,7 +319,11 @@ class TextCommandParser:
             ResolveStatus,
         )
 
-        result = CategoryResolver(self.user).resolve(name, transaction_type)
+        result = CategoryResolver(self.user).resolve(
+            name,
+            transaction_type,
+            categories=self._get_categories(),
+        )
         if result.status == ResolveStatus.MATCHED:
             return result.match
         return None 
\ No newline at end of file
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Небольшой in-process кэш с TTL и ограничением размера.
+
+    Бот работает одним процессом, поэтому для горячих per-user данных
+    этого достаточно. При переполнении вытесняются самые старые записи.
+
+    Кэши бота сбрасываются через `pop()`/`clear()` из сигналов
+    (telegram_bot/signals.py) при изменении данных; TTL лишь ограничивает
+    устаревание при правках из другого процесса (web/admin), куда сигналы
+    бота не доходят.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+        if item is _MISSING:
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        # dict хранит порядок вставки: первые ключи — самые старые.
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
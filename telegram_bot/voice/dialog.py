@@ -634,7 +634,7 @@ class VoiceDialogManager:
         telegram_user,
         text: str,
     ) -> None:
-        user = await sync_to_async(lambda: telegram_user.user)()
+        user = await self._executor.get_user(telegram_user)
 
         # Prefer filling the current step, but also accept richer phrases.
         if dialog.step == STEP_AMOUNT:
@@ -801,7 +801,7 @@ class VoiceDialogManager:
         command = slots_to_command(slots, transcript)
         category_id = slots.get('category_id')
         if category_id is not None:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self._executor.get_user(telegram_user)
             try:
                 command.category = await Category.objects.aget(
                     id=category_id,
@@ -815,7 +815,7 @@ class VoiceDialogManager:
 
         goal_id = slots.get('goal_id')
         if goal_id is not None:
-            user = await sync_to_async(lambda: telegram_user.user)()
+            user = await self._executor.get_user(telegram_user)
             try:
                 command.goal = await Goal.objects.aget(id=goal_id, user=user)
                 command.goal_title = command.goal.title
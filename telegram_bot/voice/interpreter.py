@@ -207,7 +207,7 @@ def voice_text_parse_candidates(text: str) -> list[str]:
 class VoiceInterpreter:
     def __init__(self, user: User):
         self.user = user
-        self._parser = TextCommandParser(user)
+        self._parser = TextCommandParser.from_user_cached(user)
 
     def interpret(self, transcript: str) -> ParsedVoiceCommand:
         text = _normalize_transcript(transcript)